@@ -0,0 +1,239 @@
+"""Early admission limits for render requests.
+
+Oversized requests are refused with HTTP 413 before they cost anything:
+
+- ``BodySizeLimitMiddleware`` checks ``Content-Length`` and counts the body
+  as it streams in, so a multi-MB upload is cut off at the limit instead of
+  being buffered and JSON-parsed.
+- ``check_payload`` walks the parsed JSON once, iteratively and with a node
+  budget, before pydantic or ``ensure_profile_schema`` see it: block count,
+  profile section sizes, list lengths, profile string lengths, nesting depth
+  and base64 image sizes and pixel counts. Layout and theme strings are only
+  bounded by the body size.
+- ``check_photo`` bounds an uploaded image's bytes and pixel count, and
+  refuses uploads that are not images with 422.
+
+Pixel counts are read from the image header only, never by decoding pixels.
+
+Limits live in ``api.schemas.limits``.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+from io import BytesIO
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from api.schemas.limits import (
+    IMAGE_FIELDS,
+    MAX_BLOCKS,
+    MAX_DEPTH,
+    MAX_LIST_ITEMS,
+    MAX_NODES,
+    MAX_PHOTO_BYTES,
+    MAX_PHOTO_PIXELS,
+    MAX_STR_LEN,
+    SECTION_LIMITS,
+)
+
+
+# Base64 prefix decoded first: enough to reach the size fields of common headers
+_B64_HEAD = 256 * 1024
+
+
+def _too_large(detail: str) -> HTTPException:
+    return HTTPException(status_code=413, detail=detail)
+
+
+# ---------------------------------------------------------------------
+# Image headers
+# ---------------------------------------------------------------------
+def _image_size(data: bytes) -> Optional[Tuple[int, int]]:
+    """
+    Read ``(width, height)`` from an image header.
+
+    Returns:
+        Optional[Tuple[int, int]]: The size, or ``None`` if PIL cannot identify the data.
+
+    Raises:
+        HTTPException: 413 if PIL refuses the image as a decompression bomb.
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(BytesIO(data)) as img:
+            return img.size
+    except Image.DecompressionBombError:
+        raise _too_large("Image has too many pixels.")
+    except Exception:
+        return None
+
+
+def _check_pixels(size: Tuple[int, int], what: str) -> None:
+    w, h = size
+    if w * h > MAX_PHOTO_PIXELS:
+        raise _too_large(f"{what} has too many pixels ({w}x{h}).")
+
+
+def _b64_image_size(text: str) -> Optional[Tuple[int, int]]:
+    """Image size of a base64 field: decode a prefix, the whole text only if needed."""
+    chunks = (text[:_B64_HEAD], text) if len(text) > _B64_HEAD else (text,)
+    for chunk in chunks:
+        try:
+            size = _image_size(base64.b64decode(chunk))
+        except (binascii.Error, ValueError):
+            continue
+        if size is not None:
+            return size
+    return None
+
+
+# ---------------------------------------------------------------------
+# Body size
+# ---------------------------------------------------------------------
+class BodySizeLimitMiddleware:
+    """Reject request bodies over ``max_bytes`` (per-path overrides allowed) with 413."""
+
+    def __init__(self, app: ASGIApp, max_bytes: int, path_limits: Optional[Dict[str, int]] = None):
+        self.app = app
+        self.max_bytes = max_bytes
+        self.path_limits = dict(path_limits or {})
+
+    def limit_for(self, path: str) -> int:
+        return self.path_limits.get(path.rstrip("/") or "/", self.max_bytes)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] not in ("POST", "PUT", "PATCH"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = self.limit_for(scope["path"])
+        detail = f"Request body too large (max {limit // (1024 * 1024)} MB)."
+        for name, value in scope.get("headers") or ():
+            if name == b"content-length":
+                try:
+                    declared = int(value)
+                except ValueError:
+                    break
+                if declared > limit:
+                    await JSONResponse({"detail": detail}, status_code=413)(scope, receive, send)
+                    return
+                break
+
+        received = 0
+        started = False
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    # FastAPI re-raises HTTPException from body parsing as-is
+                    raise _too_large(detail)
+            return message
+
+        async def tracking_send(message: Message) -> None:
+            nonlocal started
+            started = started or message["type"] == "http.response.start"
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, tracking_send)
+        except HTTPException as exc:
+            if exc.status_code != 413 or started:
+                raise
+            await JSONResponse({"detail": exc.detail}, status_code=413)(scope, receive, send)
+
+
+# ---------------------------------------------------------------------
+# Payload complexity
+# ---------------------------------------------------------------------
+def _count_blocks(layout: Any) -> int:
+    flow = layout.get("flow") if isinstance(layout, dict) else None
+    if not isinstance(flow, list):
+        return 0
+    return sum(len(sec.get("blocks") or ()) for sec in flow if isinstance(sec, dict))
+
+
+def check_payload(payload: Dict[str, Any], *, max_nodes: int = MAX_NODES) -> None:
+    """
+    Enforce shape limits on a parsed render payload (before model validation).
+
+    Args:
+        payload (dict): Raw ``/generate-form-simple`` style body.
+        max_nodes (int): Budget of JSON values to visit.
+
+    Raises:
+        HTTPException: 413 naming the first limit exceeded.
+    """
+    if not isinstance(payload, dict):
+        return
+
+    blocks = _count_blocks(payload.get("layout_inline"))
+    if blocks > MAX_BLOCKS:
+        raise _too_large(f"layout_inline has too many blocks ({blocks} > {MAX_BLOCKS}).")
+
+    profile = payload.get("profile")
+    if isinstance(profile, dict):
+        for section, limit in SECTION_LIMITS.items():
+            items = profile.get(section)
+            if isinstance(items, list) and len(items) > limit:
+                raise _too_large(f"profile.{section} has too many items ({len(items)} > {limit}).")
+
+    max_b64 = (MAX_PHOTO_BYTES * 4) // 3 + 4
+    nodes = 0
+    # (value, depth, key, inside profile)
+    stack = [(payload, 0, None, False)]
+    while stack:
+        node, depth, key, in_profile = stack.pop()
+        nodes += 1
+        if nodes > max_nodes:
+            raise _too_large(f"Payload too complex (more than {max_nodes} values).")
+        if depth > MAX_DEPTH:
+            raise _too_large(f"Payload nested too deeply (max depth {MAX_DEPTH}).")
+        if isinstance(node, dict):
+            stack.extend((v, depth + 1, k, in_profile or (depth == 0 and k == "profile")) for k, v in node.items())
+        elif isinstance(node, list):
+            if len(node) > MAX_LIST_ITEMS:
+                raise _too_large(f"'{key}' has too many items ({len(node)} > {MAX_LIST_ITEMS}).")
+            stack.extend((v, depth + 1, key, in_profile) for v in node)
+        elif isinstance(node, str):
+            if key in IMAGE_FIELDS:
+                if len(node) > max_b64:
+                    raise _too_large(f"'{key}' image too large (max {MAX_PHOTO_BYTES // (1024 * 1024)} MB).")
+                size = _b64_image_size(node)
+                if size is not None:  # not an image: the avatar block skips it
+                    _check_pixels(size, f"'{key}' image")
+            elif in_profile and len(node) > MAX_STR_LEN:
+                raise _too_large(f"'{key}' text too long ({len(node)} > {MAX_STR_LEN} chars).")
+
+
+def check_payloads(payloads: Iterable[Any]) -> None:
+    """``check_payload`` for each batch item (non-dict items are left to validation)."""
+    for payload in payloads:
+        check_payload(payload)
+
+
+def check_photo(photo: bytes) -> None:
+    """
+    Bound an uploaded image by bytes and by pixels (header read only).
+
+    Raises:
+        HTTPException: 413 if either limit is exceeded (or PIL flags a
+            decompression bomb), 422 if the upload is not a readable image.
+    """
+    if len(photo) > MAX_PHOTO_BYTES:
+        raise _too_large(f"Photo too large (max {MAX_PHOTO_BYTES // (1024 * 1024)} MB).")
+    size = _image_size(photo)
+    if size is None:
+        raise HTTPException(status_code=422, detail="Photo is not a readable image.")
+    _check_pixels(size, "Photo")
+
+
+__all__ = ["BodySizeLimitMiddleware", "check_payload", "check_payloads", "check_photo"]
@@ -0,0 +1,303 @@
+"""In-process job queue for long-running renders.
+
+``POST /jobs`` must answer immediately, so the work (a single PDF or a whole
+batch ZIP) is queued here and executed by a small pool of daemon threads.
+The threads only orchestrate: the actual rendering still goes through
+``api.render_pool`` and the PDF cache.
+
+Finished jobs keep their result until ``result_ttl`` seconds after
+completion; expired jobs are purged lazily on every submit/lookup, so the
+store stays bounded without a janitor thread. Results are spooled: up to
+``spool_bytes`` stay in memory, anything larger (batch ZIPs) rolls over to
+a temporary file, so stored results cost at most ``queue_max x spool_bytes``
+of memory however large the batches are.
+
+Backpressure:
+- more than ``queue_max`` jobs queued or stored -> ``JobsFull`` (HTTP 429)
+
+Configuration (environment):
+- JOBS_WORKERS    : worker threads (default: 2)
+- JOBS_QUEUE_MAX  : jobs allowed to be queued or kept at once (default: 100)
+- JOBS_RESULT_TTL : seconds a finished job stays retrievable (default: 600)
+- JOBS_SPOOL_MB   : result size kept in memory before spilling to disk (default: 1)
+"""
+
+from __future__ import annotations
+
+import logging
+import queue
+import tempfile
+import threading
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import IO, Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from api.render_pool import _env_float, _env_int
+
+log = logging.getLogger("resume.jobs")
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+DEFAULT_SPOOL_BYTES = 1024 * 1024
+CHUNK_SIZE = 64 * 1024
+
+# What a job function returns: the result bytes, or a binary file positioned anywhere
+JobResult = Union[bytes, IO[bytes]]
+
+
+def spool_file(spool_bytes: int = DEFAULT_SPOOL_BYTES) -> IO[bytes]:
+    """Binary scratch file that stays in memory up to ``spool_bytes``, then moves to disk."""
+    return tempfile.SpooledTemporaryFile(max_size=spool_bytes, mode="w+b")
+
+
+class JobsFull(Exception):
+    """Too many jobs queued or stored; the caller should retry later (HTTP 429)."""
+
+    def __init__(self, retry_after: int = 5):
+        super().__init__("Job queue is full")
+        self.retry_after = retry_after
+
+
+@dataclass
+class Job:
+    """
+    One queued unit of work and, once finished, its result.
+
+    Attributes:
+        id (str): Opaque job identifier.
+        kind (str): ``"pdf"`` or ``"batch"`` (informational).
+        media_type (str): Content type of the result.
+        filename (str): Suggested download name for the result.
+        status (str): ``queued`` | ``running`` | ``done`` | ``failed``.
+        result (Optional[IO[bytes]]): Spooled output when ``status == "done"``.
+        result_size (Optional[int]): Size of the output in bytes.
+        error (Optional[str]): Failure message when ``status == "failed"``.
+    """
+    id: str
+    kind: str
+    media_type: str
+    filename: str
+    fn: Callable[[], JobResult] = field(repr=False)
+    status: str = QUEUED
+    result: Optional[IO[bytes]] = field(default=None, repr=False)
+    result_size: Optional[int] = None
+    error: Optional[str] = None
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    expires_at: Optional[float] = None
+    _read_lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED)
+
+    def iter_result(self, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+        """
+        Yield the result in chunks; several readers may stream it at once.
+
+        Stops early if the job expires (and its file is closed) mid-stream.
+        """
+        offset = 0
+        while self.result is not None:
+            with self._read_lock:
+                try:
+                    self.result.seek(offset)
+                    chunk = self.result.read(chunk_size)
+                except ValueError:  # closed by purge
+                    return
+            if not chunk:
+                return
+            offset += len(chunk)
+            yield chunk
+
+    def discard(self) -> None:
+        """Close the spooled result (removes its temporary file, if any)."""
+        with self._read_lock:
+            if self.result is not None:
+                self.result.close()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-friendly status (no result bytes)."""
+        return {
+            "id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "expires_at": self.expires_at,
+            "result_bytes": self.result_size,
+        }
+
+
+class JobQueue:
+    """FIFO job queue with worker threads and a TTL-bounded result store."""
+
+    def __init__(
+        self,
+        workers: int,
+        queue_max: int,
+        result_ttl: float,
+        spool_bytes: int = DEFAULT_SPOOL_BYTES,
+    ):
+        self.workers = max(1, int(workers))
+        self.queue_max = max(1, int(queue_max))
+        self.result_ttl = float(result_ttl)
+        self.spool_bytes = max(0, int(spool_bytes))
+        self._queue: "queue.Queue[Optional[Job]]" = queue.Queue()
+        self._jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+
+    @classmethod
+    def from_env(cls) -> "JobQueue":
+        return cls(
+            workers=_env_int("JOBS_WORKERS", 2),
+            queue_max=_env_int("JOBS_QUEUE_MAX", 100),
+            result_ttl=_env_float("JOBS_RESULT_TTL", 600.0),
+            spool_bytes=int(_env_float("JOBS_SPOOL_MB", 1.0) * 1024 * 1024),
+        )
+
+    # ---- lifecycle ----
+    def start(self) -> None:
+        """Start the worker threads (idempotent; also done lazily on submit)."""
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            while len(self._threads) < self.workers:
+                t = threading.Thread(
+                    target=self._work,
+                    name=f"resume-job-{len(self._threads)}",
+                    daemon=True,
+                )
+                t.start()
+                self._threads.append(t)
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the workers after the jobs already queued."""
+        with self._lock:
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(None)
+        if wait:
+            for t in threads:
+                t.join()
+
+    # ---- store ----
+    def _purge_locked(self, now: float) -> None:
+        expired = [jid for jid, j in self._jobs.items() if j.expires_at is not None and j.expires_at <= now]
+        for jid in expired:
+            self._jobs.pop(jid).discard()
+
+    def submit(
+        self,
+        fn: Callable[[], JobResult],
+        *,
+        kind: str,
+        media_type: str,
+        filename: str,
+    ) -> Job:
+        """
+        Queue ``fn()`` and return its job immediately.
+
+        ``fn`` returns the result bytes or a binary file (e.g. from
+        ``spool_file``); either way the job keeps a spooled file.
+
+        Raises:
+            JobsFull: If ``queue_max`` jobs are already queued or stored.
+        """
+        self.start()
+        with self._lock:
+            self._purge_locked(time.time())
+            if len(self._jobs) >= self.queue_max:
+                raise JobsFull()
+            job = Job(id=uuid.uuid4().hex, kind=kind, media_type=media_type, filename=filename, fn=fn)
+            self._jobs[job.id] = job
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Return the job, or ``None`` if it is unknown or expired."""
+        with self._lock:
+            self._purge_locked(time.time())
+            return self._jobs.get(job_id)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            counts = {QUEUED: 0, RUNNING: 0, DONE: 0, FAILED: 0}
+            for j in self._jobs.values():
+                counts[j.status] += 1
+            return counts
+
+    # ---- worker ----
+    def _work(self) -> None:
+        while True:
+            job = self._queue.get()
+            if job is None:
+                return
+            job.status, job.started_at = RUNNING, time.time()
+            try:
+                job.result, job.result_size = self._spool(job.fn())
+            except Exception as exc:
+                log.warning("Job %s (%s) failed: %s", job.id, job.kind, exc)
+                job.error, status = str(exc) or type(exc).__name__, FAILED
+            else:
+                status = DONE
+            job.fn = _noop  # drop references to the payload
+            job.finished_at = time.time()
+            job.expires_at = job.finished_at + self.result_ttl
+            job.status = status
+
+    def _spool(self, result: JobResult) -> Tuple[IO[bytes], int]:
+        """Return ``result`` as a spooled file and its size."""
+        if isinstance(result, (bytes, bytearray, memoryview)):
+            fh = spool_file(self.spool_bytes)
+            fh.write(result)
+        else:
+            fh = result
+        size = fh.seek(0, 2)
+        fh.seek(0)
+        return fh, size
+
+
+def _noop() -> bytes:
+    return b""
+
+
+# ---------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------
+_JOBS: Optional[JobQueue] = None
+_JOBS_LOCK = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """Return the process-wide job queue, configured from the environment."""
+    global _JOBS
+    with _JOBS_LOCK:
+        if _JOBS is None:
+            _JOBS = JobQueue.from_env()
+        return _JOBS
+
+
+def shutdown_job_queue() -> None:
+    global _JOBS
+    with _JOBS_LOCK:
+        jobs, _JOBS = _JOBS, None
+    if jobs is not None:
+        jobs.shutdown()
+
+
+__all__ = [
+    "Job",
+    "JobQueue",
+    "JobsFull",
+    "get_job_queue",
+    "shutdown_job_queue",
+    "spool_file",
+]
@@ -2,7 +2,14 @@
 
 Exposes:
 - GET  /healthz
+- GET  /metrics              : Prometheus-text stage histograms (see api.metrics)
 - POST /generate-form-simple : build PDF from profile + (optional) layout/theme
+                               (rendered on the process pool, see api.render_pool)
+- POST /generate-form-multipart : same, as multipart/form-data with a binary headshot
+- POST /generate-batch       : render many profiles, streamed back as a ZIP
+- POST /jobs                 : queue a render or batch, returns a job id (see api.jobs)
+- GET  /jobs/{id}            : job status
+- GET  /jobs/{id}/result     : the finished PDF / ZIP
 - /api/profiles/*            : save/load JSON profiles (via profiles router)
 - GET  /                     : PWA home (serves templates/index.html)
 - GET  /manifest.json        : PWA manifest (root scope)
@@ -11,28 +18,51 @@ Exposes:
 
 from __future__ import annotations
 
-import base64
+import io
 import json
 import logging
+import os
+import re
+import time
+import zipfile
+from collections import deque
 from pathlib import Path
-from typing import Any, Dict, Optional
+from typing import IO, Any, AsyncIterator, Deque, Dict, Iterator, List, Literal, Optional, Tuple
 
-from fastapi import FastAPI, HTTPException, Response, Request
+from fastapi import FastAPI, File, Form, HTTPException, Response, Request, UploadFile
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import HTMLResponse, FileResponse
+from fastapi.responses import HTMLResponse, FileResponse, PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel, Field, ValidationError, field_validator
 
-# 1) Register fonts (side-effect)
-from api.pdf_utils import fonts  # noqa: F401
-from api.pdf_utils.builder import build_resume_pdf
+# 1) Fonts are not registered at import; families load on first use
+from api.pdf_utils import fonts
+from api.pdf_utils.builder import build_resume_pdf_timed
 from api.pdf_utils.mapper import profile_to_overrides
+from api.pdf_utils.layout_plan import read_json_file
 from api.routes import profiles as profiles_routes  # /api/profiles/*
+from api.pdf_utils.headshot import DEFAULT_MAX_D_MM, headshot_from_b64, normalize_headshot
 from api.pdf_utils.schema import ensure_profile_schema
+from api.pdf_utils.draft import DRAFT
+from api.pdf_utils.startup import LAZY_STARTUP
+from api.pdf_utils.timing import Timings, stage
+from api.metrics import REQUESTS, observe_pdf, observe_stages, render_metrics
+from api.pdf_cache import cache_key, etag_for, etag_matches, get_pdf_cache
+from api.admission import BodySizeLimitMiddleware, check_payload, check_payloads, check_photo
+from api.schemas.limits import MAX_BATCH_REQUEST_BYTES, MAX_PHOTO_BYTES, MAX_REQUEST_BYTES
+from api.jobs import JobsFull, get_job_queue, shutdown_job_queue, spool_file
+from api.render_pool import (
+    RenderRejected,
+    RenderUnavailable,
+    get_render_pool,
+    shutdown_render_pool,
+)
+from api.singleflight import SingleFlight
 
 import asyncio
-import httpx
+import threading
+from starlette.concurrency import run_in_threadpool
 from starlette.responses import StreamingResponse
 
 
@@ -77,6 +107,13 @@ app.add_middleware(
     allow_headers=["Content-Type", "Authorization"],
 )
 
+# Oversized bodies get 413 while streaming in, before parsing (see api.admission)
+app.add_middleware(
+    BodySizeLimitMiddleware,
+    max_bytes=MAX_REQUEST_BYTES,
+    path_limits={"/generate-batch": MAX_BATCH_REQUEST_BYTES, "/jobs": MAX_BATCH_REQUEST_BYTES},
+)
+
 # ---------------------------------------------------------------------
 # Routers
 # ---------------------------------------------------------------------
@@ -124,48 +161,106 @@ def coerce_summary(profile: Dict[str, Any]) -> None:
             except Exception:
                 pass
 
-def _decode_headshots(node: Any) -> None:
-    """Recursively convert avatar_circle.data.photo_b64 -> photo_bytes."""
+def _avatar_data(node: Any) -> Iterator[Dict[str, Any]]:
+    """Yield the ``data`` dict of every avatar_circle block below ``node``."""
     if isinstance(node, dict):
         if (node.get("block_id") == "avatar_circle") and isinstance(node.get("data"), dict):
-            d = node["data"]
-            b64 = d.get("photo_b64")
-            if b64 and not d.get("photo_bytes"):
-                try:
-                    d["photo_bytes"] = base64.b64decode(b64.encode("ascii"))
-                except Exception:
-                    d["photo_bytes"] = None
+            yield node["data"]
         for v in list(node.values()):
-            _decode_headshots(v)
+            yield from _avatar_data(v)
     elif isinstance(node, list):
         for it in node:
-            _decode_headshots(it)
+            yield from _avatar_data(it)
+
+def _decode_headshots(node: Any) -> None:
+    """Recursively convert avatar_circle.data.photo_b64 -> photo_bytes (normalized, cached)."""
+    for d in _avatar_data(node):
+        b64 = d.get("photo_b64")
+        if b64 and not d.get("photo_bytes"):
+            try:
+                d["photo_bytes"] = headshot_from_b64(b64, float(d.get("max_d_mm") or DEFAULT_MAX_D_MM))
+            except (TypeError, ValueError):
+                d["photo_bytes"] = None
+
+def _attach_headshot(layout_inline: Dict[str, Any], photo: bytes) -> None:
+    """Give every avatar_circle block (and its override) the uploaded photo.
+
+    The upload replaces any ``photo_b64`` from the layout or profile. Each block
+    gets the photo normalized for its own ``max_d_mm`` (the same bytes object
+    when it already fits), never a base64 round trip.
+    """
+    overrides = layout_inline.setdefault("overrides", {})
+    override = overrides.get("avatar_circle")
+    if not isinstance(override, dict):
+        override = overrides["avatar_circle"] = {}
+    if not isinstance(override.get("data"), dict):
+        override["data"] = {}
+
+    for d in [override["data"], *_avatar_data(layout_inline.get("flow"))]:
+        d.pop("photo_b64", None)
+        try:
+            max_d_mm = float(d.get("max_d_mm") or DEFAULT_MAX_D_MM)
+        except (TypeError, ValueError):
+            max_d_mm = DEFAULT_MAX_D_MM
+        d["photo_bytes"] = normalize_headshot(photo, max_d_mm)
 
 def _deep_merge_fill_missing(dst: dict, src: dict) -> dict:
     """
     Merge without overwriting existing keys in dst (fill-only-missing).
     - If both values are dicts, recurse.
     - Otherwise, copy src[k] only if k not in dst.
+
+    ``dst`` is not modified: the result copies the dicts along merged paths
+    and shares the rest (``dst`` may belong to a shared named layout).
     """
+    out = dict(dst)
     for k, v in (src or {}).items():
-        if isinstance(v, dict) and isinstance(dst.get(k), dict):
-            _deep_merge_fill_missing(dst[k], v)
-        elif k not in dst:
-            dst[k] = v
-    return dst
+        if isinstance(v, dict) and isinstance(out.get(k), dict):
+            out[k] = _deep_merge_fill_missing(out[k], v)
+        elif k not in out:
+            out[k] = v
+    return out
+
+def _own_avatar_paths(node: Any) -> Any:
+    """Copy ``node`` along the paths to avatar_circle ``data`` dicts; share the rest.
+
+    Headshot handling writes into those dicts, while the layout itself may be
+    the shared parse of a named layout file.
+    """
+    if isinstance(node, list):
+        items = [_own_avatar_paths(it) for it in node]
+        return items if any(a is not b for a, b in zip(items, node)) else node
+    if isinstance(node, dict):
+        items = {k: _own_avatar_paths(v) for k, v in node.items()}
+        if node.get("block_id") == "avatar_circle" and isinstance(node.get("data"), dict):
+            items["data"] = dict(items["data"])
+            return items
+        return items if any(items[k] is not node[k] for k in node) else node
+    return node
 
 def _safe_read_layout_by_name(layout_name: str) -> Dict[str, Any]:
-    """Read a JSON layout by name safely (prevent path traversal)."""
+    """Read a JSON layout by name safely (prevent path traversal).
+
+    The parse is cached per file version and shared between requests: treat
+    it as read-only (``_build_render_data`` layers the request on top).
+    """
     candidate = (LAYOUTS_DIR / layout_name).resolve()
     if not str(candidate).startswith(str(LAYOUTS_DIR.resolve())):
         raise HTTPException(status_code=400, detail="Invalid layout path.")
     try:
-        return json.loads(candidate.read_text(encoding="utf-8"))
+        return read_json_file(candidate)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail=f"Layout not found: {layout_name}")
     except Exception as exc:
         raise HTTPException(status_code=400, detail=f"Failed to read layout: {exc}")
 
+def _read_theme(theme_name: str) -> Dict[str, Any]:
+    """Read a theme JSON by name ({} if missing/invalid, like the builder)."""
+    try:
+        return json.loads((THEMES_DIR / f"{theme_name}.theme.json").read_text(encoding="utf-8"))
+    except Exception:
+        return {}
+
 # ---------------------------------------------------------------------
 # Payload model
 # ---------------------------------------------------------------------
@@ -178,6 +273,9 @@ class GeneratePayload(BaseModel):
     profile: Dict[str, Any] = Field(default_factory=dict)
     layout_inline: Optional[Dict[str, Any]] = None
     layout_name: Optional[str] = None
+    quality: Literal["print", "draft"] = Field(
+        default="print", description="'draft': fast preview (placeholder images, no links, first pages only)"
+    )
 
     @field_validator("ui_lang")
     @classmethod
@@ -188,31 +286,29 @@ class GeneratePayload(BaseModel):
         return normalize_theme_name(self.theme_name or self.theme)
 
 # ---------------------------------------------------------------------
-# Lifecycle & health
-# ---------------------------------------------------------------------
-@app.on_event("startup")
-def _startup() -> None:
-    try:
-        fonts.register_all_fonts()
-        log.info("Fonts registered.")
-    except Exception as exc:
-        log.warning("Font registration failed: %s", exc)
-
-@app.get("/healthz")
-def healthz() -> Dict[str, bool]:
-    return {"ok": True}
-
-# ---------------------------------------------------------------------
-# PDF generation endpoint
+# Render data
 # ---------------------------------------------------------------------
-@app.post("/generate-form-simple")
-def generate_form_simple(payload: Dict[str, Any]) -> Response:
-    """Generate a resume PDF from the provided payload."""
-    try:
-        args = GeneratePayload.model_validate(payload)
-    except ValidationError as ve:
-        raise HTTPException(status_code=422, detail=json.loads(ve.json()))
-
+def _resolve_layout(args: GeneratePayload) -> Optional[Dict[str, Any]]:
+    """Return the request's layout (prefer inline, else read by name)."""
+    if args.layout_inline:
+        return args.layout_inline
+    if isinstance(args.layout_name, str) and args.layout_name.strip():
+        return _safe_read_layout_by_name(args.layout_name.strip())
+    return None
+
+def _build_render_data(
+    args: GeneratePayload,
+    layout_inline: Optional[Dict[str, Any]],
+    timings: Optional[Timings] = None,
+) -> Dict[str, Any]:
+    """Normalize a validated payload into the ``data`` mapping for build_resume_pdf.
+
+    ``layout_inline`` is not modified: the request's overrides and decoded
+    headshots go into a copy of the dicts they touch, the rest is shared.
+    Decoding headshots is CPU-bound: async handlers call this through
+    ``run_in_threadpool``.
+    ``timings`` receives the ``schema``, ``overrides`` and ``headshots`` stages.
+    """
     # Build base data for PDF builder
     data: Dict[str, Any] = {
         "theme_name": args.effective_theme_name(),
@@ -220,47 +316,550 @@ def generate_form_simple(payload: Dict[str, Any]) -> Response:
         "rtl_mode": bool(args.rtl_mode),
         "profile": args.profile or {},
     }
+    draft = args.quality == DRAFT
+    if draft:
+        data["quality"] = DRAFT  # print keeps its historical cache keys
 
     # Normalize profile data before PDF build
-    data["profile"] = ensure_profile_schema(data["profile"])
-
-    # Resolve layout_inline (prefer inline, else by name)
-    layout_inline = args.layout_inline
-    if not layout_inline and isinstance(args.layout_name, str) and args.layout_name.strip():
-        layout_inline = _safe_read_layout_by_name(args.layout_name.strip())
+    with stage(timings, "schema"):
+        data["profile"] = ensure_profile_schema(data["profile"])
+        # Coerce summary if it's a stringified list
+        if isinstance(data["profile"], dict):
+            coerce_summary(data["profile"])
 
-    if not layout_inline:
-        layout_inline = {"flow": []}
+    layout_inline = dict(_own_avatar_paths(layout_inline)) if layout_inline else {"flow": []}
 
     # Derive overrides from profile & merge (fill-only-missing)
-    ov_from_profile = profile_to_overrides(data["profile"])
-    layout_inline.setdefault("overrides", {})
-    layout_inline["overrides"] = _deep_merge_fill_missing(layout_inline["overrides"], ov_from_profile)
-
-    # Decode headshots (photo_b64 -> photo_bytes)
-    _decode_headshots(layout_inline)
-
-    # Coerce summary if it's a stringified list
-    if isinstance(data["profile"], dict):
-        coerce_summary(data["profile"])
+    with stage(timings, "overrides"):
+        ov_from_profile = profile_to_overrides(data["profile"])
+        overrides = _deep_merge_fill_missing(layout_inline.get("overrides") or {}, ov_from_profile)
+        avatar = overrides.get("avatar_circle")
+        if isinstance(avatar, dict):
+            # Headshot handling writes into the avatar override
+            overrides["avatar_circle"] = avatar = dict(avatar)
+            if isinstance(avatar.get("data"), dict):
+                avatar["data"] = dict(avatar["data"])
+        layout_inline["overrides"] = overrides
+
+    # Decode headshots (photo_b64 -> photo_bytes); drafts draw a placeholder instead
+    if not draft:
+        with stage(timings, "headshots"):
+            _decode_headshots(layout_inline)
 
     # Attach layout
     data["layout_inline"] = layout_inline
 
+    return data
+
+# ---------------------------------------------------------------------
+# Lifecycle & health
+# ---------------------------------------------------------------------
+@app.on_event("startup")
+def _startup() -> None:
+    # Fonts load lazily (and from the font cache) on first use; the render
+    # pool workers preload them in their initializer.
+    fonts.install_lazy_loader()
+    def _warm_pool() -> None:
+        try:
+            get_render_pool().start()
+        except Exception as exc:
+            log.warning("Render pool warm-up failed: %s", exc)
+
+    if LAZY_STARTUP:
+        # Ready immediately; the first renders may wait for workers to spawn.
+        threading.Thread(target=_warm_pool, name="render-pool-warmup", daemon=True).start()
+    else:
+        _warm_pool()
+
+@app.on_event("shutdown")
+def _shutdown() -> None:
+    shutdown_job_queue()
+    shutdown_render_pool()
+
+@app.get("/healthz")
+def healthz() -> Dict[str, Any]:
+    return {"ok": True, "render": get_render_pool().stats()}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Prometheus text exposition: stage/PDF histograms plus render and cache load."""
+    render = get_render_pool().stats()
+    cache = get_pdf_cache().stats()
+    gauges = {
+        "resume_render_in_flight": render["in_flight"],
+        "resume_render_capacity": render["capacity"],
+        "resume_render_queue_wait_avg_seconds": render["queue_wait_avg"],
+        "resume_pdf_cache_hits": cache.get("hits", 0),
+        "resume_pdf_cache_misses": cache.get("misses", 0),
+        "resume_render_flights_in_flight": _RENDERS.stats()["in_flight"],
+    }
+    return PlainTextResponse(render_metrics(gauges), media_type="text/plain; version=0.0.4")
+
+# ---------------------------------------------------------------------
+# PDF generation endpoint
+# ---------------------------------------------------------------------
+@app.post("/generate-form-simple")
+async def generate_form_simple(payload: Dict[str, Any], request: Request) -> Response:
+    """Generate a resume PDF from the provided payload (cached by content, ETag-aware)."""
+    timings = Timings()
+    with timings.stage("validate"):
+        check_payload(payload)
+        try:
+            args = GeneratePayload.model_validate(payload)
+        except ValidationError as ve:
+            raise HTTPException(status_code=422, detail=json.loads(ve.json()))
+
+    with timings.stage("layout"):
+        layout = _resolve_layout(args)
+    # Headshot decoding is CPU-bound: keep it off the event loop
+    data = await run_in_threadpool(_build_render_data, args, layout, timings)
+    return await _serve_pdf(data, request, timings)
+
+def _form_json(name: str, value: Optional[str]) -> Any:
+    """Parse a JSON form part (422 if it is not valid JSON)."""
+    if value is None or not value.strip():
+        return None
+    try:
+        return json.loads(value)
+    except ValueError as exc:
+        raise HTTPException(status_code=422, detail=f"Form field '{name}' is not valid JSON: {exc}")
+
+@app.post("/generate-form-multipart")
+async def generate_form_multipart(
+    request: Request,
+    profile: Optional[str] = Form(default=None, description="Profile JSON"),
+    layout_inline: Optional[str] = Form(default=None, description="Layout JSON"),
+    layout_name: Optional[str] = Form(default=None),
+    theme_name: Optional[str] = Form(default=None),
+    ui_lang: str = Form(default="en"),
+    rtl_mode: bool = Form(default=False),
+    quality: str = Form(default="print"),
+    photo: Optional[UploadFile] = File(default=None, description="Headshot image (binary)"),
+) -> Response:
+    """Multipart variant of /generate-form-simple: JSON parts plus a binary headshot.
+
+    The photo is read once and handed to the avatar blocks as bytes, skipping
+    the base64 inflation and the JSON walk of the b64 path.
+    """
+    timings = Timings()
+    with timings.stage("validate"):
+        payload = {
+            "profile": _form_json("profile", profile) or {},
+            "layout_inline": _form_json("layout_inline", layout_inline),
+            "layout_name": layout_name,
+            "theme_name": theme_name,
+            "ui_lang": ui_lang,
+            "rtl_mode": rtl_mode,
+            "quality": quality,
+        }
+        check_payload(payload)
+        if photo is not None and (photo.size or 0) > MAX_PHOTO_BYTES:
+            raise HTTPException(status_code=413, detail=f"Photo too large (max {MAX_PHOTO_BYTES // (1024 * 1024)} MB).")
+        try:
+            args = GeneratePayload.model_validate(payload)
+        except ValidationError as ve:
+            raise HTTPException(status_code=422, detail=json.loads(ve.json()))
+
+    with timings.stage("layout"):
+        layout = _resolve_layout(args)
+    # Headshot decoding is CPU-bound: keep it off the event loop
+    data = await run_in_threadpool(_build_render_data, args, layout, timings)
+    if photo is not None and data.get("quality") == DRAFT:
+        _mark_headshot_placeholder(data["layout_inline"])
+    elif photo is not None:
+        photo_bytes = await photo.read()
+        if photo_bytes:
+            check_photo(photo_bytes)
+            # Downscaling decodes the image: keep it off the event loop.
+            with timings.stage("headshots"):
+                await run_in_threadpool(_attach_headshot, data["layout_inline"], photo_bytes)
+    return await _serve_pdf(data, request, timings)
+
+def _mark_headshot_placeholder(layout_inline: Dict[str, Any]) -> None:
+    """Draft uploads: the avatar draws a placeholder, so the photo is never read."""
+    override = layout_inline.setdefault("overrides", {}).setdefault("avatar_circle", {})
+    if isinstance(override, dict):
+        override.setdefault("data", {})["photo_placeholder"] = True
+    for d in _avatar_data(layout_inline.get("flow")):
+        d["photo_placeholder"] = True
+
+async def _serve_pdf(data: Dict[str, Any], request: Request, timings: Optional[Timings] = None) -> Response:
+    """Render ``data`` through the PDF cache and the render pool (ETag-aware).
+
+    Stage durations go out in ``Server-Timing`` and into ``/metrics``.
+    """
+    timings = timings if timings is not None else Timings()
+    layout_inline = data["layout_inline"]
+
     # Log details
     flow = layout_inline.get("flow", [])
     blocks_count = sum(len(x.get("blocks", [])) for x in flow) if isinstance(flow, list) else 0
     log.info("PDF request: theme=%s blocks=%s", data["theme_name"], blocks_count)
 
-    # Build PDF
+    # Content-addressed cache: identical inputs -> identical PDF
+    with timings.stage("cache"):
+        key = cache_key(data)
+        headers = {
+            "Content-Disposition": 'inline; filename="resume.pdf"',
+            "Cache-Control": "private, no-cache",
+            "ETag": etag_for(key),
+        }
+        not_modified = etag_matches(request.headers.get("if-none-match"), headers["ETag"])
+        cache = get_pdf_cache()
+        pdf_bytes = None if not_modified else cache.get(key)
+
+    if not_modified or pdf_bytes is not None:
+        outcome = "not_modified" if not_modified else "hit"
+        _record_request(timings, outcome)
+        headers["Server-Timing"] = timings.server_timing({"cache": outcome})
+        if not_modified:
+            return Response(status_code=304, headers=headers)
+        headers["X-Cache"] = "HIT"
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+    # Build PDF on the render pool (or wait for the identical render in flight)
     try:
-        pdf_bytes = build_resume_pdf(data=data)
+        started = time.perf_counter()
+        (pdf_bytes, worker_stages, pages), shared = await _render_shared(key, data)
+        if shared:
+            timings.add("queue", time.perf_counter() - started)
+        else:
+            # Whatever the worker did not account for: queue wait and pickling
+            timings.add("queue", time.perf_counter() - started - sum(worker_stages.values()))
+            timings.update(worker_stages)
+    except RenderRejected as exc:
+        raise HTTPException(
+            status_code=429,
+            detail="Render queue is full, retry shortly.",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    except RenderUnavailable as exc:
+        log.warning("PDF build unavailable: %s", exc)
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"})
     except Exception as exc:
         log.exception("PDF build failed")
         raise HTTPException(status_code=500, detail=f"PDF build failed: {exc}")
 
-    headers = {
-        "Content-Disposition": 'inline; filename="resume.pdf"',
-        "Cache-Control": "no-store",
-    }
+    outcome = "shared" if shared else "miss"
+    _record_request(timings, outcome)
+    if not shared:
+        observe_pdf(len(pdf_bytes), pages)
+    headers["X-Cache"] = outcome.upper()
+    headers["Server-Timing"] = timings.server_timing({"cache": outcome})
     return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
+
+# Identical renders in flight are coalesced: one render, shared by all callers
+_RENDERS = SingleFlight()
+
+async def _render_shared(key: str, job: Dict[str, Any]) -> Tuple[Tuple[bytes, Dict[str, float], int], bool]:
+    """Render ``job`` on the pool unless an identical render is in flight.
+
+    The PDF is cached before the flight lands, so later callers hit the cache.
+    Returns ``((pdf, stages, pages), shared)``.
+    """
+    async def _render() -> Tuple[bytes, Dict[str, float], int]:
+        result = await get_render_pool().run(build_resume_pdf_timed, data=job)
+        get_pdf_cache().put(key, result[0])
+        return result
+
+    return await _RENDERS.run(key, _render)
+
+def _render_shared_blocking(key: str, job: Dict[str, Any]) -> Tuple[Tuple[bytes, Dict[str, float], int], bool]:
+    """Thread-side twin of ``_render_shared`` (joins the same flights)."""
+    def _render() -> Tuple[bytes, Dict[str, float], int]:
+        result = get_render_pool().call(build_resume_pdf_timed, data=job)
+        get_pdf_cache().put(key, result[0])
+        return result
+
+    return _RENDERS.call(key, _render)
+
+def _record_request(timings: Timings, outcome: str) -> None:
+    REQUESTS.inc(outcome)
+    observe_stages(timings.stages)
+
+# ---------------------------------------------------------------------
+# Batch generation endpoint
+# ---------------------------------------------------------------------
+BATCH_MAX_ITEMS = int(os.getenv("BATCH_MAX_ITEMS", "1000") or 1000)
+
+_THEME_KEYS = ("theme_name", "theme")
+_LAYOUT_KEYS = ("layout_inline", "layout_name")
+_FILENAME_RE = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+class GenerateBatchPayload(BaseModel):
+    """Shared defaults + per-item payloads (same fields as GeneratePayload)."""
+    theme_name: Optional[str] = None
+    theme: Optional[str] = None
+    ui_lang: Optional[str] = None
+    rtl_mode: Optional[bool] = None
+    layout_inline: Optional[Dict[str, Any]] = None
+    layout_name: Optional[str] = None
+    quality: Optional[Literal["print", "draft"]] = None
+
+    items: List[Dict[str, Any]] = Field(min_length=1)
+
+    def item_payloads(self) -> List[Dict[str, Any]]:
+        """Merge shared defaults into each item; item theme/layout replace shared ones."""
+        shared = self.model_dump(exclude={"items"}, exclude_none=True)
+        merged = []
+        for item in self.items:
+            base = dict(shared)
+            if any(item.get(k) for k in _THEME_KEYS):
+                for k in _THEME_KEYS:
+                    base.pop(k, None)
+            if any(item.get(k) for k in _LAYOUT_KEYS):
+                for k in _LAYOUT_KEYS:
+                    base.pop(k, None)
+            merged.append({**base, **item})
+        return merged
+
+
+class _ZipSink(io.RawIOBase):
+    """Non-seekable sink for ZipFile; the response drains it after each entry."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._chunks: List[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, b: Any) -> int:
+        self._chunks.append(bytes(b))
+        return len(b)
+
+    def drain(self) -> List[bytes]:
+        """Hand over the buffered chunks as written (PDF bodies are not re-joined)."""
+        chunks, self._chunks = self._chunks, []
+        return chunks
+
+
+def _batch_filename(index: int, payload: Dict[str, Any], profile: Dict[str, Any]) -> str:
+    """``NNN-<name>.pdf`` from the item's ``filename`` or the profile header name."""
+    header = profile.get("header") if isinstance(profile, dict) else None
+    name = header.get("name") if isinstance(header, dict) else None
+    stem = payload.get("filename") or name or "resume"
+    stem = _FILENAME_RE.sub("-", str(stem)).strip("-.")[:60] or "resume"
+    if stem.lower().endswith(".pdf"):
+        stem = stem[:-4]
+    return f"{index + 1:03d}-{stem}.pdf"
+
+
+async def _render_cached(data: Dict[str, Any], theme: Dict[str, Any]) -> bytes:
+    """Render one batch item via the PDF cache and the render pool.
+
+    The cache key is computed without ``theme_inline`` so batch and single
+    requests share entries. A full queue is waited out instead of failing the item.
+    """
+    cache = get_pdf_cache()
+    key = cache_key(data)
+    pdf_bytes = cache.get(key)
+    if pdf_bytes is not None:
+        return pdf_bytes
+    job = {**data, "theme_inline": theme} if theme else data
+    while True:
+        try:
+            (pdf_bytes, _, _), _ = await _render_shared(key, job)
+            return pdf_bytes
+        except RenderRejected as exc:
+            await asyncio.sleep(exc.retry_after)
+
+
+class _Batch:
+    """Validated batch: items plus every distinct theme and named layout, read once."""
+
+    def __init__(self, payload: Dict[str, Any]) -> None:
+        items = payload.get("items")
+        if isinstance(items, list) and len(items) > BATCH_MAX_ITEMS:
+            raise HTTPException(status_code=413, detail=f"Batch too large (max {BATCH_MAX_ITEMS} items).")
+        shared = {k: v for k, v in payload.items() if k != "items"}
+        check_payloads([shared, *(items if isinstance(items, list) else ())])
+        try:
+            batch = GenerateBatchPayload.model_validate(payload)
+            self.raw_items = batch.item_payloads()
+            self.items = [GeneratePayload.model_validate(p) for p in self.raw_items]
+        except ValidationError as ve:
+            raise HTTPException(status_code=422, detail=json.loads(ve.json()))
+
+        self.themes: Dict[str, Dict[str, Any]] = {}
+        self.layouts: Dict[str, Dict[str, Any]] = {}
+        for args in self.items:
+            tn = args.effective_theme_name()
+            if tn not in self.themes:
+                self.themes[tn] = _read_theme(tn)
+            name = (args.layout_name or "").strip()
+            if not args.layout_inline and name and name not in self.layouts:
+                self.layouts[name] = _safe_read_layout_by_name(name)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def filename(self, index: int) -> str:
+        return _batch_filename(index, self.raw_items[index], self.items[index].profile)
+
+    def item_data(self, index: int) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """Return ``(render data, theme)`` for one item."""
+        args = self.items[index]
+        layout = args.layout_inline or self.layouts.get((args.layout_name or "").strip())
+        data = _build_render_data(args, layout)
+        return data, self.themes[data["theme_name"]]
+
+
+@app.post("/generate-batch")
+async def generate_batch(payload: Dict[str, Any]) -> StreamingResponse:
+    """Render many profiles and stream them back as a ZIP, one entry at a time.
+
+    Themes and layouts are resolved once per batch; at most one render per
+    pool worker is in flight, so memory stays flat regardless of batch size.
+    A failed item becomes ``NNN-<name>.error.txt`` inside the archive.
+    """
+    batch = _Batch(payload)
+
+    async def _render_item(index: int) -> bytes:
+        item = await run_in_threadpool(batch.item_data, index)  # may decode headshots
+        return await _render_cached(*item)
+
+    window = max(1, get_render_pool().workers)
+    log.info("Batch request: items=%s themes=%s window=%s", len(batch), len(batch.themes), window)
+
+    async def _stream() -> AsyncIterator[bytes]:
+        sink = _ZipSink()
+        pending: Deque[Tuple[str, "asyncio.Task[bytes]"]] = deque()
+        next_index = 0
+
+        def _fill() -> None:
+            nonlocal next_index
+            while len(pending) < window and next_index < len(batch):
+                filename = batch.filename(next_index)
+                pending.append((filename, asyncio.ensure_future(_render_item(next_index))))
+                next_index += 1
+
+        try:
+            with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_STORED) as zf:
+                _fill()
+                while pending:
+                    filename, task = pending.popleft()
+                    try:
+                        zf.writestr(filename, await task)
+                    except Exception as exc:
+                        log.warning("Batch item %s failed: %s", filename, exc)
+                        zf.writestr(filename[:-4] + ".error.txt", f"PDF build failed: {exc}\n")
+                    _fill()
+                    for chunk in sink.drain():
+                        yield chunk
+            for chunk in sink.drain():
+                yield chunk
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    return StreamingResponse(
+        _stream(),
+        media_type="application/zip",
+        headers={"Content-Disposition": 'attachment; filename="resumes.zip"'},
+    )
+
+# ---------------------------------------------------------------------
+# Asynchronous jobs
+# ---------------------------------------------------------------------
+def _render_blocking(data: Dict[str, Any], theme: Optional[Dict[str, Any]] = None) -> bytes:
+    """Thread-side twin of ``_render_cached`` used by queued jobs."""
+    cache = get_pdf_cache()
+    key = cache_key(data)
+    pdf_bytes = cache.get(key)
+    if pdf_bytes is not None:
+        return pdf_bytes
+    job = {**data, "theme_inline": theme} if theme else data
+    while True:
+        try:
+            (pdf_bytes, _, _), _ = _render_shared_blocking(key, job)
+            return pdf_bytes
+        except RenderRejected as exc:
+            time.sleep(exc.retry_after)
+
+
+def _render_batch_zip(batch: _Batch) -> IO[bytes]:
+    """Render a batch into a spooled ZIP (same entries as /generate-batch).
+
+    Past the job queue's ``spool_bytes`` the ZIP is written to a temporary
+    file, so large batches do not sit in memory until their result expires.
+    """
+    buf = spool_file(get_job_queue().spool_bytes)
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_STORED) as zf:
+        for index in range(len(batch)):
+            filename = batch.filename(index)
+            try:
+                zf.writestr(filename, _render_blocking(*batch.item_data(index)))
+            except Exception as exc:
+                log.warning("Batch job item %s failed: %s", filename, exc)
+                zf.writestr(filename[:-4] + ".error.txt", f"PDF build failed: {exc}\n")
+    return buf
+
+
+def _job_links(job_id: str) -> Dict[str, str]:
+    return {"status_url": f"/jobs/{job_id}", "result_url": f"/jobs/{job_id}/result"}
+
+
+@app.post("/jobs", status_code=202)
+def create_job(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Queue a render and return its job id without waiting for the PDF.
+
+    The body is either a ``/generate-form-simple`` payload (result: a PDF) or
+    a ``/generate-batch`` payload with ``items`` (result: a ZIP). Validation,
+    theme and layout errors are reported synchronously, like the direct routes.
+    """
+    if "items" in payload:
+        batch = _Batch(payload)
+        fn = lambda: _render_batch_zip(batch)  # noqa: E731
+        kind, media_type, filename = "batch", "application/zip", "resumes.zip"
+    else:
+        check_payload(payload)
+        try:
+            args = GeneratePayload.model_validate(payload)
+        except ValidationError as ve:
+            raise HTTPException(status_code=422, detail=json.loads(ve.json()))
+        data = _build_render_data(args, _resolve_layout(args))
+        fn = lambda: _render_blocking(data)  # noqa: E731
+        kind, media_type, filename = "pdf", "application/pdf", "resume.pdf"
+
+    try:
+        job = get_job_queue().submit(fn, kind=kind, media_type=media_type, filename=filename)
+    except JobsFull as exc:
+        raise HTTPException(
+            status_code=429,
+            detail="Job queue is full, retry shortly.",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    log.info("Job queued: id=%s kind=%s", job.id, kind)
+    return {**job.to_dict(), **_job_links(job.id)}
+
+
+@app.get("/jobs/{job_id}")
+def job_status(job_id: str) -> Dict[str, Any]:
+    """Return a job's status (``queued``/``running``/``done``/``failed``)."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    return {**job.to_dict(), **_job_links(job.id)}
+
+
+@app.get("/jobs/{job_id}/result")
+def job_result(job_id: str) -> Response:
+    """Return the finished job's PDF/ZIP; ``409`` while it is still pending."""
+    job = get_job_queue().get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found or expired.")
+    if not job.finished:
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}.", headers={"Retry-After": "1"})
+    if job.result is None:
+        raise HTTPException(status_code=500, detail=f"PDF build failed: {job.error}")
+    disposition = "inline" if job.kind == "pdf" else "attachment"
+    return StreamingResponse(
+        job.iter_result(),
+        media_type=job.media_type,
+        headers={
+            "Content-Disposition": f'{disposition}; filename="{job.filename}"',
+            "Content-Length": str(job.result_size),
+        },
+    )
@@ -0,0 +1,139 @@
+"""Request metrics in the Prometheus text format, without extra dependencies.
+
+The generate path records per-stage durations (``api.pdf_utils.timing``)
+and the size and page count of every rendered PDF. ``GET /metrics`` exposes
+them as histograms, next to request counters and the render pool load.
+
+Metrics:
+- resume_stage_seconds{stage}      : histogram of per-stage durations
+- resume_pdf_bytes                 : histogram of rendered PDF sizes
+- resume_pdf_pages                 : histogram of rendered PDF page counts
+- resume_requests_total{cache}     : generate requests by cache outcome
+"""
+
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+STAGE_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+BYTES_BUCKETS = (10e3, 25e3, 50e3, 100e3, 250e3, 500e3, 1e6, 2.5e6, 5e6, 10e6)
+PAGES_BUCKETS = (1, 2, 3, 4, 5, 8, 12, 20)
+
+
+def _fmt(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+def _labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{n}="{v}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Histogram:
+    """Cumulative-bucket histogram with optional labels."""
+
+    def __init__(self, name: str, help: str, buckets: Iterable[float], labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.buckets = tuple(sorted(buckets))
+        self.label_names = tuple(labels)
+        # label values -> [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *label_values: str) -> None:
+        idx = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            counts, total = self._series.setdefault(
+                tuple(label_values), ([0] * (len(self.buckets) + 1), [0.0])
+            )
+            counts[idx] += 1
+            total[0] += value
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((k, (list(c), s[0])) for k, (c, s) in self._series.items())
+        for values, (counts, total) in series:
+            running = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                running += count
+                le = _labels(self.label_names, values, f'le="{_fmt(bound)}"')
+                lines.append(f"{self.name}_bucket{le} {running}")
+            lab = _labels(self.label_names, values)
+            lines.append(f"{self.name}_sum{lab} {total!r}")
+            lines.append(f"{self.name}_count{lab} {running}")
+        return lines
+
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, *label_values: str, amount: float = 1.0) -> None:
+        with self._lock:
+            key = tuple(label_values)
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines.extend(f"{self.name}{_labels(self.label_names, k)} {_fmt(v)}" for k, v in items)
+        return lines
+
+
+STAGE_SECONDS = Histogram("resume_stage_seconds", "Duration of each generate stage.", STAGE_BUCKETS, ("stage",))
+PDF_BYTES = Histogram("resume_pdf_bytes", "Size of rendered PDFs.", BYTES_BUCKETS)
+PDF_PAGES = Histogram("resume_pdf_pages", "Page count of rendered PDFs.", PAGES_BUCKETS)
+REQUESTS = Counter("resume_requests_total", "Generate requests by cache outcome.", ("cache",))
+
+_METRICS = (STAGE_SECONDS, PDF_BYTES, PDF_PAGES, REQUESTS)
+
+
+def observe_stages(stages: Mapping[str, float]) -> None:
+    for stage, seconds in stages.items():
+        STAGE_SECONDS.observe(seconds, stage)
+
+
+def observe_pdf(size: int, pages: Optional[int]) -> None:
+    PDF_BYTES.observe(size)
+    if pages:
+        PDF_PAGES.observe(pages)
+
+
+def render_metrics(gauges: Optional[Mapping[str, float]] = None) -> str:
+    """
+    Return all metrics in the Prometheus text exposition format.
+
+    Args:
+        gauges: Extra point-in-time values as ``{metric name: value}``.
+    """
+    lines: List[str] = []
+    for metric in _METRICS:
+        lines.extend(metric.render())
+    for name, value in (gauges or {}).items():
+        lines.append(f"# TYPE {name} gauge")
+        lines.append(f"{name} {_fmt(value)}")
+    return "\n".join(lines) + "\n"
+
+
+__all__ = [
+    "Counter",
+    "Histogram",
+    "observe_pdf",
+    "observe_stages",
+    "render_metrics",
+]
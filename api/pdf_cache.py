@@ -0,0 +1,224 @@
+"""Content-addressed cache for rendered resume PDFs.
+
+The cache key is a SHA-256 over the *normalized* render inputs (the exact
+``data`` mapping handed to ``build_resume_pdf``) plus the theme file's mtime,
+so identical previews from the Streamlit client or the PWA skip ReportLab
+entirely. The same key doubles as the response ``ETag``.
+
+Tiers:
+- memory : LRU bounded by entries and bytes (always on unless PDF_CACHE_ENTRIES=0)
+- disk   : optional, under ``outputs/pdf-cache`` with size-based eviction
+
+Configuration (environment):
+- PDF_CACHE_ENTRIES   : in-memory entries (default: 128; 0 disables the cache)
+- PDF_CACHE_MEMORY_MB : in-memory size limit (default: 64)
+- PDF_CACHE_DISK_MB   : on-disk size limit (default: 0 = disk tier off)
+- PDF_CACHE_DIR       : on-disk location (default: outputs/pdf-cache)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from api.pdf_utils.lru import LRUCache
+
+log = logging.getLogger("resume.cache")
+
+APP_ROOT = Path(__file__).resolve().parent.parent
+THEMES_DIR = APP_ROOT / "themes"
+DEFAULT_DISK_DIR = APP_ROOT / "outputs" / "pdf-cache"
+
+
+# ---------------------------------------------------------------------
+# Keys & ETags
+# ---------------------------------------------------------------------
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return {"__bytes__": hashlib.sha256(obj).hexdigest()}
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    return repr(obj)
+
+
+def _theme_version(theme_name: Any) -> int:
+    if not isinstance(theme_name, str) or not theme_name:
+        return 0
+    try:
+        return (THEMES_DIR / f"{theme_name}.theme.json").stat().st_mtime_ns
+    except OSError:
+        return 0
+
+
+def cache_key(data: Dict[str, Any]) -> str:
+    """Return the canonical hash of normalized render inputs."""
+    canonical = json.dumps(
+        {"data": data, "theme_version": _theme_version(data.get("theme_name"))},
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_json_default,
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def etag_for(key: str) -> str:
+    return f'"{key}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Evaluate an ``If-None-Match`` header (weak comparison, ``*`` allowed)."""
+    if not if_none_match:
+        return False
+    for tag in if_none_match.split(","):
+        tag = tag.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+# ---------------------------------------------------------------------
+# Disk tier
+# ---------------------------------------------------------------------
+class _DiskTier:
+    """Flat file store of ``<key>.pdf`` files evicted oldest-first by size."""
+
+    def __init__(self, root: Path, max_bytes: int):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._bytes = sum(p.stat().st_size for p in self.root.glob("*.pdf"))
+
+    def _path(self, key: str) -> Path:
+        return self.root / f"{key}.pdf"
+
+    def get(self, key: str) -> Optional[bytes]:
+        p = self._path(key)
+        try:
+            data = p.read_bytes()
+            os.utime(p)  # refresh for LRU-ish eviction
+            return data
+        except OSError:
+            return None
+
+    def put(self, key: str, data: bytes) -> None:
+        if len(data) > self.max_bytes:
+            return
+        target = self._path(key)
+        if target.exists():
+            return
+        with tempfile.NamedTemporaryFile(delete=False, dir=str(self.root), suffix=".tmp") as tmp:
+            tmp_path = Path(tmp.name)
+            tmp.write(data)
+        tmp_path.replace(target)
+        with self._lock:
+            self._bytes += len(data)
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        files = sorted(self.root.glob("*.pdf"), key=lambda p: p.stat().st_mtime)
+        for p in files:
+            if self._bytes <= self.max_bytes:
+                break
+            try:
+                size = p.stat().st_size
+                p.unlink()
+                self._bytes -= size
+            except OSError:
+                continue
+
+
+# ---------------------------------------------------------------------
+# Cache
+# ---------------------------------------------------------------------
+class PdfCache:
+    """Two-tier (memory, optional disk) cache of PDF bytes by content key."""
+
+    def __init__(
+        self,
+        entries: int = 128,
+        memory_bytes: int = 64 * 1024 * 1024,
+        disk_dir: Optional[Path] = None,
+        disk_bytes: int = 0,
+    ):
+        self.memory = LRUCache(entries, max_bytes=memory_bytes)
+        self.disk: Optional[_DiskTier] = None
+        if entries > 0 and disk_dir is not None and disk_bytes > 0:
+            try:
+                self.disk = _DiskTier(disk_dir, disk_bytes)
+            except OSError as exc:
+                log.warning("PDF disk cache disabled (%s): %s", disk_dir, exc)
+
+    @classmethod
+    def from_env(cls) -> "PdfCache":
+        def _int(name: str, default: int) -> int:
+            try:
+                return int(os.getenv(name, "").strip() or default)
+            except ValueError:
+                return default
+
+        mb = 1024 * 1024
+        return cls(
+            entries=_int("PDF_CACHE_ENTRIES", 128),
+            memory_bytes=_int("PDF_CACHE_MEMORY_MB", 64) * mb,
+            disk_dir=Path(os.getenv("PDF_CACHE_DIR") or DEFAULT_DISK_DIR),
+            disk_bytes=_int("PDF_CACHE_DISK_MB", 0) * mb,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.memory.maxsize > 0
+
+    def get(self, key: str) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        pdf = self.memory.get(key)
+        if pdf is None and self.disk is not None:
+            pdf = self.disk.get(key)
+            if pdf is not None:
+                self.memory.put(key, pdf)
+        return pdf
+
+    def put(self, key: str, pdf: bytes) -> None:
+        if not self.enabled:
+            return
+        self.memory.put(key, pdf)
+        if self.disk is not None:
+            try:
+                self.disk.put(key, pdf)
+            except OSError as exc:
+                log.warning("PDF disk cache write failed: %s", exc)
+
+    def stats(self) -> Dict[str, int]:
+        out = dict(self.memory.stats())
+        if self.disk is not None:
+            out["disk_bytes"] = self.disk._bytes
+        return out
+
+
+_CACHE: Optional[PdfCache] = None
+_CACHE_LOCK = threading.Lock()
+
+
+def get_pdf_cache() -> PdfCache:
+    """Return the process-wide cache, configured from the environment."""
+    global _CACHE
+    with _CACHE_LOCK:
+        if _CACHE is None:
+            _CACHE = PdfCache.from_env()
+        return _CACHE
+
+
+__all__ = ["PdfCache", "cache_key", "etag_for", "etag_matches", "get_pdf_cache"]
@@ -1,21 +1,39 @@
 ﻿"""
 Automatically loads and registers all block modules.
+
+With ``LAZY_STARTUP`` the modules are not imported here; the registry
+imports each one the first time its block id is looked up.
 """
 
-from . import (
-    header_name,
-    contact_info,
-    key_skills,
-    languages,
-    projects,
-    education,
-    text_section,
-    avatar_circle,
-    social_links,
-    left_panel_bg,
+import importlib
+
+from ..startup import LAZY_STARTUP
+
+# Module names double as block ids
+BLOCK_MODULES = (
+    "header_name",
+    "contact_info",
+    "key_skills",
+    "languages",
+    "projects",
+    "education",
+    "text_section",
+    "avatar_circle",
+    "social_links",
+    "left_panel_bg",
     # ًں†• Modern decorative and utility blocks
-    decor_curve,
-    header_bar,
-    links_inline,
-)  # noqa: F401
+    "decor_curve",
+    "header_bar",
+    "links_inline",
+)
+
+
+def load_all() -> None:
+    """Import (and so register) every block module."""
+    for name in BLOCK_MODULES:
+        importlib.import_module(f"{__name__}.{name}")
+
+
+if not LAZY_STARTUP:
+    load_all()
 
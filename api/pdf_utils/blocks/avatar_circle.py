@@ -2,7 +2,9 @@
 from io import BytesIO
 from reportlab.lib.units import mm
 from reportlab.lib.utils import ImageReader
-from ..config import LEFT_BORDER, CARD_PAD
+from ..draft import is_draft
+from ..headshot import DEFAULT_MAX_D_MM, normalize_headshot
+from ..theme_loader import theme_of
 from .base import Frame, RenderContext
 from .registry import register
 
@@ -10,12 +12,15 @@ class AvatarCircleBlock:
     BLOCK_ID = "avatar_circle"
 
     def render(self, c, frame: Frame, data: dict, ctx: RenderContext) -> float:
+        th = theme_of(ctx)
         # data: { "photo_bytes": bytes, "max_d_mm"?: float (ط§ظپطھط±ط§ط¶ظٹ 42) }
         photo_bytes = data.get("photo_bytes")
-        if not photo_bytes:
+        draft = is_draft(c)
+        if not photo_bytes and not (draft and (data.get("photo_b64") or data.get("photo_placeholder"))):
             return frame.y  # ظ„ط§ ط´ظٹط،
 
-        max_d = float(data.get("max_d_mm", 42)) * mm
+        max_d_mm = float(data.get("max_d_mm", DEFAULT_MAX_D_MM))
+        max_d = max_d_mm * mm
         d = min(frame.w, max_d)
         r = d / 2.0
         cx = frame.x + frame.w / 2.0
@@ -24,14 +29,22 @@ class AvatarCircleBlock:
         iy = cy - r
 
         try:
-            img = ImageReader(BytesIO(photo_bytes))
-            c.saveState()
-            p = c.beginPath()
-            p.circle(cx, cy, r)
-            c.clipPath(p, stroke=0, fill=0)
-            c.drawImage(img, ix, iy, width=d, height=d, preserveAspectRatio=True, mask="auto")
-            c.restoreState()
-            c.setStrokeColor(LEFT_BORDER)
+            if draft:
+                # Preview: placeholder disc, the photo is not decoded
+                c.saveState()
+                c.setFillColor(th.LEFT_BORDER)
+                c.circle(cx, cy, r, stroke=0, fill=1)
+                c.restoreState()
+            else:
+                # Print-resolution JPEG: embedded without re-encoding
+                img = ImageReader(BytesIO(normalize_headshot(photo_bytes, max_d_mm)))
+                c.saveState()
+                p = c.beginPath()
+                p.circle(cx, cy, r)
+                c.clipPath(p, stroke=0, fill=0)
+                c.drawImage(img, ix, iy, width=d, height=d, preserveAspectRatio=True, mask="auto")
+                c.restoreState()
+            c.setStrokeColor(th.LEFT_BORDER)
             c.setLineWidth(1)
             c.circle(cx, cy, r)
             new_y = iy - 6 * mm
@@ -1,6 +1,9 @@
 ﻿from __future__ import annotations
 from dataclasses import dataclass
-from typing import Protocol, TypedDict, Any
+from typing import TYPE_CHECKING, Protocol, TypedDict, Any
+
+if TYPE_CHECKING:
+    from ..theme_loader import Theme
 
 @dataclass
 class Frame:
@@ -11,6 +14,8 @@ class Frame:
 class RenderContext(TypedDict, total=False):
     rtl_mode: bool
     ui_lang: str
+    theme: dict[str, Any]   # merged theme JSON (read-only)
+    style: "Theme"          # compiled theme; read it via theme_loader.theme_of(ctx)
 
 class Block(Protocol):
     BLOCK_ID: str
@@ -18,3 +23,12 @@ class Block(Protocol):
         """ط§ط±ط³ظ… ط¯ط§ط®ظ„ ط§ظ„ط¥ط·ط§ط± ط§ظ„ظ…ظڈط¹ط·ظ‰ ظˆط£ط¹ط¯ y ط§ظ„ط¬ط¯ظٹط¯ط© ط¨ط¹ط¯ ط§ظ„ط±ط³ظ…."""
         ...
 
+class MeasurableBlock(Block, Protocol):
+    """Block that can report its height up front (optional extension).
+
+    The layout engine calls ``measure`` before drawing to decide page breaks;
+    blocks without it are measured by recording a ``render`` call instead.
+    """
+    def measure(self, frame: Frame, data: dict[str, Any], ctx: RenderContext) -> float:
+        """Return the height (in points) that ``render`` would consume."""
+        ...
@@ -5,6 +5,7 @@ from reportlab.lib.units import mm
 
 from .base import Frame, RenderContext
 from .registry import register
+from ..forms import draw_cached_form
 
 
 class DecorCurveBlock:
@@ -21,6 +22,20 @@ class DecorCurveBlock:
 
     BLOCK_ID = "decor_curve"
 
+    def measure(self, frame: Frame, data: dict, ctx: RenderContext) -> float:
+        """
+        Return the height of the curve plus the gap below it.
+
+        Args:
+            frame (Frame): Frame object with layout dimensions.
+            data (dict): Block-specific data.
+            ctx (RenderContext): Rendering context (not used here).
+
+        Returns:
+            float: Height in points.
+        """
+        return float(data.get("height_mm", 15)) * mm + 2 * mm
+
     def render(self, c: Canvas, frame: Frame, data: dict, ctx: RenderContext) -> float:
         """
         Render a decorative curved rectangle.
@@ -39,15 +54,20 @@ class DecorCurveBlock:
         width = frame.w
         y = frame.y
 
-        c.setFillColor(colors.HexColor(color))
-        c.roundRect(
-            frame.x,
-            y - height_mm * mm,
-            width,
-            height_mm * mm,
-            6 * mm,
-            fill=1,
-            stroke=0
+        def _draw(c: Canvas) -> None:
+            c.setFillColor(colors.HexColor(color))
+            c.roundRect(
+                0,
+                0,
+                width,
+                height_mm * mm,
+                6 * mm,
+                fill=1,
+                stroke=0
+            )
+
+        draw_cached_form(
+            c, "decor_curve", (width, height_mm, color), _draw, at=(frame.x, y - height_mm * mm)
         )
 
         return y - height_mm * mm - 2 * mm
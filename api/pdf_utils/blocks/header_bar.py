@@ -6,6 +6,7 @@ from reportlab.pdfbase.pdfmetrics import stringWidth
 
 from .base import Frame, RenderContext
 from .registry import register
+from ..forms import draw_cached_form
 
 
 class HeaderBarBlock:
@@ -24,6 +25,20 @@ class HeaderBarBlock:
 
     BLOCK_ID = "header_bar"
 
+    def measure(self, frame: Frame, data: dict, ctx: RenderContext) -> float:
+        """
+        Return the height of the bar plus its bottom padding.
+
+        Args:
+            frame (Frame): Frame containing position and size.
+            data (dict): Block-specific data.
+            ctx (RenderContext): Rendering context (unused).
+
+        Returns:
+            float: Height in points.
+        """
+        return 12 * mm + float(data.get("pad_mm", 4)) * mm
+
     def render(self, c: Canvas, frame: Frame, data: dict, ctx: RenderContext) -> float:
         """
         Render the header bar with centered text.
@@ -45,8 +60,12 @@ class HeaderBarBlock:
         y = frame.y
         h = 12 * mm
 
-        c.setFillColor(colors.HexColor(bg_color))
-        c.rect(frame.x, y - h, frame.w, h, stroke=0, fill=1)
+        def _draw(c: Canvas) -> None:
+            c.setFillColor(colors.HexColor(bg_color))
+            c.rect(0, 0, frame.w, h, stroke=0, fill=1)
+
+        # The bar is shared by size and color; the title is drawn on top.
+        draw_cached_form(c, "header_bar", (frame.w, h, bg_color), _draw, at=(frame.x, y - h))
 
         c.setFillColor(colors.HexColor(text_color))
         c.setFont("Helvetica-Bold", 12)
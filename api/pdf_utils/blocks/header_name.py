@@ -1,5 +1,5 @@
 ﻿from reportlab.pdfgen.canvas import Canvas
-from ..config import HEADING_COLOR
+from ..theme_loader import theme_of
 from .base import Frame, RenderContext
 from .registry import register
 
@@ -13,6 +13,22 @@ class HeaderNameBlock:
     """
     BLOCK_ID = "header_name"
 
+    def measure(self, frame: Frame, data: dict, ctx: RenderContext) -> float:
+        """
+        Return the height taken by the name and title lines.
+
+        Args:
+            frame (Frame): The layout frame with position data.
+            data (dict): Dictionary containing "name" and "title" keys.
+            ctx (RenderContext): Context for rendering (unused in this method).
+
+        Returns:
+            float: Height in points.
+        """
+        name = (data.get("name") or "").strip()
+        title = (data.get("title") or "").strip()
+        return (20 if name else 0) + (15 if title else 0)
+
     def render(self, c: Canvas, frame: Frame, data: dict, ctx: RenderContext) -> float:
         """
         Render the name and title in the provided PDF canvas.
@@ -26,6 +42,7 @@ class HeaderNameBlock:
         Returns:
             float: The updated y-coordinate after rendering the content.
         """
+        th = theme_of(ctx)
         name = (data.get("name") or "").strip()
         title = (data.get("title") or "").strip()
         y = frame.y
@@ -37,7 +54,7 @@ class HeaderNameBlock:
 
         if title:
             c.setFont("Helvetica", 12)
-            c.setFillColor(HEADING_COLOR)
+            c.setFillColor(th.HEADING_COLOR)
             c.drawString(frame.x, y, title)
             y -= 15
 
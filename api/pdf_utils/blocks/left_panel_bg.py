@@ -4,9 +4,14 @@ from reportlab.lib import colors
 from reportlab.lib.units import mm
 from reportlab.pdfgen.canvas import Canvas
 
+from ..theme_loader import theme_of
 from .base import Frame, RenderContext
 from .registry import register
-from ..config import LEFT_BG, LEFT_BORDER
+from ..forms import draw_cached_form
+
+def _as_color(value) -> colors.Color:
+    # Theme values are already Color objects; layout data is usually hex.
+    return value if isinstance(value, colors.Color) else colors.HexColor(value)
 
 class LeftPanelBG:
     """
@@ -19,11 +24,12 @@ class LeftPanelBG:
     BLOCK_ID = "left_panel_bg"
 
     def render(self, c: Canvas, frame: Frame, data: dict, ctx: RenderContext) -> float:
+        th = theme_of(ctx)
         # ط§ظ„ط¥ط¹ط¯ط§ط¯ط§طھ
         pad_mm  = float((data or {}).get("pad_mm") or 4.0)
         pad     = pad_mm * mm
-        bg_hex  = (data or {}).get("bg") or LEFT_BG or "#F7F8FA"
-        br_hex  = (data or {}).get("border") or LEFT_BORDER  # ظ‚ط¯ ظٹظƒظˆظ† None
+        bg_hex  = (data or {}).get("bg") or th.LEFT_BG or "#F7F8FA"
+        br_hex  = (data or {}).get("border") or th.LEFT_BORDER  # ظ‚ط¯ ظٹظƒظˆظ† None
 
         # ط£ط¨ط¹ط§ط¯ ط§ظ„ط±ط³ظ…
         x      = frame.x
@@ -33,28 +39,31 @@ class LeftPanelBG:
         h      = max(0.0, page_h - (2 * pad))
 
         # ط§ظ„ط±ط³ظ…
-        c.saveState()
-        try:
-            c.setFillColor(colors.HexColor(bg_hex))
-        except Exception:
-            c.setFillColor(colors.HexColor("#F7F8FA"))
-
-        # ط§ط³طھط®ط¯ظ… roundRect ظ…ظ† ReportLab ظ…ط¨ط§ط´ط±ط© ظ„طھط¬ظ†ط¨ ط§ط®طھظ„ط§ظپ طھظˆط§ظ‚ظٹط¹ util
-        # ظ…ظ„ط§ط­ط¸ط©: radius ط¨ظˆط­ط¯ط§طھ ط§ظ„ظ†ظ‚ط§ط· (ظ„ظٹط³ mm)
-        radius = 6  # ظ†ظ‚ط§ط·
-        c.roundRect(x, top_y - h, w, h, radius, stroke=0, fill=1)
-
-        # ط®ط· ط­ط¯ظˆط¯ ط§ط®طھظٹط§ط±ظٹ
-        if br_hex:
+        def _draw(c: Canvas) -> None:
+            c.saveState()
             try:
-                c.setStrokeColor(colors.HexColor(br_hex))
+                c.setFillColor(_as_color(bg_hex))
             except Exception:
-                c.setStrokeColor(colors.HexColor("#E3E6EA"))
-            c.setLineWidth(0.6)
-            # ط®ط· ط±ظپظٹط¹ ط¹ظ„ظ‰ ط­ط§ظپط© ط§ظ„ط¹ظ…ظˆط¯ ط§ظ„ظٹط³ط±ظ‰
-            c.line(x, top_y - h, x, top_y)
+                c.setFillColor(colors.HexColor("#F7F8FA"))
+
+            # ط§ط³طھط®ط¯ظ… roundRect ظ…ظ† ReportLab ظ…ط¨ط§ط´ط±ط© ظ„طھط¬ظ†ط¨ ط§ط®طھظ„ط§ظپ طھظˆط§ظ‚ظٹط¹ util
+            # ظ…ظ„ط§ط­ط¸ط©: radius ط¨ظˆط­ط¯ط§طھ ط§ظ„ظ†ظ‚ط§ط· (ظ„ظٹط³ mm)
+            radius = 6  # ظ†ظ‚ط§ط·
+            c.roundRect(x, top_y - h, w, h, radius, stroke=0, fill=1)
+
+            # ط®ط· ط­ط¯ظˆط¯ ط§ط®طھظٹط§ط±ظٹ
+            if br_hex:
+                try:
+                    c.setStrokeColor(_as_color(br_hex))
+                except Exception:
+                    c.setStrokeColor(colors.HexColor("#E3E6EA"))
+                c.setLineWidth(0.6)
+                # ط®ط· ط±ظپظٹط¹ ط¹ظ„ظ‰ ط­ط§ظپط© ط§ظ„ط¹ظ…ظˆط¯ ط§ظ„ظٹط³ط±ظ‰
+                c.line(x, top_y - h, x, top_y)
+
+            c.restoreState()
 
-        c.restoreState()
+        draw_cached_form(c, "left_panel_bg", (x, top_y, w, h, bg_hex, br_hex), _draw)
         # ظ„ط§ ظ†ط؛ظٹظ‘ط± Yط› ط§ظ„ط®ظ„ظپظٹط© ظپظ‚ط·
         return frame.y
 
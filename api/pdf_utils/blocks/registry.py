@@ -1,4 +1,5 @@
 ﻿from __future__ import annotations
+import importlib
 from typing import Dict, Any
 
 # Global dictionary to store registered blocks
@@ -41,10 +42,19 @@ def get(bid: str):
     """
     if ":" in bid:
         bid = bid.split(":")[0]
+    if bid not in _BLOCKS:
+        _import_block_module(bid)
     if bid not in _BLOCKS:
         raise KeyError(f"Block '{bid}' not registered")
     return _BLOCKS[bid]
 
+def _import_block_module(bid: str) -> None:
+    """Import a known block module on first lookup (lazy startup)."""
+    from . import BLOCK_MODULES
+
+    if bid in BLOCK_MODULES:
+        importlib.import_module(f"{__package__}.{bid}")
+
 def list_registered() -> list[str]:
     """
     Return a sorted list of all registered block IDs.
@@ -52,5 +62,8 @@ def list_registered() -> list[str]:
     Returns:
         list[str]: Sorted list of registered block identifiers.
     """
+    from . import load_all
+
+    load_all()
     return sorted(_BLOCKS.keys())
 
@@ -3,16 +3,11 @@ from typing import Any, Dict, List, Tuple
 from reportlab.pdfbase import pdfmetrics
 from reportlab.lib import colors
 
-from ..config import (
-    LEFT_SEC_TITLE_TOP_GAP, LEFT_SEC_HEADING_SIZE, HEADING_COLOR,
-    LEFT_SEC_RULE_COLOR, LEFT_SEC_RULE_WIDTH, LEFT_SEC_TITLE_BOTTOM_GAP,
-    LEFT_SEC_RULE_TO_LIST_GAP, LEFT_TEXT_SIZE, LEFT_LINE_GAP,
-)
 from ..labels import t
-from ..config import UI_LANG
 from ..icons import get_section_icon, draw_heading_with_icon, ICON_PATHS
 from ..text import wrap_text
 from .. import social  # ظ†ط³طھط®ط¯ظ… ط£ط¯ظˆط§طھ ط§ظ„طھظ†ط¸ظٹظپ/ط§ظ„ط¨ظ†ط§ط، ظ…ظ† social.py ظ„ظˆ ظ…طھط§ط­ط©
+from ..theme_loader import theme_of
 from .base import Frame, RenderContext
 from .registry import register
 
@@ -87,21 +82,22 @@ class SocialLinksBlock:
         return v  # fallback
 
     def render(self, c, frame: Frame, data: Dict[str, Any], ctx: RenderContext) -> float:
-        title = (data.get("title") or t("social_links", ctx.get("ui_lang") or UI_LANG))
+        th = theme_of(ctx)
+        title = (data.get("title") or t("social_links", ctx.get("ui_lang") or th.UI_LANG))
         triples = self._normalize(data)  # [(label, value, url)]
         if not triples:
             return frame.y
 
-        y = frame.y - LEFT_SEC_TITLE_TOP_GAP
+        y = frame.y - th.LEFT_SEC_TITLE_TOP_GAP
         y = draw_heading_with_icon(
             c=c, x=frame.x, y=y, title=title, icon=get_section_icon("social"),
-            font="Helvetica-Bold", size=LEFT_SEC_HEADING_SIZE, color=HEADING_COLOR,
-            underline_w=frame.w, rule_color=LEFT_SEC_RULE_COLOR, rule_width=LEFT_SEC_RULE_WIDTH,
-            gap_below=LEFT_SEC_TITLE_BOTTOM_GAP / 2,
+            font="Helvetica-Bold", size=th.LEFT_SEC_HEADING_SIZE, color=th.HEADING_COLOR,
+            underline_w=frame.w, rule_color=th.LEFT_SEC_RULE_COLOR, rule_width=th.LEFT_SEC_RULE_WIDTH,
+            gap_below=th.LEFT_SEC_TITLE_BOTTOM_GAP / 2,
         )
-        y -= LEFT_SEC_RULE_TO_LIST_GAP
+        y -= th.LEFT_SEC_RULE_TO_LIST_GAP
 
-        c.setFont("Helvetica", LEFT_TEXT_SIZE)
+        c.setFont("Helvetica", th.LEFT_TEXT_SIZE)
         c.setFillColor(colors.black)
 
         for (label, value, url) in triples:
@@ -117,7 +113,7 @@ class SocialLinksBlock:
                 # ط­ط³ط§ط¨ ط¹ط±ط¶ "label: " ط¹ط´ط§ظ† ظ†ط±ط¨ط· ظ…ظ† ط¨ط¹ط¯ظ‡
                 prefix = f"{label}: "
                 fn = "Helvetica"
-                fs = LEFT_TEXT_SIZE
+                fs = th.LEFT_TEXT_SIZE
                 px = pdfmetrics.stringWidth(prefix, fn, fs)
                 tw = pdfmetrics.stringWidth(value, fn, fs)
                 asc = pdfmetrics.getAscent(fn)/1000.0 * fs
@@ -128,7 +124,7 @@ class SocialLinksBlock:
                 except Exception:
                     pass
 
-            y -= LEFT_LINE_GAP
+            y -= th.LEFT_LINE_GAP
 
         return y
 
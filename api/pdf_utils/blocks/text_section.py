@@ -4,9 +4,9 @@ from reportlab.lib import colors
 from reportlab.pdfgen.canvas import Canvas
 from reportlab.lib.units import mm
 
-from ..config import *
 from ..text import draw_par
 from ..icons import draw_heading_with_icon
+from ..theme_loader import theme_of
 from .base import Frame, RenderContext
 from .registry import register
 
@@ -26,6 +26,7 @@ class TextSectionBlock:
     BLOCK_ID = "text_section"
 
     def render(self, c: Canvas, frame: Frame, data: dict, ctx: RenderContext) -> float:
+        th = theme_of(ctx)
         section = (data.get("section") or data.get("key") or "summary").strip()
 
         # ًںڈ·ï¸ڈ طھط­ط¯ظٹط¯ ط§ظ„ط¹ظ†ظˆط§ظ† ط§ظ„ط§ظپطھط±ط§ط¶ظٹ ط­ط³ط¨ ظ†ظˆط¹ ط§ظ„ظ‚ط³ظ…
@@ -51,33 +52,33 @@ class TextSectionBlock:
             title=title,
             icon=None,
             font="Helvetica-Bold",
-            size=RIGHT_SEC_HEADING_SIZE,
-            color=HEADING_COLOR,
+            size=th.RIGHT_SEC_HEADING_SIZE,
+            color=th.HEADING_COLOR,
             underline_w=frame.w,
-            rule_color=RIGHT_SEC_RULE_COLOR,
-            rule_width=RIGHT_SEC_RULE_WIDTH,
-            gap_below=GAP_AFTER_HEADING / 2,
+            rule_color=th.RIGHT_SEC_RULE_COLOR,
+            rule_width=th.RIGHT_SEC_RULE_WIDTH,
+            gap_below=th.GAP_AFTER_HEADING / 2,
         )
-        y -= RIGHT_SEC_RULE_TO_TEXT_GAP
+        y -= th.RIGHT_SEC_RULE_TO_TEXT_GAP
 
         # âœچï¸ڈ ط±ط³ظ… ط§ظ„ظ†طµظˆطµ ظپظ‚ط±ط© ظپظ‚ط±ط©
-        c.setFont("Helvetica", RIGHT_SEC_TEXT_SIZE)
+        c.setFont("Helvetica", th.RIGHT_SEC_TEXT_SIZE)
         c.setFillColor(colors.black)
-        y = draw_par(
-            c,
-            frame.x,
-            y,
-            lines,
-            "Helvetica",
-            RIGHT_SEC_TEXT_SIZE,
-            frame.w,
-            "left",
-            False,
-            BODY_LEADING,
-            RIGHT_SEC_PARA_GAP,
-        )
+        for i, para in enumerate(lines):
+            if i:
+                y -= th.RIGHT_SEC_PARA_GAP
+            y = draw_par(
+                c,
+                frame.x,
+                y,
+                frame.w,
+                str(para),
+                th.BODY_LEADING,
+                "Helvetica",
+                th.RIGHT_SEC_TEXT_SIZE,
+            )
 
-        y -= RIGHT_SEC_SECTION_GAP
+        y -= th.RIGHT_SEC_SECTION_GAP
         return y
 
 
@@ -7,7 +7,6 @@ Adds dynamic font availability checks & safe fallbacks to avoid KeyError.
 from __future__ import annotations
 
 import json
-from io import BytesIO
 from pathlib import Path
 from typing import Any, Callable, Dict, List, Optional, Tuple
 
@@ -15,67 +14,28 @@ from reportlab.lib.colors import HexColor, black
 from reportlab.lib.pagesizes import A4
 from reportlab.lib.units import mm
 from reportlab.pdfgen import canvas
-from reportlab.pdfbase import pdfmetrics
 
-import re
-
-_AR_RE = re.compile(r"[\u0600-\u06FF]")
+from api.pdf_utils.draft import PageLimitReached, is_draft, new_canvas
+from api.pdf_utils.font_table import FontTable, font_table
+from api.pdf_utils.forms import draw_cached_form
+from api.pdf_utils.rtl import ARABIC_RE as _AR_RE, rtl_line, rtl_many
+from api.pdf_utils.text import break_lines, string_width, wrapped_lines
+from api.pdf_utils.timing import Timings, stage as _stage
 
 def _is_arabic(s: str) -> bool:
     return bool(_AR_RE.search(s or ""))
 
-from reportlab.pdfbase import pdfmetrics
-
-def _pick_line_font(st, prefer_ar="NotoNaskhArabic", prefer_lat="DejaVuSans"):
-    regs = set(pdfmetrics.getRegisteredFontNames())
-    ar = prefer_ar if prefer_ar in regs else (st["font"] if st["font"] in regs else "Helvetica")
-    la = prefer_lat if prefer_lat in regs else (st["font"] if st["font"] in regs else "Helvetica")
-    return ar, la
-
 
 # ========== RTL / Arabic Support ==========
-try:
-    import arabic_reshaper  # type: ignore
-    from bidi.algorithm import get_display  # type: ignore
-
-    def _rtl_process(s: str) -> str:
-        if not s:
-            return ""
-        reshaped = arabic_reshaper.reshape(s)
-        return get_display(reshaped)
-
-except Exception:
-
-    def _rtl_process(s: str) -> str:
-        return s or ""
+# Whole-line reshape + bidi, memoized in api.pdf_utils.rtl
+_rtl_process = rtl_line
 
 
 # ========== Font helpers (safety) ==========
 
-def _safe_set_font(c: canvas.Canvas, name: str, size: int) -> None:
-    """Try setFont; fallback gracefully to DejaVuSans or Helvetica."""
-    try:
-        c.setFont(name, size)
-        return
-    except Exception:
-        pass
-    regs = set(pdfmetrics.getRegisteredFontNames())
-    fb = "DejaVuSans" if "DejaVuSans" in regs else "Helvetica"
-    c.setFont(fb, size)
-
-
-def _resolve_font_name(name: str) -> str:
-    """Return an available font name or a safe fallback."""
-    regs = set(pdfmetrics.getRegisteredFontNames())
-    if name in regs:
-        return name
-    if name and name + "-Bold" in regs:
-        return name
-    if "NotoNaskhArabic" in regs:
-        return "NotoNaskhArabic"
-    if "DejaVuSans" in regs:
-        return "DejaVuSans"
-    return "Helvetica"
+def _safe_set_font(c: canvas.Canvas, name: str, size: int, fonts: Optional[FontTable] = None) -> None:
+    """setFont with a name resolved through the theme's font table (no try/except)."""
+    c.setFont((fonts or font_table()).resolve(name), size)
 
 
 # ========== Helpers ==========
@@ -150,22 +110,10 @@ def _wrap_text(
     max_w: float,
     font: str = "Helvetica",
     size: int = 10,
+    fonts: Optional[FontTable] = None,
 ) -> List[str]:
-    _safe_set_font(c, font, size)
-    words = str(text).split()
-    lines: List[str] = []
-    cur = ""
-    for w in words:
-        test = (cur + " " + w).strip()
-        if c.stringWidth(test, font, size) <= max_w:
-            cur = test
-        else:
-            if cur:
-                lines.append(cur)
-            cur = w
-    if cur:
-        lines.append(cur)
-    return lines or [""]
+    _safe_set_font(c, font, size, fonts)
+    return list(wrapped_lines(text, max_w, font, size))
 
 
 def _draw_paragraph(
@@ -178,27 +126,49 @@ def _draw_paragraph(
     font: str = "Helvetica",
     size: int = 10,
     rtl: bool = False,
+    fonts: Optional[FontTable] = None,
 ) -> float:
     if not text:
         return y
 
-    ar_font, la_font = _pick_line_font(st={"font": font})
+    fonts = fonts or font_table(font)
+    ar_font, la_font = fonts.arabic, fonts.latin
+    # Drafts skip per-character font fallback: one font per line, same metrics
+    split_runs = not is_draft(c)
 
-    for raw in str(text).splitlines():
-        is_ar = _is_arabic(raw)
+    def _runs_width(runs: List[Tuple[str, str]]) -> float:
+        return sum(string_width(t, f, size) for f, t in runs)
+
+    raws = str(text).splitlines()
+    # Non-Arabic lines come back unchanged, so the whole paragraph goes in one batch
+    renders = rtl_many(raws, whole_line=True) if rtl else raws
 
-        render = _rtl_process(raw) if (rtl and is_ar) else raw
+    for raw, render in zip(raws, renders):
+        is_ar = _is_arabic(raw)
 
         line_font = ar_font if is_ar else la_font
 
-        lines = _wrap_text(c, render, w, line_font, size)
+        if split_runs and len(fonts.runs(render, line_font)) > 1:
+            # Mixed scripts: measure and draw each run in a font that covers it
+            lines = break_lines(render, w, line_font, size,
+                                measure=lambda s: _runs_width(fonts.runs(s, line_font)))
+        else:
+            lines = _wrap_text(c, render, w, line_font, size, fonts)
 
         for ln in lines:
-            _safe_set_font(c, line_font, size)
-            if rtl and is_ar:
-                c.drawRightString(x + w, y, ln)
+            runs = fonts.runs(ln, line_font) if split_runs else ()
+            if len(runs) <= 1:
+                c.setFont(line_font, size)
+                if rtl and is_ar:
+                    c.drawRightString(x + w, y, ln)
+                else:
+                    c.drawString(x, y, ln)
             else:
-                c.drawString(x, y, ln)
+                cx = x + w - _runs_width(runs) if (rtl and is_ar) else x
+                for run_font, run in runs:
+                    c.setFont(run_font, size)
+                    c.drawString(cx, y, run)
+                    cx += string_width(run, run_font, size)
             y -= leading
 
     return y
@@ -259,12 +229,12 @@ def _block_header_name(
     name = head.get("name", "")
     title = head.get("title", "")
     c.setFillColor(st["primary"])
-    _safe_set_font(c, st["font_head"], st["sizes"]["h1"])
+    _safe_set_font(c, st["font_head"], st["sizes"]["h1"], st["fonts"])
     if name:
         (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, name)
         y -= st["sizes"]["lead_h1"]
     c.setFillColor(st["text"])
-    _safe_set_font(c, st["font_bold"], st["sizes"]["h2"])
+    _safe_set_font(c, st["font_bold"], st["sizes"]["h2"], st["fonts"])
     if title:
         (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, title)
         y -= st["sizes"]["lead_h2"]
@@ -283,14 +253,14 @@ def _block_contact_info(
     contact = profile.get("contact") or {}
     if not contact:
         return y
-    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"])
+    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"], st["fonts"])
     (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, "Contact")
     y -= st["sizes"]["lead_h3"]
-    _safe_set_font(c, st["font"], st["sizes"]["body"])
+    _safe_set_font(c, st["font"], st["sizes"]["body"], st["fonts"])
     for _, v in contact.items():
         if v:
             y = _draw_paragraph(
-                c, x, y, w, f"• {v}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl
+                c, x, y, w, f"• {v}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl, st["fonts"]
             )
     return y - st["sp_after_list"]
 
@@ -308,12 +278,12 @@ def _block_social_links(
     links = [v for k, v in contact.items() if k in ("github", "linkedin", "website") and v]
     if not links:
         return y
-    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"])
+    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"], st["fonts"])
     (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, "Social")
     y -= st["sizes"]["lead_h3"]
     for link in links:
         y = _draw_paragraph(
-            c, x, y, w, f"• {link}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl
+            c, x, y, w, f"• {link}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl, st["fonts"]
         )
     return y - st["sp_after_list"]
 
@@ -330,12 +300,12 @@ def _block_key_skills(
     skills = _text_to_lines(profile.get("skills"))
     if not skills:
         return y
-    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"])
+    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"], st["fonts"])
     (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, "Key Skills")
     y -= st["sizes"]["lead_h3"]
     for s in skills:
         y = _draw_paragraph(
-            c, x, y, w, f"• {s}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl
+            c, x, y, w, f"• {s}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl, st["fonts"]
         )
     return y - st["sp_after_list"]
 
@@ -352,12 +322,12 @@ def _block_languages(
     langs = _text_to_lines(profile.get("languages"))
     if not langs:
         return y
-    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"])
+    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"], st["fonts"])
     (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, "Languages")
     y -= st["sizes"]["lead_h3"]
     for s in langs:
         y = _draw_paragraph(
-            c, x, y, w, f"• {s}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl
+            c, x, y, w, f"• {s}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl, st["fonts"]
         )
     return y - st["sp_after_list"]
 
@@ -374,7 +344,7 @@ def _block_projects(
     projects = _projects_to_rows(profile.get("projects"))
     if not projects:
         return y
-    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"])
+    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"], st["fonts"])
     (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, "Projects")
     y -= st["sizes"]["lead_h3"]
     for (title, desc, url) in projects:
@@ -384,7 +354,7 @@ def _block_projects(
         if url:
             main += f" ({url})"
         y = _draw_paragraph(
-            c, x, y, w, f"• {main}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl
+            c, x, y, w, f"• {main}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl, st["fonts"]
         )
     return y - st["sp_after_list"]
 
@@ -401,12 +371,12 @@ def _block_education(
     edu = _text_to_lines(profile.get("education"))
     if not edu:
         return y
-    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"])
+    _safe_set_font(c, st["font_bold"], st["sizes"]["h3"], st["fonts"])
     (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, "Education")
     y -= st["sizes"]["lead_h3"]
     for s in edu:
         y = _draw_paragraph(
-            c, x, y, w, f"• {s}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl
+            c, x, y, w, f"• {s}", st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl, st["fonts"]
         )
     return y - st["sp_after_list"]
 
@@ -422,11 +392,11 @@ def _block_text_section(
     title: Optional[str] = None,
 ) -> float:
     if title:
-        _safe_set_font(c, st["font_bold"], st["sizes"]["h3"])
+        _safe_set_font(c, st["font_bold"], st["sizes"]["h3"], st["fonts"])
         (c.drawRightString if rtl else c.drawString)(x + (w if rtl else 0), y, title)
         y -= st["sizes"]["lead_h3"]
     y = _draw_paragraph(
-        c, x, y, w, text, st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl
+        c, x, y, w, text, st["sizes"]["lead_body"], st["font"], st["sizes"]["body"], rtl, st["fonts"]
     )
     return y - st["sp_after_par"]
 
@@ -442,8 +412,25 @@ def _block_left_panel_bg(
     bg: str = "#F8FAFC",
 ) -> None:
     pad = pad_mm * mm
-    c.setFillColor(HexColor(bg))
-    c.rect(x - pad, 0, w + pad * 2, page_h, stroke=0, fill=1)
+
+    def _draw(c: canvas.Canvas) -> None:
+        c.setFillColor(HexColor(bg))
+        c.rect(x - pad, 0, w + pad * 2, page_h, stroke=0, fill=1)
+
+    draw_cached_form(c, "left_panel_bg", (x - pad, w + pad * 2, page_h, bg), _draw)
+    c.setFillColor(st["text"])
+
+
+def _draw_page_bg(c: canvas.Canvas, st: Dict[str, Any], pw: float, ph: float) -> None:
+    """Paint the page background once per document, then reference it per page."""
+    if st["bg"] == black:
+        return
+
+    def _draw(c: canvas.Canvas) -> None:
+        c.setFillColor(st["bg"])
+        c.rect(0, 0, pw, ph, stroke=0, fill=1)
+
+    draw_cached_form(c, "page_bg", (pw, ph, tuple(st["bg"].rgba())), _draw)
     c.setFillColor(st["text"])
 
 
@@ -467,13 +454,52 @@ except Exception:
     def ensure_profile_schema(x: Dict[str, Any]) -> Dict[str, Any]:
         return x
 
-def build_resume_pdf(*, data: Dict[str, Any]) -> bytes:
+def build_resume_pdf(*, data: Dict[str, Any], timings: Optional[Timings] = None) -> bytes:
+    """
+    Render a resume PDF.
+
+    Args:
+        data (dict): profile, theme_name/theme_inline, layout_inline, ui_lang, rtl_mode
+            and optionally ``quality`` (``"print"`` or ``"draft"``, see ``draft.py``).
+        timings (Optional[Timings]): Receives the ``theme``, ``render`` and
+            ``serialize`` stage durations, and ``pages``.
+
+    Returns:
+        bytes: The PDF.
+    """
     profile = ensure_profile_schema(data.get("profile") or {})
     layout = data.get("layout_inline") or {}
     rtl = bool(data.get("rtl_mode"))
-    theme_inline = data.get("theme_inline") or _load_theme_from_disk(
-        data.get("theme_name")
-    )
+    with _stage(timings, "theme"):
+        theme_inline = data.get("theme_inline") or _load_theme_from_disk(
+            data.get("theme_name")
+        )
+    c = new_canvas(A4, data.get("quality"))
+    with _stage(timings, "render"):
+        try:
+            _render_canvas(c, profile, layout, rtl, theme_inline)
+        except PageLimitReached:
+            pass  # draft: the first pages are enough
+    if timings is not None:
+        timings.pages = c.getPageNumber() - 1
+    with _stage(timings, "serialize"):
+        return c.getpdfdata()
+
+
+def build_resume_pdf_timed(*, data: Dict[str, Any]) -> Tuple[bytes, Dict[str, float], int]:
+    """``build_resume_pdf`` for render workers: returns ``(pdf, stage seconds, pages)``."""
+    timings = Timings()
+    pdf = build_resume_pdf(data=data, timings=timings)
+    return pdf, timings.stages, timings.pages
+
+
+def _render_canvas(
+    c: canvas.Canvas,
+    profile: Dict[str, Any],
+    layout: Dict[str, Any],
+    rtl: bool,
+    theme_inline: Dict[str, Any],
+) -> None:
 
     style: Dict[str, Any] = {
         "colors": {"primary": "#0F172A", "text": "#000", "accent": "#2563EB", "bg": "#FFF"},
@@ -491,18 +517,21 @@ def build_resume_pdf(*, data: Dict[str, Any]) -> bytes:
     _deep_update(style, theme_inline)
     _deep_update(style, layout.get("overrides") or {})
 
-    base = _resolve_font_name(style["fonts"].get("base", "Helvetica"))
-    bold = _resolve_font_name(style["fonts"].get("bold", "Helvetica-Bold"))
-    head = _resolve_font_name(style["fonts"].get("heading", bold or base))
+    fonts = font_table(
+        style["fonts"].get("base", "Helvetica"),
+        style["fonts"].get("bold", "Helvetica-Bold"),
+        style["fonts"].get("heading"),
+    )
 
     st: Dict[str, Any] = {
         "primary": HexColor(style["colors"]["primary"]),
         "text": HexColor(style["colors"]["text"]),
         "accent": HexColor(style["colors"]["accent"]),
         "bg": HexColor(style["colors"]["bg"]),
-        "font": base,
-        "font_bold": bold,
-        "font_head": head,
+        "fonts": fonts,
+        "font": fonts.base,
+        "font_bold": fonts.bold,
+        "font_head": fonts.heading,
         "sizes": style["sizes"],
         "sp_after_header": style.get("sp_after_header", 6),
         "sp_after_par": style.get("sp_after_par", 6),
@@ -519,12 +548,7 @@ def build_resume_pdf(*, data: Dict[str, Any]) -> bytes:
         margins["bottom"] * mm,
     )
 
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=A4)
-    if st["bg"] != black:
-        c.setFillColor(st["bg"])
-        c.rect(0, 0, pw, ph, stroke=0, fill=1)
-        c.setFillColor(st["text"])
+    _draw_page_bg(c, st, pw, ph)
 
     usable_w = pw - left - right
     cols_def = layout.get("columns") or [{"id": "main", "width": "100%"}]
@@ -544,10 +568,7 @@ def build_resume_pdf(*, data: Dict[str, Any]) -> bytes:
     def ensure_space(cid: str, h: float = 60) -> None:
         if y_pos[cid] - h < bottom:
             c.showPage()
-            if st["bg"] != black:
-                c.setFillColor(st["bg"])
-                c.rect(0, 0, pw, ph, stroke=0, fill=1)
-                c.setFillColor(st["text"])
+            _draw_page_bg(c, st, pw, ph)
             y_pos.update({k: y_top for k in cols})
 
     for sec in flow:
@@ -594,5 +615,3 @@ def build_resume_pdf(*, data: Dict[str, Any]) -> bytes:
         y_pos[cid] = y
 
     c.showPage()
-    c.save()
-    return buf.getvalue()
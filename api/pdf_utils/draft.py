@@ -0,0 +1,120 @@
+# api/pdf_utils/draft.py
+"""
+Draft (preview) rendering.
+
+``quality="draft"`` trades fidelity for latency when a user only needs a
+quick look while editing:
+
+- images (headshot, icons) become flat placeholders: nothing is decoded or embedded
+- page streams are not compressed
+- link annotations are dropped
+- rendering stops after ``DRAFT_MAX_PAGES`` pages
+
+``new_canvas`` returns a plain ReportLab canvas for ``"print"`` and a
+``DraftCanvas`` for ``"draft"``; builders wrap their drawing in
+``try: ... except PageLimitReached`` and call ``getpdfdata()`` as usual.
+
+Configuration (environment):
+- DRAFT_MAX_PAGES : pages rendered in draft mode (default: 2)
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Optional, Tuple
+
+from reportlab.lib.colors import Color
+from reportlab.pdfgen import canvas
+
+DRAFT = "draft"
+PRINT = "print"
+QUALITIES = (PRINT, DRAFT)
+
+_PLACEHOLDER = Color(0.85, 0.87, 0.9)
+
+
+class PageLimitReached(Exception):
+    """Raised by ``DraftCanvas.showPage`` once the page budget is used up."""
+
+
+def draft_max_pages() -> int:
+    try:
+        return max(1, int(os.getenv("DRAFT_MAX_PAGES", "").strip() or 2))
+    except ValueError:
+        return 2
+
+
+class DraftCanvas(canvas.Canvas):
+    """Canvas for previews: placeholder images, no links, bounded page count."""
+
+    draft = True
+
+    def __init__(self, *args: Any, max_pages: Optional[int] = None, **kwargs: Any):
+        kwargs.setdefault("pageCompression", 0)
+        super().__init__(*args, **kwargs)
+        self.max_pages = max_pages or draft_max_pages()
+        self._limit_reached = False
+
+    def drawImage(self, image: Any, x: float, y: float, width: Optional[float] = None,
+                  height: Optional[float] = None, *args: Any, **kwargs: Any) -> Tuple[float, float]:
+        w, h = width or 0, height or 0
+        if w and h:
+            self.saveState()
+            self.setFillColor(_PLACEHOLDER)
+            self.rect(x, y, w, h, stroke=0, fill=1)
+            self.restoreState()
+        return (w, h)
+
+    drawInlineImage = drawImage
+
+    def linkURL(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    def linkRect(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    def linkAbsolute(self, *args: Any, **kwargs: Any) -> None:
+        return None
+
+    def showPage(self) -> None:
+        if self._limit_reached:
+            raise PageLimitReached()
+        super().showPage()
+        if self.getPageNumber() > self.max_pages:
+            self._limit_reached = True
+            raise PageLimitReached()
+
+    def getpdfdata(self) -> bytes:
+        if self._limit_reached:
+            self._code = []  # discard anything drawn past the last page
+            return self._doc.GetPDFData(self)
+        return super().getpdfdata()
+
+
+def is_draft(c: Any) -> bool:
+    """``True`` when drawing on a draft canvas (also through a RecordingCanvas)."""
+    return bool(getattr(c, "draft", False))
+
+
+def new_canvas(pagesize: Tuple[float, float], quality: Optional[str] = None) -> canvas.Canvas:
+    """
+    Return an in-memory canvas for ``quality`` (``"print"`` or ``"draft"``).
+
+    Returns:
+        canvas.Canvas: ``DraftCanvas`` for drafts; a plain canvas otherwise.
+    """
+    if quality == DRAFT:
+        return DraftCanvas(None, pagesize=pagesize)
+    # No file sink: getpdfdata() hands back the one bytes object ReportLab builds.
+    return canvas.Canvas(None, pagesize=pagesize)
+
+
+__all__ = [
+    "DRAFT",
+    "PRINT",
+    "QUALITIES",
+    "DraftCanvas",
+    "PageLimitReached",
+    "is_draft",
+    "new_canvas",
+]
@@ -6,7 +6,10 @@ from reportlab.pdfgen.canvas import Canvas
 
 from .blocks.base import Frame, RenderContext
 from .blocks.registry import get as get_block
-from .block_aliases import canonicalize
+from .draft import PageLimitReached
+from .layout_plan import CompiledLayout, compile_layout
+from .recording import RecordingCanvas
+from .theme_loader import Theme, default_theme
 
 @dataclass
 class Column:
@@ -29,7 +32,8 @@ class LayoutEngine:
     """
     Modern rendering engine based on JSON layout (flow/columns/overrides).
     - Renders one block at a time within a specified column.
-    - Automatically creates a new page when space runs out.
+    - Measures each block before drawing and starts a new page when it
+      would not fit (blocks are drawn exactly once).
     - Applies overrides for each block.
     """
 
@@ -41,6 +45,7 @@ class LayoutEngine:
         theme: Dict[str, Any],
         ui_lang: str,
         rtl_mode: bool,
+        style: Optional[Theme] = None,
     ):
         self.c = canvas
         self.page = page
@@ -50,16 +55,10 @@ class LayoutEngine:
         top_y = self.page.height - self.page.margins.get("top", 22 * mm)
         self.cursor = FlowCursor(y_by_col={cid: top_y for cid in self.columns})
         self.theme = theme or {}
+        self.style = style or default_theme()
         self.ui_lang = ui_lang
         self.rtl_mode = rtl_mode
 
-    def _split_id(self, raw_id: str) -> Tuple[str, Optional[str]]:
-        raw_id = canonicalize(raw_id)
-        if ":" in raw_id:
-            base, suffix = raw_id.split(":", 1)
-            return base, suffix
-        return raw_id, None
-
     def _block_data_for(
         self,
         base_id: str,
@@ -83,6 +82,7 @@ class LayoutEngine:
             "page_top_y": self.page.height - self.page.margins.get("top", 22 * mm),
             "page_h": self.page.height,
             "theme": self.theme,
+            "style": self.style,
             "columns": {cid: (col.x, col.w) for cid, col in self.columns.items()},
             "page_conf": {
                 "margin_mm": {
@@ -101,6 +101,36 @@ class LayoutEngine:
     def _bottom_limit(self) -> float:
         return self.page.margins.get("bottom", 18 * mm)
 
+    def _top_y(self) -> float:
+        return self.page.height - self.page.margins.get("top", 22 * mm)
+
+    def _place_block(self, block: Any, frame: Frame, col: Column, data: Any, ctx: Dict[str, Any]) -> float:
+        """
+        Decide the page break before drawing, then draw the block once.
+
+        Blocks exposing ``measure(frame, data, ctx)`` report their height
+        directly; others are rendered onto a ``RecordingCanvas`` and the
+        recorded calls are replayed if the block fits where it is.
+        """
+        at_top = frame.y >= self._top_y()
+        measure = getattr(block, "measure", None)
+
+        if callable(measure):
+            height = float(measure(frame, data, ctx))
+            if frame.y - height < self._bottom_limit() and not at_top:
+                self._new_page()
+                frame = Frame(x=col.x, y=self.cursor.y_by_col[col.id], w=col.w)
+            return block.render(self.c, frame, data, ctx)
+
+        rec = RecordingCanvas(self.c)
+        new_y = block.render(rec, frame, data, ctx)
+        if new_y < self._bottom_limit() and not at_top:
+            self._new_page()
+            frame = Frame(x=col.x, y=self.cursor.y_by_col[col.id], w=col.w)
+            return block.render(self.c, frame, data, ctx)
+        rec.replay()
+        return new_y
+
     def render_flow(
         self,
         flow: List[Dict[str, Any]],
@@ -114,47 +144,42 @@ class LayoutEngine:
             {"column": "left", "blocks": [ ... ]},
             ...
         ]
+        The flow is compiled once (see ``layout_plan.compile_layout``) and
+        cached by content, so repeated renders only bind data.
+        """
+        plan = compile_layout({"flow": flow or [], "overrides": overrides or {}})
+        self.render_plan(plan, ready)
+
+    def render_plan(self, plan: CompiledLayout, ready: Dict[str, Any]):
+        """
+        Renders a compiled layout: block ids, bound blocks and merged
+        overrides are already resolved, only ``ready`` data is looked up.
         """
-        overrides = overrides or {}
         ctx_base = self._ctx()
+        first_col = next(iter(self.columns.keys()))
 
-        for group in (flow or []):
-            col_id = group.get("column")
-            if col_id not in self.columns:
-                col_id = next(iter(self.columns.keys()))
+        for pb in plan.blocks:
+            col_id = pb.column if pb.column in self.columns else first_col
             col = self.columns[col_id]
+            try:
+                block = pb.block if pb.block is not None else get_block(pb.base_id)
 
-            for raw in (group.get("blocks") or []):
-                blk = {"block_id": raw} if isinstance(raw, str) else dict(raw or {})
-
-                raw_id = blk.get("block_id")
-                if not raw_id:
-                    continue
-
-                base_id, suffix = self._split_id(raw_id)
-                block = get_block(base_id)
-
-                ov = (overrides.get(base_id) or {}) | (overrides.get(raw_id) or {})
-                conf_data = ((blk.get("data") or {}) | (ov.get("data") or {})) or None
-                frame_dict = (blk.get("frame") or {}) | (ov.get("frame") or {})
-
+                frame_dict = pb.conf_frame
                 x = float(frame_dict.get("x", col.x))
                 w = float(frame_dict.get("w", col.w))
                 y = float(frame_dict.get("y", self.cursor.y_by_col[col_id]))
                 frame = Frame(x=x, y=y, w=w)
 
-                block_data = self._block_data_for(base_id, suffix, ready, conf_data)
+                block_data = self._block_data_for(pb.base_id, pb.suffix, ready, pb.conf_data)
 
                 ctx = dict(ctx_base)
-                if suffix:
-                    ctx["section"] = suffix
-
-                new_y = block.render(self.c, frame, block_data, ctx)
-
-                if new_y < self._bottom_limit():
-                    self._new_page()
-                    frame = Frame(x=col.x, y=self.cursor.y_by_col[col_id], w=col.w)
-                    new_y = block.render(self.c, frame, block_data, ctx)
-
-                self.cursor.y_by_col[col_id] = new_y
-
+                if pb.suffix:
+                    ctx["section"] = pb.suffix
+
+                new_y = self._place_block(block, frame, col, block_data, ctx)
+            except PageLimitReached:
+                raise
+            except Exception as e:
+                print(f"[WARN] Block '{pb.raw_id}' failed: {e}")
+                continue
+            self.cursor.y_by_col[col_id] = new_y
@@ -0,0 +1,166 @@
+# api/pdf_utils/font_table.py
+"""
+Resolved font table, computed once per theme.
+
+Drawing code used to ask ReportLab for the registered font names (and build
+a set from them) for every line, and relied on ``setFont`` raising to find a
+fallback. ``font_table`` resolves a theme's base/bold/heading fonts and the
+script fallbacks (Arabic, Latin, CJK) once; afterwards picking a font is an
+attribute or dictionary lookup.
+
+Fallback chains (first available wins, then the theme's base font, then
+Helvetica):
+- arabic : NotoNaskhArabic, Amiri, DejaVuSans
+- latin  : DejaVuSans
+- cjk    : STSong-Light, HeiseiMin-W3, HYSMyeongJo-Medium
+
+Mixed-script text is split into runs with ``FontTable.runs``: each character
+goes to the first font of the chain (line font, latin, arabic, base, cjk)
+whose cmap covers it, via the coverage index in ``fonts.py``. The choice is
+memoized per (line font, character), so splitting is O(1) per character.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .fonts import covers, has_font
+from .lru import LRUCache
+
+ARABIC_CHAIN = ("NotoNaskhArabic", "Amiri", "DejaVuSans")
+LATIN_CHAIN = ("DejaVuSans",)
+CJK_CHAIN = ("STSong-Light", "HeiseiMin-W3", "HYSMyeongJo-Medium")
+LAST_RESORT = "Helvetica"
+
+
+def _first_available(chain: Sequence[str], fallback: str) -> str:
+    for name in chain:
+        if has_font(name):
+            return name
+    return fallback
+
+
+def _resolve_name(name: Optional[str]) -> str:
+    """Requested name if usable, else the builder's historical fallbacks."""
+    if has_font(name):
+        return name
+    if name and has_font(name + "-Bold"):
+        return name
+    return _first_available(("NotoNaskhArabic", "DejaVuSans"), LAST_RESORT)
+
+
+@dataclass(frozen=True)
+class FontTable:
+    """
+    Usable font names for one theme.
+
+    Attributes:
+        base (str): Body font.
+        bold (str): Bold font.
+        heading (str): Heading font.
+        arabic (str): Font for lines containing Arabic.
+        latin (str): Font for other lines.
+        cjk (str): Font for CJK text.
+    """
+    base: str
+    bold: str
+    heading: str
+    arabic: str
+    latin: str
+    cjk: str
+    _resolved: Dict[str, str] = field(default_factory=dict, repr=False, compare=False)
+    _char_fonts: Dict[Tuple[str, str], str] = field(default_factory=dict, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        for name in (self.base, self.bold, self.heading, self.arabic, self.latin, self.cjk):
+            self._resolved[name] = name
+
+    def resolve(self, name: str) -> str:
+        """Usable font for ``name`` (known names are a single dict lookup)."""
+        found = self._resolved.get(name)
+        if found is None:
+            found = self._resolved[name] = _resolve_name(name)
+        return found
+
+    def for_line(self, is_arabic: bool) -> str:
+        return self.arabic if is_arabic else self.latin
+
+    def font_for_char(self, ch: str, primary: Optional[str] = None) -> str:
+        """First font of the fallback chain (starting at ``primary``) covering ``ch``."""
+        primary = primary or self.base
+        key = (primary, ch)
+        found = self._char_fonts.get(key)
+        if found is None:
+            found = primary
+            for name in (primary, self.latin, self.arabic, self.base, self.cjk):
+                if covers(name, ch):
+                    found = name
+                    break
+            self._char_fonts[key] = found
+        return found
+
+    def runs(self, text: str, primary: Optional[str] = None) -> List[Tuple[str, str]]:
+        """
+        Split ``text`` into ``(font, run)`` pieces, each fully covered by its font.
+
+        Whitespace stays in the current run when that font has a glyph for it.
+
+        Returns:
+            List[Tuple[str, str]]: Runs in visual order (empty for empty text).
+        """
+        out: List[Tuple[str, str]] = []
+        cur_font: Optional[str] = None
+        start = 0
+        for i, ch in enumerate(text):
+            if cur_font is not None and ch.isspace() and covers(cur_font, ch):
+                continue
+            font = self.font_for_char(ch, primary)
+            if font != cur_font:
+                if cur_font is not None:
+                    out.append((cur_font, text[start:i]))
+                cur_font, start = font, i
+        if cur_font is not None:
+            out.append((cur_font, text[start:]))
+        return out
+
+
+_TABLES = LRUCache(64)
+
+
+def font_table(base: str = "Helvetica", bold: str = "Helvetica-Bold", heading: Optional[str] = None) -> FontTable:
+    """
+    Return the (cached) font table for a theme's requested fonts.
+
+    Args:
+        base (str): Requested body font.
+        bold (str): Requested bold font.
+        heading (Optional[str]): Requested heading font (defaults to bold).
+
+    Returns:
+        FontTable: Shared table; all names in it are registered or standard.
+    """
+    key = (base, bold, heading)
+    table = _TABLES.get(key)
+    if table is None:
+        r_base = _resolve_name(base)
+        r_bold = _resolve_name(bold)
+        r_head = _resolve_name(heading or bold or base)
+        fallback = r_base if has_font(r_base) else LAST_RESORT
+        table = FontTable(
+            base=r_base,
+            bold=r_bold,
+            heading=r_head,
+            arabic=_first_available(ARABIC_CHAIN, fallback),
+            latin=_first_available(LATIN_CHAIN, fallback),
+            cjk=_first_available(CJK_CHAIN, fallback),
+        )
+        _TABLES.put(key, table)
+    return table
+
+
+def clear_font_tables() -> None:
+    _TABLES.clear()
+
+
+__all__ = ["FontTable", "font_table", "clear_font_tables"]
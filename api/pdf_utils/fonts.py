@@ -1,20 +1,68 @@
 ﻿# api/pdf_utils/fonts.py
 """
 Dynamic Font Loader for ReportLab
-Automatically scans /assets for .ttf fonts,
-normalizes their names, and registers them dynamically.
+Scans /assets for .ttf fonts once, normalizes their names, and registers
+each family lazily the first time it is used.
+
+- Registration is idempotent: ``register_all_fonts()`` and ``ensure_font()``
+  may be called any number of times; a family is only loaded once.
+- Lazy: nothing is loaded at import. ``has_font`` / ``font_table`` load the
+  owning family on first use; after ``install_lazy_loader()`` (called by the
+  app at startup and by render workers) so do ``canvas.setFont`` and
+  ``stringWidth``. Importing this module does not patch ReportLab.
+- Parsed faces (glyph widths, metrics, subsetting tables) are persisted to an
+  on-disk cache keyed by the font file's SHA-256, so worker cold starts
+  unpickle them instead of parsing TTF files. The cache is only used in a
+  directory owned by the current user and not writable by others; each file
+  starts with the SHA-256 of its pickle, checked before unpickling.
+- A glyph-coverage index (the set of code points in each font's cmap) is
+  built at registration and persisted with the metrics; ``covers(font, ch)``
+  is a set lookup, used to pick per-run fonts for mixed-script text.
+
+Configuration (environment):
+- FONT_CACHE_DIR : cache location (default: outputs/font-cache; ``off`` disables)
 """
 
+import hashlib
+import logging
 import os, re
+import pickle
+import threading
+from pathlib import Path
+from weakref import WeakKeyDictionary
+
+from reportlab import Version as _RL_VERSION
+from reportlab import rl_config
 from reportlab.pdfbase import pdfmetrics
-from reportlab.pdfbase.ttfonts import TTFont
+from reportlab.pdfbase.ttfonts import TTEncoding, TTFont, TTFontFace
 from reportlab.pdfbase.cidfonts import UnicodeCIDFont
 from reportlab.lib.fonts import addMapping
 
+log = logging.getLogger("resume.fonts")
+
 BASE_DIR = os.path.dirname(__file__)
 ASSETS_DIR = os.path.join(BASE_DIR, "assets")
+APP_ROOT = Path(BASE_DIR).resolve().parents[1]
+DEFAULT_CACHE_DIR = APP_ROOT / "outputs" / "font-cache"
 REGISTERED = set()
 
+CID_FONTS = ("HeiseiMin-W3", "STSong-Light", "HYSMyeongJo-Medium")
+
+# Bump when the pickled layout changes
+_CACHE_FORMAT = 2
+
+_LOCK = threading.RLock()
+_FAMILIES = None          # {family: {'regular': path, 'bold': path}}, scanned once
+_NAME_TO_FAMILY = {}      # {"DejaVuSans-Bold": "DejaVuSans", ...}
+_LOADED_FAMILIES = set()
+_CID_DONE = False
+# Bumped whenever the set of available fonts may change (not on lazy loads)
+_GENERATION = 0
+# font name -> frozenset of covered code points (None: unknown, e.g. CID fonts)
+_COVERAGE = {}
+# Standard Type1 fonts are drawn with WinAnsiEncoding
+_WINANSI = frozenset(ord(ch) for ch in bytes(range(32, 256)).decode("cp1252", errors="ignore"))
+
 # Regex to normalize names like NotoNaskhArabic-Regular â†’ NotoNaskhArabic
 STYLE_SUFFIX = re.compile(
     r"[-_](Regular|Bold|Medium|SemiBold|Semi-Bold|ExtraBold|Light|Black|Book|Roman)$",
@@ -28,7 +76,7 @@ def _normalize_family(name: str) -> str:
 def _scan_font_files():
     """Scan assets/ for .ttf and return {family: {'regular': path, 'bold': path}}"""
     families = {}
-    for file in os.listdir(ASSETS_DIR):
+    for file in sorted(os.listdir(ASSETS_DIR)):
         if not file.lower().endswith(".ttf"):
             continue
         name = os.path.splitext(file)[0]
@@ -42,55 +90,284 @@ def _scan_font_files():
             fam["regular"] = path
     return families
 
-def _register_font_family(name: str, paths: dict):
-    """Register one family (regular & bold)"""
+def _font_families():
+    """Return the scanned families (the directory is scanned once per process)."""
+    global _FAMILIES
+    with _LOCK:
+        if _FAMILIES is None:
+            if not os.path.exists(ASSETS_DIR):
+                print(f"Font folder not found: {ASSETS_DIR}")
+                _FAMILIES = {}
+            else:
+                _FAMILIES = _scan_font_files()
+            _NAME_TO_FAMILY.clear()
+            for family, paths in _FAMILIES.items():
+                if paths.get("regular"):
+                    _NAME_TO_FAMILY[family] = family
+                if paths.get("bold"):
+                    _NAME_TO_FAMILY[family + "-Bold"] = family
+        return _FAMILIES
+
+def refresh_fonts():
+    """Forget the directory scan so newly added font files are picked up."""
+    global _FAMILIES, _GENERATION
+    with _LOCK:
+        _FAMILIES = None
+        _GENERATION += 1
+
+def font_generation() -> int:
+    """
+    Counter of changes to the set of available fonts.
+
+    Lazily loading a family does not change it: ``has_font`` answers the same
+    before and after. Caches of font resolutions (compiled themes) key on it.
+    """
+    return _GENERATION
+
+# ---------------------------------------------------------------------
+# On-disk cache of parsed faces
+# ---------------------------------------------------------------------
+def _cache_dir():
+    value = (os.getenv("FONT_CACHE_DIR") or "").strip()
+    if value.lower() in ("off", "0", "none"):
+        return None
+    return Path(value) if value else DEFAULT_CACHE_DIR
+
+def _is_private(st) -> bool:
+    """Owned by this user and not writable by group or others (POSIX only)."""
+    if not hasattr(os, "getuid"):
+        return True
+    return st.st_uid == os.getuid() and not st.st_mode & 0o022
+
+def _private_cache_dir(cache_dir: Path):
+    """Create ``cache_dir`` as 0700; ``None`` if it cannot be trusted."""
     try:
-        if paths.get("regular"):
-            pdfmetrics.registerFont(TTFont(name, paths["regular"]))
-            REGISTERED.add(name)
-        if paths.get("bold"):
-            pdfmetrics.registerFont(TTFont(name + "-Bold", paths["bold"]))
-            REGISTERED.add(name + "-Bold")
-
-        # Mapping between normal and bold
-        addMapping(name, 0, 0, name)
-        if name + "-Bold" in REGISTERED:
-            addMapping(name, 0, 1, name + "-Bold")
-
-        print(f"✅ Registered: {name}")
+        cache_dir.mkdir(mode=0o700, parents=True, exist_ok=True)
+        st = cache_dir.stat()
+        if hasattr(os, "getuid") and st.st_uid == os.getuid() and st.st_mode & 0o077:
+            os.chmod(cache_dir, 0o700)
+            st = cache_dir.stat()
+    except OSError as e:
+        log.warning("Font cache disabled, %s is unusable: %s", cache_dir, e)
+        return None
+    if not _is_private(st):
+        log.warning("Font cache disabled, %s is writable by other users", cache_dir)
+        return None
+    return cache_dir
+
+def _read_cache(cache_file: Path):
+    """Unpickle a cache file if it is ours and its digest matches, else ``None``."""
+    with open(cache_file, "rb") as fh:
+        if not _is_private(os.fstat(fh.fileno())):
+            log.warning("Ignoring font cache %s: not private to this user", cache_file)
+            return None
+        blob = fh.read()
+    digest, payload = blob[:32], blob[32:]
+    if hashlib.sha256(payload).digest() != digest:
+        log.warning("Ignoring font cache %s: checksum mismatch", cache_file)
+        return None
+    return pickle.loads(payload)
+
+def _write_cache(cache_file: Path, state) -> None:
+    payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+    tmp = cache_file.with_suffix(f".{os.getpid()}.tmp")
+    fd = os.open(tmp, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as fh:
+        fh.write(hashlib.sha256(payload).digest())
+        fh.write(payload)
+    os.replace(tmp, cache_file)
+
+def _pdf_scale(units_per_em):
+    # TTFontFile builds this as a lambda, which is why faces are pickled without it.
+    if units_per_em == 1000:
+        return lambda x: x
+    mult = 1000 / units_per_em
+    return lambda x: x * mult
+
+def _freeze(font):
+    face = {k: v for k, v in vars(font.face).items() if k != "_pdfScale"}
+    return {
+        "face": face,
+        "asciiReadable": font._asciiReadable,
+        "shapable": font._shapable,
+        "coverage": font._coverage,
+    }
+
+def _thaw(name, state):
+    face = TTFontFace.__new__(TTFontFace)
+    face.__dict__.update(state["face"])
+    face._pdfScale = _pdf_scale(face.unitsPerEm)
+
+    font = TTFont.__new__(TTFont)
+    font.fontName = name
+    font.face = face
+    font.encoding = TTEncoding()
+    font.state = WeakKeyDictionary()
+    font._asciiReadable = state["asciiReadable"]
+    font._shapable = state["shapable"]
+    font._coverage = state["coverage"]
+    return font
+
+def _parse_ttfont(name: str, path: str) -> TTFont:
+    font = TTFont(name, path)
+    font._coverage = frozenset(font.face.charToGlyph)
+    return font
+
+def _load_ttfont(name: str, path: str) -> TTFont:
+    """Return ``TTFont(name, path)``, from the disk cache when possible."""
+    cache_dir = _cache_dir()
+    if cache_dir is not None:
+        cache_dir = _private_cache_dir(cache_dir)
+    if cache_dir is None:
+        return _parse_ttfont(name, path)
+
+    with open(path, "rb") as fh:
+        digest = hashlib.sha256(fh.read())
+    digest.update(f"|{name}|{_RL_VERSION}|{_CACHE_FORMAT}|{rl_config.ttfAsciiReadable}".encode("utf-8"))
+    cache_file = cache_dir / f"{name}-{digest.hexdigest()[:32]}.pickle"
+
+    try:
+        state = _read_cache(cache_file)
+        if state is not None:
+            return _thaw(name, state)
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        log.warning("Ignoring unreadable font cache %s: %s", cache_file, e)
+
+    font = _parse_ttfont(name, path)
+    try:
+        _write_cache(cache_file, _freeze(font))
     except Exception as e:
-        print(f"Failed to register {name}: {e}")
+        log.warning("Could not write font cache %s: %s", cache_file, e)
+    return font
+
+# ---------------------------------------------------------------------
+# Registration
+# ---------------------------------------------------------------------
+def _register_font_family(name: str, paths: dict):
+    """Register one family (regular & bold) once."""
+    with _LOCK:
+        if name in _LOADED_FAMILIES:
+            return
+        _LOADED_FAMILIES.add(name)
+        try:
+            for font_name, path in ((name, paths.get("regular")), (name + "-Bold", paths.get("bold"))):
+                if not path:
+                    continue
+                font = _load_ttfont(font_name, path)
+                pdfmetrics.registerFont(font)
+                _COVERAGE[font_name] = font._coverage
+                REGISTERED.add(font_name)
+
+            # Mapping between normal and bold
+            addMapping(name, 0, 0, name)
+            if name + "-Bold" in REGISTERED:
+                addMapping(name, 0, 1, name + "-Bold")
+
+            log.debug("Registered font family: %s", name)
+        except Exception as e:
+            print(f"Failed to register {name}: {e}")
+
+def _register_cid_fonts():
+    """Unicode fallbacks (CID fonts ship with ReportLab)."""
+    global _CID_DONE
+    with _LOCK:
+        if _CID_DONE:
+            return
+        _CID_DONE = True
+        for cid_font in CID_FONTS:
+            try:
+                pdfmetrics.registerFont(UnicodeCIDFont(cid_font))
+            except Exception:
+                pass
 
 def register_all_fonts():
-    """Register all fonts dynamically"""
-    if not os.path.exists(ASSETS_DIR):
-        print(f"Font folder not found: {ASSETS_DIR}")
-        return
-    for family, paths in _scan_font_files().items():
+    """Register every font family now (idempotent; cheap after the first call)."""
+    for family, paths in _font_families().items():
         _register_font_family(family, paths)
+    _register_cid_fonts()
 
-    # Unicode fallbacks
-    for cid_font in ["HeiseiMin-W3", "STSong-Light", "HYSMyeongJo-Medium"]:
-        try:
-            pdfmetrics.registerFont(UnicodeCIDFont(cid_font))
-        except Exception:
-            pass
+def ensure_font(font: str) -> bool:
+    """
+    Make sure ``font`` is registered, loading only the family that provides it.
 
-# Run at import
-register_all_fonts()
+    Returns:
+        bool: ``True`` if the font is now registered.
+    """
+    if font in REGISTERED:
+        return True
+    if font in CID_FONTS:
+        _register_cid_fonts()
+        return font in pdfmetrics.getRegisteredFontNames()
+    _font_families()
+    family = _NAME_TO_FAMILY.get(font)
+    if family is None:
+        return False
+    _register_font_family(family, _FAMILIES[family])
+    return font in REGISTERED
 
-def ensure_font(font: str):
-    """Ensure font is registered before use"""
-    if font not in REGISTERED:
-        register_all_fonts()
+def has_font(font: str) -> bool:
+    """``True`` if ``font`` is registered, standard, or loadable from assets/."""
+    if not font:
+        return False
+    if font in pdfmetrics.standardFonts or font in pdfmetrics.getRegisteredFontNames():
+        return True
+    return ensure_font(font)
 
-def rtl(text: str) -> str:
-    """Placeholder for future Arabic shaping."""
-    return text or ""
+def font_coverage(font: str):
+    """
+    Code points ``font`` has glyphs for.
 
-from reportlab.pdfbase import pdfmetrics
+    Returns:
+        Optional[frozenset]: ``None`` if unknown (CID fonts) or not available.
+    """
+    cov = _COVERAGE.get(font)
+    if cov is not None or font in _COVERAGE:
+        return cov
+    if font in pdfmetrics.standardFonts:
+        cov = _WINANSI if font not in ("Symbol", "ZapfDingbats") else frozenset()
+    elif has_font(font):
+        cov = getattr(pdfmetrics.getFont(font), "_coverage", None)
+    _COVERAGE[font] = cov
+    return cov
+
+def covers(font: str, ch: str) -> bool:
+    """``True`` if ``font`` has a glyph for ``ch`` (unknown coverage counts as yes)."""
+    cov = _COVERAGE.get(font)
+    if cov is None:
+        cov = font_coverage(font)
+        if cov is None:
+            return True
+    return ord(ch) in cov
+
+def available_fonts():
+    """All usable font names (registered + loadable), without loading them."""
+    _font_families()
+    names = set(pdfmetrics.getRegisteredFontNames()) | set(pdfmetrics.standardFonts)
+    return sorted(names | set(_NAME_TO_FAMILY) | set(CID_FONTS))
+
+def install_lazy_loader():
+    """
+    Let ReportLab load asset fonts on first use (``setFont``, ``stringWidth``).
 
-print("ًRegistered font names:")
-for f in pdfmetrics.getRegisteredFontNames():
-    print("   -", f)
+    ReportLab resolves unknown names through ``pdfmetrics.findFontAndRegister``;
+    the wrapper tries our asset families first. Called explicitly at startup
+    (app and render workers); idempotent.
+    """
+    with _LOCK:
+        if getattr(pdfmetrics.findFontAndRegister, "_rl_original", None) is not None:
+            return
+        original = pdfmetrics.findFontAndRegister
 
+        def _find_font_and_register(fontName):
+            if isinstance(fontName, str) and ensure_font(fontName):
+                return pdfmetrics.getFont(fontName)
+            return original(fontName)
+
+        _find_font_and_register._rl_original = original
+        pdfmetrics.findFontAndRegister = _find_font_and_register
+
+def rtl(text: str) -> str:
+    """Placeholder for future Arabic shaping."""
+    return text or ""
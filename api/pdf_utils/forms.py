@@ -0,0 +1,91 @@
+# api/pdf_utils/forms.py
+"""
+Reusable form XObjects for decorative, repeated drawings.
+
+Backgrounds, panels and bars are identical on every page and across most
+requests. ``draw_cached_form`` records such a drawing once per process
+(keyed by its resolved data and theme values), embeds it once per document
+as a ReportLab form XObject and references it with ``doForm`` wherever it
+is needed.
+
+Forms use page coordinates (bbox = full page). Page-anchored drawings
+(backgrounds, panels) are recorded where they belong. Drawings that move
+with the layout (bars, curves) are recorded at the origin and placed with
+``at=(x, y)``, so their key holds only size and style, not position.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import Any, Callable, Hashable, Optional, Tuple
+
+from .lru import LRUCache
+from .recording import Op, RecordingCanvas, replay_ops
+
+# (kind, key) -> (form name, recorded ops)
+_FORMS = LRUCache(512)
+
+
+def form_name(kind: str, key: Hashable) -> str:
+    """Return a stable, PDF-safe form name for ``(kind, key)``."""
+    digest = hashlib.sha1(repr((kind, key)).encode("utf-8")).hexdigest()[:16]
+    return f"{kind}_{digest}"
+
+
+def _capture(c: Any, kind: str, key: Hashable, draw: Callable[[Any], None]) -> Tuple[str, Tuple[Op, ...]]:
+    entry = _FORMS.get((kind, key))
+    if entry is None:
+        rec = RecordingCanvas(c)
+        draw(rec)
+        entry = (form_name(kind, key), tuple(rec.ops))
+        _FORMS.put((kind, key), entry)
+    return entry
+
+
+def draw_cached_form(
+    c: Any,
+    kind: str,
+    key: Hashable,
+    draw: Callable[[Any], None],
+    at: Optional[Tuple[float, float]] = None,
+) -> str:
+    """
+    Draw ``draw(canvas)`` through a form XObject shared by the whole document.
+
+    Args:
+        c: Target canvas (a real ``Canvas`` or a ``RecordingCanvas``).
+        kind: Short, PDF-name-safe prefix (e.g. ``"page_bg"``).
+        key: Hashable value covering *everything* the drawing depends on
+            (geometry, colors, text). Equal keys must produce equal drawings.
+        draw: Callable that performs the drawing on the canvas it receives.
+        at: Where to place the form's origin. With ``at``, ``draw`` works
+            in local coordinates and ``key`` leaves out the position.
+
+    Returns:
+        str: The form name used.
+    """
+    name, ops = _capture(c, kind, key, draw)
+    if not c.hasForm(name):
+        c.beginForm(name)
+        replay_ops(ops, c)
+        c.endForm()
+    if at is None:
+        c.doForm(name)
+    else:
+        c.saveState()
+        c.translate(*at)
+        c.doForm(name)
+        c.restoreState()
+    return name
+
+
+def clear_form_cache() -> None:
+    """Forget all recorded forms (tests / theme reloads)."""
+    _FORMS.clear()
+
+
+def form_cache_stats() -> dict:
+    return _FORMS.stats()
+
+
+__all__ = ["draw_cached_form", "form_name", "clear_form_cache", "form_cache_stats"]
@@ -0,0 +1,168 @@
+# api/pdf_utils/headshot.py
+"""
+Headshot normalization for the avatar block.
+
+Uploaded photos are often multi-megapixel phone pictures, while the avatar
+is printed about 42 mm wide. ``normalize_headshot`` downscales a photo to the
+pixel size that diameter needs at ``HEADSHOT_DPI`` and re-encodes it as
+baseline JPEG, which ReportLab embeds as-is (no decode / re-compress per
+render). Photos with real transparency stay PNG so the circle keeps its
+background.
+
+Results are cached by content hash (and target size). An image that is
+already a small enough JPEG is returned untouched, so normalizing twice (API
+process, then render worker) never degrades it.
+
+Configuration (environment):
+- HEADSHOT_DPI     : print resolution of the avatar (default: 300)
+- HEADSHOT_QUALITY : JPEG quality (default: 85)
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import hashlib
+import logging
+import math
+import os
+from io import BytesIO
+from typing import Dict, Optional, Union
+
+from .lru import LRUCache
+
+log = logging.getLogger("resume.headshot")
+
+DEFAULT_MAX_D_MM = 42.0
+MM_PER_INCH = 25.4
+
+_CACHE = LRUCache(256, max_bytes=32 * 1024 * 1024)
+
+
+def _env_number(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "").strip() or default)
+    except ValueError:
+        log.warning("Invalid %s=%r, using %s", name, os.getenv(name), default)
+        return default
+
+
+def target_pixels(max_d_mm: float = DEFAULT_MAX_D_MM, dpi: Optional[int] = None) -> int:
+    """Pixels across the avatar's diameter at ``dpi`` (default: HEADSHOT_DPI)."""
+    dpi = dpi or _env_number("HEADSHOT_DPI", 300)
+    return max(16, math.ceil(float(max_d_mm) / MM_PER_INCH * dpi))
+
+
+def _has_alpha(img) -> bool:
+    if img.mode in ("RGBA", "LA") or (img.mode == "P" and "transparency" in img.info):
+        alpha = img.convert("RGBA").getchannel("A")
+        return alpha.getextrema()[0] < 255
+    return False
+
+
+def _encode(photo: bytes, px: int, quality: int) -> bytes:
+    from PIL import Image, ImageOps
+
+    with Image.open(BytesIO(photo)) as img:
+        orientation = img.getexif().get(0x0112, 1)
+        if (
+            img.format == "JPEG"
+            and img.mode in ("RGB", "L")
+            and max(img.size) <= px
+            and orientation == 1
+        ):
+            return photo  # already normalized
+
+        # JPEG can decode straight at 1/2, 1/4 or 1/8 scale
+        img.draft("RGB", (px, px))
+        img = ImageOps.exif_transpose(img)
+        img.thumbnail((px, px), Image.LANCZOS)
+
+        out = BytesIO()
+        if _has_alpha(img):
+            img.convert("RGBA").save(out, format="PNG", optimize=True)
+        else:
+            img = img.convert("L" if img.mode in ("L", "1", "I", "I;16") else "RGB")
+            img.save(out, format="JPEG", quality=quality, optimize=True)
+        return out.getvalue()
+
+
+def normalize_headshot(
+    photo: bytes,
+    max_d_mm: float = DEFAULT_MAX_D_MM,
+    dpi: Optional[int] = None,
+) -> bytes:
+    """
+    Downscale ``photo`` for an avatar ``max_d_mm`` wide and encode it as JPEG.
+
+    Args:
+        photo (bytes): Encoded image (any format Pillow reads).
+        max_d_mm (float): Largest printed diameter of the avatar.
+        dpi (Optional[int]): Print resolution (default: HEADSHOT_DPI).
+
+    Returns:
+        bytes: Normalized image; ``photo`` itself if it cannot be decoded.
+    """
+    px = target_pixels(max_d_mm, dpi)
+    quality = _env_number("HEADSHOT_QUALITY", 85)
+    key = (hashlib.sha256(photo).digest(), px, quality)
+    found = _CACHE.get(key)
+    if found is not None:
+        return found
+
+    try:
+        result = _encode(photo, px, quality)
+    except Exception as exc:
+        log.warning("Could not normalize headshot: %s", exc)
+        result = photo
+    _CACHE.put(key, result)
+    if result is not photo:
+        # Normalizing the output again is a no-op; remember that too.
+        _CACHE.put((hashlib.sha256(result).digest(), px, quality), result)
+    return result
+
+
+def headshot_from_b64(
+    photo_b64: Union[str, bytes],
+    max_d_mm: float = DEFAULT_MAX_D_MM,
+    dpi: Optional[int] = None,
+) -> Optional[bytes]:
+    """
+    Decode a base64 headshot and normalize it, cached by the encoded text.
+
+    Returns:
+        Optional[bytes]: Normalized image, or ``None`` if ``photo_b64`` is not valid base64.
+    """
+    try:
+        raw = photo_b64.encode("ascii") if isinstance(photo_b64, str) else bytes(photo_b64)
+    except (UnicodeEncodeError, TypeError):
+        return None
+    px = target_pixels(max_d_mm, dpi)
+    key = ("b64", hashlib.sha256(raw).digest(), px, _env_number("HEADSHOT_QUALITY", 85))
+    found = _CACHE.get(key)
+    if found is not None:
+        return found
+    try:
+        photo = base64.b64decode(raw)
+    except (binascii.Error, ValueError):
+        return None
+    result = normalize_headshot(photo, max_d_mm, dpi)
+    _CACHE.put(key, result)
+    return result
+
+
+def headshot_cache_stats() -> Dict[str, int]:
+    return _CACHE.stats()
+
+
+def clear_headshot_cache() -> None:
+    _CACHE.clear()
+
+
+__all__ = [
+    "normalize_headshot",
+    "headshot_from_b64",
+    "target_pixels",
+    "headshot_cache_stats",
+    "clear_headshot_cache",
+]
@@ -8,6 +8,8 @@ from reportlab.lib import colors
 from reportlab.lib.utils import ImageReader
 from reportlab.pdfbase.pdfmetrics import stringWidth
 
+from .lru import LRUCache
+
 # =========================
 # Icon paths and setup
 # =========================
@@ -67,6 +69,59 @@ ICON_PATHS: dict[str, Path] = {}
 ICON_PATHS.update({k: v for k, v in DEFAULT_INFO_ICONS.items() if v and v.is_file()})
 ICON_PATHS.update({k: v for k, v in SECTION_ICON_PATHS.items() if v and v.is_file()})
 
+# =========================
+# Decoded icon cache
+# =========================
+
+# path -> ((mtime_ns, size), ImageReader with pixels (and alpha) already decoded,
+# or False if unusable). A replaced file gets a new version and is decoded again.
+# ReportLab names image XObjects by a digest of those pixels, so a shared reader
+# is embedded once per document and every later drawImage just references it.
+_ICON_IMAGES = LRUCache(128)
+
+def _icon_version(icon: Path) -> Optional[Tuple[int, int]]:
+    try:
+        st = icon.stat()
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+def icon_image(icon: Optional[Path]) -> Optional[ImageReader]:
+    """
+    Return the process-wide decoded image for an icon file.
+
+    The file is decoded again when its mtime or size changes.
+
+    Args:
+        icon (Optional[Path]): Path to the icon file.
+
+    Returns:
+        Optional[ImageReader]: Shared reader, or None if the file is missing or unreadable.
+    """
+    if not icon:
+        return None
+    version = _icon_version(icon)
+    hit = _ICON_IMAGES.get(icon)
+    if hit is not None and hit[0] == version:
+        return hit[1] or None
+    img = False
+    if version is not None and icon.is_file():
+        try:
+            img = ImageReader(str(icon))
+            img.getRGBData()  # decode now; drawImage reuses _data / _dataA
+            if img._dataA is not None:
+                img._dataA.getRGBData()
+        except Exception:
+            img = False
+    _ICON_IMAGES.put(icon, (version, img))
+    return img or None
+
+def clear_icon_cache() -> None:
+    _ICON_IMAGES.clear()
+
+def icon_cache_stats() -> dict:
+    return _ICON_IMAGES.stats()
+
 def _text_width(text: str, font_name: str, font_size: int) -> float:
     """
     Calculate the width of a text string for a given font and size.
@@ -154,9 +209,9 @@ def draw_heading_with_icon(
         float: New y-coordinate after rendering.
     """
     draw_x = x
-    if icon and icon.is_file():
+    img = icon_image(icon)
+    if img is not None:
         try:
-            img = ImageReader(str(icon))
             c.drawImage(img, draw_x, y - icon_h, width=icon_w, height=icon_h, mask="auto")
             draw_x += icon_w + pad_x
         except Exception:
@@ -219,9 +274,9 @@ def draw_icon_line(
         float: New y-coordinate after rendering.
     """
     draw_x = x
-    if icon and icon.is_file():
+    img = icon_image(icon)
+    if img is not None:
         try:
-            img = ImageReader(str(icon))
             c.drawImage(img, draw_x, y - icon_h + 1, width=icon_w, height=icon_h, mask="auto")
             draw_x += icon_w + pad_x
         except Exception:
@@ -288,6 +343,9 @@ def info_line(
 __all__ = [
     "ICONS_DIR",
     "icon_path",
+    "icon_image",
+    "clear_icon_cache",
+    "icon_cache_stats",
     "get_section_icon",
     "draw_heading_with_icon",
     "draw_icon_line",
@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import argparse
-import io
 import json
 import sys
 import tempfile
@@ -71,16 +70,13 @@ def generate_pdf(
 
     data_map = build_ready_from_profile(profile)
 
-    buf = io.BytesIO()
-    canvas = Canvas(buf, pagesize=ps, pageCompression=int(bool(compress)))
+    canvas = Canvas(None, pagesize=ps, pageCompression=int(bool(compress)))
     # If you want metadata, set it here:
     # canvas.setAuthor(profile.get("header", {}).get("name", ""))
     # canvas.setTitle("Resume")
     render_with_layout(canvas, layout, data_map, ui_lang=lang)
     canvas.showPage()
-    canvas.save()
-
-    return buf.getvalue()
+    return canvas.getpdfdata()
 
 
 def _atomic_write_bytes(target: Path, data: bytes) -> None:
@@ -0,0 +1,387 @@
+# api/pdf_utils/layout_plan.py
+"""
+Compiled, cached layout plans.
+
+A layout JSON is static per file (or per inline payload), yet every render
+used to re-read it, canonicalize block ids, split ``name:suffix`` strings,
+bind block instances, merge overrides block by block and recompute column
+geometry. ``compile_layout`` does that once and returns an immutable
+``CompiledLayout``; rendering is then only data binding.
+
+Caches:
+- inline layouts : by SHA-256 of their structure (``flow``/``layout`` ids and
+  frames, ``columns``, ``page``, override frames). Block and override
+  ``data`` (profile overrides, headshots) are bound per request, never cached.
+- layout files   : by path + mtime (``load_layout_file`` / ``read_json_file``)
+"""
+
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+from dataclasses import dataclass, replace
+from pathlib import Path
+from types import MappingProxyType
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+
+from .block_aliases import canonicalize
+from .blocks.registry import get as get_block
+from .lru import LRUCache
+
+# Default page geometry (A4 portrait) used when a layout defines no page
+PAGE_W, PAGE_H = A4
+LEFT_MARGIN = 18 * mm
+RIGHT_MARGIN = 18 * mm
+TOP_MARGIN = 22 * mm
+BOTTOM_MARGIN = 18 * mm
+
+
+@dataclass(frozen=True)
+class PlannedBlock:
+    """
+    One block of a compiled layout, resolved and bound.
+
+    Attributes:
+        raw_id (str): Canonical id as written (e.g. ``"text_section:summary"``).
+        base_id (str): Registry id (``"text_section"``).
+        suffix (Optional[str]): Part after ``:`` (``"summary"``), if any.
+        column (Optional[str]): Flow column id (``None`` for legacy lists).
+        block (Any): Bound block instance, or ``None`` if not registered.
+        data (Optional[Mapping]): The block's own ``data``.
+        frame (Mapping): The block's own ``frame``.
+        conf_data (Optional[Mapping]): ``data`` merged with layout overrides.
+        conf_frame (Mapping): ``frame`` merged with layout overrides.
+    """
+    raw_id: str
+    base_id: str
+    suffix: Optional[str]
+    column: Optional[str]
+    block: Any
+    data: Optional[Mapping[str, Any]]
+    frame: Mapping[str, Any]
+    conf_data: Optional[Mapping[str, Any]]
+    conf_frame: Mapping[str, Any]
+
+
+@dataclass(frozen=True)
+class CompiledLayout:
+    """
+    Immutable render plan built from a layout JSON.
+
+    Plans are shared between requests: the ``data``/``frame`` mappings of
+    its blocks must be treated as read-only by renderers and blocks.
+
+    Attributes:
+        blocks (Tuple[PlannedBlock, ...]): Blocks in drawing order
+            (``flow`` groups flattened, else the legacy ``layout`` list).
+        columns (Mapping[str, Tuple[float, float]]): ``{id: (x, w)}`` in points.
+        page (Mapping[str, Any]): Page configuration with defaults applied.
+        has_flow (bool): ``True`` if the layout came from a ``flow``.
+    """
+    blocks: Tuple[PlannedBlock, ...]
+    columns: Mapping[str, Tuple[float, float]]
+    page: Mapping[str, Any]
+    has_flow: bool
+
+
+# ---------------------------------------------------------------------
+# Geometry helpers
+# ---------------------------------------------------------------------
+def fallback_columns() -> Dict[str, Tuple[float, float]]:
+    """
+    Provides default left/right column widths for blocks relying on columns.
+
+    Returns:
+        Dict[str, Tuple[float, float]]: A dictionary mapping column IDs to (x, width).
+    """
+    total_w = PAGE_W - LEFT_MARGIN - RIGHT_MARGIN
+    left_w = total_w * 0.4
+    right_w = total_w * 0.55
+    return {
+        "left": (LEFT_MARGIN, left_w),
+        "right": (LEFT_MARGIN + left_w + 5 * mm, right_w),
+    }
+
+
+def columns_from_percentages(cols_def: List[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
+    """
+    Converts definitions like:
+        [{"id": "left", "width": "33%"}, {"id": "right", "width": "67%"}]
+    into a dictionary: {id: (x, w)} with point units based on page margins.
+
+    Args:
+        cols_def (List[Dict[str, Any]]): List of column definitions with width in percent.
+
+    Returns:
+        Dict[str, Tuple[float, float]]: Mapping of column IDs to (x, width) in points.
+    """
+    total_w = PAGE_W - LEFT_MARGIN - RIGHT_MARGIN
+    x_cursor = LEFT_MARGIN
+    out: Dict[str, Tuple[float, float]] = {}
+
+    for c in cols_def:
+        cid = str(c.get("id") or "").strip() or f"col_{len(out)+1}"
+        w_str = str(c.get("width") or "100%").strip()
+        if w_str.endswith("%"):
+            try:
+                pct = float(w_str[:-1]) / 100.0
+            except Exception:
+                pct = 1.0
+        else:
+            pct = 1.0
+
+        w = total_w * pct
+        out[cid] = (x_cursor, w)
+
+        gutter_mm = float(c.get("gutter_mm") or 0) * mm
+        x_cursor += w + gutter_mm
+
+    return out if out else fallback_columns()
+
+
+def apply_page_defaults(page_conf: Dict[str, Any]) -> None:
+    """
+    Apply default values to the page configuration if not already set.
+
+    Args:
+        page_conf (Dict[str, Any]): Page configuration dictionary to modify.
+    """
+    if page_conf is None:
+        page_conf = {}
+    page_conf.setdefault("size", "A4")
+    page_conf.setdefault("orientation", "portrait")
+    page_conf.setdefault("margin_mm", {"top": 22, "right": 18, "bottom": 18, "left": 18})
+    page_conf.setdefault("gutter_mm", 6)
+
+
+# ---------------------------------------------------------------------
+# Compilation
+# ---------------------------------------------------------------------
+def _split_id(raw_id: str) -> Tuple[str, Optional[str]]:
+    if ":" in raw_id:
+        base, suffix = raw_id.split(":", 1)
+        return base, suffix
+    return raw_id, None
+
+
+def _entries(layout: Mapping[str, Any], warn: bool = False):
+    """Yield ``(block dict, column)`` for every valid block, in drawing order."""
+    flow = layout.get("flow") or []
+    if flow:
+        items = ((raw, grp.get("column")) for grp in flow for raw in (grp.get("blocks") or []))
+    else:
+        items = ((raw, None) for raw in (layout.get("layout") or []))
+    for raw, column in items:
+        blk = {"block_id": raw.strip()} if isinstance(raw, str) else dict(raw or {})
+        written = blk.get("block_id")
+        if not written or not isinstance(written, str):
+            if warn and not flow:
+                print(f"[WARN] Skipping invalid layout item in plan: {raw!r}")
+            continue
+        yield blk, column
+
+
+def _override(overrides: Mapping[str, Any], base_id: str, written: str) -> Dict[str, Any]:
+    return dict(overrides.get(base_id) or {}) | dict(overrides.get(written) or {})
+
+
+def _conf_data(data: Any, ov: Mapping[str, Any]) -> Optional[Dict[str, Any]]:
+    return (dict(data or {}) | dict(ov.get("data") or {})) or None
+
+
+def _plan_block(blk: Mapping[str, Any], column: Optional[str], overrides: Mapping[str, Any]) -> PlannedBlock:
+    written = blk["block_id"]
+    raw_id = canonicalize(written)
+    base_id, suffix = _split_id(raw_id)
+    try:
+        block = get_block(base_id)
+    except KeyError:
+        block = None
+
+    ov = _override(overrides, base_id, written)
+    data = blk.get("data")
+    frame = blk.get("frame") or {}
+    conf_data = _conf_data(data, ov)
+    conf_frame = dict(frame) | dict(ov.get("frame") or {})
+
+    return PlannedBlock(
+        raw_id=raw_id,
+        base_id=base_id,
+        suffix=suffix,
+        column=column,
+        block=block,
+        data=data,
+        frame=frame,
+        conf_data=conf_data,
+        conf_frame=conf_frame,
+    )
+
+
+def _compile(layout: Mapping[str, Any]) -> CompiledLayout:
+    # Own copy: the plan outlives the request that supplied the layout.
+    layout = copy.deepcopy(dict(layout))
+    overrides = layout.get("overrides") or {}
+    planned: List[PlannedBlock] = [
+        _plan_block(blk, column, overrides) for blk, column in _entries(layout, warn=True)
+    ]
+    flow = layout.get("flow") or []
+
+    cols_def = layout.get("columns") or []
+    columns = columns_from_percentages(cols_def) if cols_def else fallback_columns()
+
+    page = dict(layout.get("page") or {})
+    apply_page_defaults(page)
+
+    return CompiledLayout(
+        blocks=tuple(planned),
+        columns=MappingProxyType(columns),
+        page=MappingProxyType(page),
+        has_flow=bool(flow),
+    )
+
+
+# Values are (plan, structure size in bytes); structures hold no user data.
+_INLINE_CACHE = LRUCache(256, max_bytes=4 * 1024 * 1024, sizeof=lambda hit: hit[1])
+_FILE_CACHE = LRUCache(128)
+_JSON_CACHE = LRUCache(128)
+
+
+def _json_default(obj: Any) -> Any:
+    if isinstance(obj, (bytes, bytearray, memoryview)):
+        return {"__bytes__": hashlib.sha256(obj).hexdigest()}
+    return repr(obj)
+
+
+def layout_hash(layout: Mapping[str, Any]) -> str:
+    """Canonical content hash of an inline layout."""
+    canonical = json.dumps(
+        layout, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=_json_default
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _structure(layout: Mapping[str, Any]) -> Dict[str, Any]:
+    """The part of a layout a plan is compiled from: everything but ``data``."""
+    def strip(raw: Any) -> Any:
+        return {k: v for k, v in raw.items() if k != "data"} if isinstance(raw, dict) else raw
+
+    out: Dict[str, Any] = {}
+    if layout.get("flow"):
+        out["flow"] = [
+            strip(grp) | {"blocks": [strip(raw) for raw in (grp.get("blocks") or [])]}
+            if isinstance(grp, dict) else grp
+            for grp in layout["flow"]
+        ]
+    elif layout.get("layout"):
+        out["layout"] = [strip(raw) for raw in layout["layout"]]
+    for key in ("columns", "page"):
+        if layout.get(key):
+            out[key] = layout[key]
+    overrides = layout.get("overrides") or {}
+    if overrides:
+        out["overrides"] = {k: strip(v) for k, v in overrides.items()}
+    return out
+
+
+def _has_data(layout: Mapping[str, Any]) -> bool:
+    overrides = layout.get("overrides") or {}
+    return any(blk.get("data") for blk, _ in _entries(layout)) or any(
+        isinstance(v, dict) and v.get("data") for v in overrides.values()
+    )
+
+
+def _bind(plan: CompiledLayout, layout: Mapping[str, Any]) -> CompiledLayout:
+    """Attach this request's block and override ``data`` to a structural plan."""
+    overrides = layout.get("overrides") or {}
+    blocks = []
+    for pb, (blk, _) in zip(plan.blocks, _entries(layout)):
+        data = blk.get("data")
+        conf_data = _conf_data(data, _override(overrides, pb.base_id, blk["block_id"]))
+        blocks.append(replace(pb, data=data, conf_data=conf_data))
+    return replace(plan, blocks=tuple(blocks))
+
+
+def compile_layout(layout: Optional[Mapping[str, Any]]) -> CompiledLayout:
+    """
+    Return the compiled plan for an inline layout.
+
+    Only the structure is compiled and cached (by its content hash); block
+    and override ``data`` are bound to the cached plan on every call, so
+    per-request content neither misses the cache nor stays in it.
+
+    Args:
+        layout (Optional[Mapping[str, Any]]): Layout with ``flow`` or ``layout``,
+            plus optional ``columns``, ``page`` and ``overrides``.
+
+    Returns:
+        CompiledLayout: Immutable plan; its ``data`` mappings are the
+        caller's own and must be treated as read-only.
+    """
+    layout = layout or {}
+    structure = _structure(layout)
+    key = layout_hash(structure)
+    hit = _INLINE_CACHE.get(key)
+    if hit is None:
+        hit = (_compile(structure), len(json.dumps(structure, default=_json_default)))
+        _INLINE_CACHE.put(key, hit)
+    compiled = hit[0]
+    return _bind(compiled, layout) if _has_data(layout) else compiled
+
+
+def _file_version(path: Path) -> Tuple[str, int, int]:
+    st = os.stat(path)
+    return str(path), st.st_mtime_ns, st.st_size
+
+
+def read_json_file(path: Path) -> Any:
+    """
+    Parse a JSON file, re-reading it only when its mtime or size changes.
+
+    The returned object is shared between callers: treat it as read-only.
+
+    Raises:
+        FileNotFoundError: If ``path`` does not exist.
+        ValueError: If the file is not valid JSON.
+    """
+    version = _file_version(path)
+    hit = _JSON_CACHE.get(version[0])
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    obj = json.loads(Path(path).read_text(encoding="utf-8"))
+    _JSON_CACHE.put(version[0], (version, obj))
+    return obj
+
+
+def load_layout_file(path: Path) -> CompiledLayout:
+    """Compile a layout file, cached by path and mtime."""
+    version = _file_version(path)
+    compiled = _FILE_CACHE.get(version)
+    if compiled is None:
+        compiled = _compile(read_json_file(path))
+        _FILE_CACHE.put(version, compiled)
+    return compiled
+
+
+def clear_layout_caches() -> None:
+    """Drop all compiled plans (tests / after registering new blocks)."""
+    for cache in (_INLINE_CACHE, _FILE_CACHE, _JSON_CACHE):
+        cache.clear()
+
+
+__all__ = [
+    "CompiledLayout",
+    "PlannedBlock",
+    "apply_page_defaults",
+    "clear_layout_caches",
+    "columns_from_percentages",
+    "compile_layout",
+    "fallback_columns",
+    "layout_hash",
+    "load_layout_file",
+    "read_json_file",
+]
@@ -0,0 +1,72 @@
+# api/pdf_utils/recording.py
+"""
+Recording canvas used to measure blocks without drawing them.
+
+``RecordingCanvas`` wraps a real ReportLab canvas: queries (``stringWidth``,
+``beginPath``, ...) pass through, while drawing and state calls are stored
+as ``(method, args, kwargs)`` tuples. The engine can then look at the height
+a block *would* take and either replay the calls onto the real canvas or
+discard them and draw the block on a fresh page.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from reportlab.pdfbase.pdfmetrics import stringWidth as _string_width
+
+Op = Tuple[str, Tuple[Any, ...], Dict[str, Any]]
+
+# Calls that return something the block needs and emit nothing by themselves.
+_PASSTHROUGH = frozenset({
+    "beginPath",
+    "beginText",
+    "getAvailableFonts",
+    "getPageNumber",
+    "hasForm",
+})
+
+
+class RecordingCanvas:
+    """Canvas proxy that records drawing operations instead of emitting them."""
+
+    def __init__(self, canvas: Any):
+        self._canvas = canvas
+        self._fontname = getattr(canvas, "_fontname", "Helvetica")
+        self._fontsize = getattr(canvas, "_fontsize", 12)
+        self.ops: List[Op] = []
+
+    def __getattr__(self, name: str) -> Any:
+        attr = getattr(self._canvas, name)
+        if name in _PASSTHROUGH or not callable(attr):
+            return attr
+
+        def _record(*args: Any, **kwargs: Any) -> None:
+            self.ops.append((name, args, kwargs))
+
+        return _record
+
+    # Font state is shadowed so width queries after setFont stay correct.
+    def setFont(self, psfontname: str, size: float, leading: Any = None) -> None:
+        self._fontname, self._fontsize = psfontname, size
+        self.ops.append(("setFont", (psfontname, size, leading), {}))
+
+    def stringWidth(self, text: str, fontName: Any = None, fontSize: Any = None) -> float:
+        return _string_width(
+            text,
+            fontName or self._fontname,
+            self._fontsize if fontSize is None else fontSize,
+        )
+
+    def replay(self, canvas: Any = None) -> None:
+        """Emit the recorded operations onto ``canvas`` (default: the wrapped one)."""
+        replay_ops(self.ops, canvas if canvas is not None else self._canvas)
+
+
+def replay_ops(ops: Iterable[Op], canvas: Any) -> None:
+    """Emit recorded ``(method, args, kwargs)`` operations onto ``canvas``."""
+    for name, args, kwargs in ops:
+        getattr(canvas, name)(*args, **kwargs)
+
+
+__all__ = ["Op", "RecordingCanvas", "replay_ops"]
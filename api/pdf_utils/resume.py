@@ -1,6 +1,5 @@
 ﻿from __future__ import annotations
 
-from io import BytesIO
 from typing import Dict, Any, List, Tuple, Optional
 
 from reportlab.pdfgen import canvas
@@ -11,16 +10,26 @@ from .blocks.base import Frame, RenderContext
 from .blocks.registry import get as get_block
 from .data_utils import build_ready_from_profile
 from .config import UI_LANG
-from .theme_loader import load_and_apply
-from .block_aliases import canonicalize
+from .theme_loader import Theme, compile_theme, default_theme
 from .data_utils import build_ready_from_profile  
+from .layout_plan import (
+    CompiledLayout,
+    apply_page_defaults as _apply_page_defaults,
+    compile_layout,
+    fallback_columns as _fallback_columns,
+)
+# Modern usage maps the profile with ``data_mapper`` (honours the layout's
+# ``map_rules``); ``build_ready_from_profile`` is only the fallback when the
+# mapper cannot be imported.
 try:
     from .data_mapper import map_profile_to_ready  
+    _HAS_MAPPER = True
 except Exception:
     _HAS_MAPPER = False
 
 
 from .engine import LayoutEngine, PageSpec
+from .draft import PageLimitReached, new_canvas
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, LETTER
 from reportlab.lib.units import mm
@@ -49,6 +58,7 @@ def build_resume_pdf(
     theme_name: Optional[str] = None,
     theme: Optional[str] = None,
     page: Optional[Dict[str, Any]] = None,
+    quality: Optional[str] = None,
 ) -> bytes:
     """Build a resume PDF from modern or legacy inputs.
 
@@ -72,6 +82,8 @@ def build_resume_pdf(
         theme: Optional alias for ``theme_name``; if provided and
             ``theme_name`` is missing, this value is used.
         page: Page configuration mapping (e.g., size, margins).
+        quality: ``"print"`` (default) or ``"draft"`` for fast previews
+            (``data["quality"]`` in modern usage; see ``draft.py``).
 
     Returns:
         bytes: The rendered PDF as a byte string.
@@ -80,9 +92,9 @@ def build_resume_pdf(
         - Logic is preserved from the original implementation; only formatting
           and documentation were adjusted to comply with PEP 8 and documentation
           standards.
-        - This function relies on external helpers such as ``load_and_apply``,
-          ``map_profile_to_ready``, ``_resolve_layout_columns_page_from_inline``,
-          ``_apply_page_defaults``, and ``_render_pdf``.
+        - This function relies on external helpers such as ``compile_theme``,
+          ``map_profile_to_ready``, ``compile_layout`` (cached layout plans)
+          and ``_render_pdf``.
     """
     if theme and not theme_name:
         theme_name = theme
@@ -93,7 +105,7 @@ def build_resume_pdf(
         rtl = bool(data.get("rtl_mode"))
         profile = data.get("profile") or {}
         tn = theme_name or data.get("theme_name") or "default"
-        theme_dict = load_and_apply(tn)
+        style = compile_theme(tn)
 
         # Mapping layer (Mapper) with fallback.
         if _HAS_MAPPER:
@@ -109,27 +121,27 @@ def build_resume_pdf(
         else:
             rd = build_ready_from_profile(profile)
 
-        plan, cols, page_conf = _resolve_layout_columns_page_from_inline(data)
-        _apply_page_defaults(page_conf)
+        plan = compile_layout(data.get("layout_inline") or {})
 
         return _render_pdf(
             plan,
             rd,
             ui_lang=ui,
             rtl_mode=rtl,
-            columns=cols,
-            theme=theme_dict,
-            page=page_conf,
+            columns=dict(plan.columns),
+            style=style,
+            page=dict(plan.page),
+            quality=quality or data.get("quality"),
         )
 
     # -------- Legacy usage --------
     ui = ui_lang or UI_LANG
     rtl = bool(rtl_mode)
     rd = ready or {}
-    plan = layout_plan or _fallback_layout()
+    plan = compile_layout({"layout": layout_plan or _fallback_layout()})
     cols = _fallback_columns()
     tn = theme_name or "default"
-    theme_dict = load_and_apply(tn)
+    style = compile_theme(tn)
     page_conf = page or {}
 
     _apply_page_defaults(page_conf)
@@ -140,32 +152,43 @@ def build_resume_pdf(
         ui_lang=ui,
         rtl_mode=rtl,
         columns=cols,
-        theme=theme_dict,
+        style=style,
         page=page_conf,
+        quality=quality,
     )
 
 
 def _render_pdf(
-    layout_plan: List[Dict[str, Any]] | Dict[str, Any],
+    layout_plan: CompiledLayout | List[Dict[str, Any]] | Dict[str, Any],
     ready: Dict[str, Any],
     *,
     ui_lang: str,
     rtl_mode: bool,
     columns: Dict[str, Tuple[float, float]],
-    theme: Optional[Dict[str, Any]] = None,
+    style: Optional[Theme] = None,
     page: Optional[Dict[str, Any]] = None,
+    quality: Optional[str] = None,
 ) -> bytes:
     """
-    Render the PDF. If layout_plan is a dict with flow => use modern engine.
-    Otherwise fall back to legacy list-based rendering.
+    Render the PDF. A compiled plan with a flow (or a dict with ``flow``)
+    uses the modern engine; anything else falls back to legacy list-based
+    rendering.
     """
     # ---------------------------
     # Modern engine (flow-based)
     # ---------------------------
-    if isinstance(layout_plan, dict) and layout_plan.get("flow"):
+    flow_plan: Optional[CompiledLayout] = None
+    if isinstance(layout_plan, CompiledLayout) and layout_plan.has_flow:
+        flow_plan = layout_plan
+    elif isinstance(layout_plan, dict) and layout_plan.get("flow"):
+        flow_plan = compile_layout({
+            "flow": layout_plan.get("flow") or [],
+            "overrides": layout_plan.get("overrides") or {},
+        })
+
+    if flow_plan is not None:
         pagesize = _resolve_page_size(page)
-        buf = BytesIO()
-        c = canvas.Canvas(buf, pagesize=pagesize)
+        c = new_canvas(pagesize, quality)
 
         # Page margins in points
         margins = {
@@ -180,63 +203,47 @@ def _render_pdf(
             canvas=c,
             page=ps,
             columns=columns,  # {col_id: (x, w)}
-            theme=theme or {},
+            theme=dict(style.raw) if style else {},
             ui_lang=ui_lang,
             rtl_mode=rtl_mode,
+            style=style,
         )
 
-        engine.render_flow(
-            flow=layout_plan.get("flow") or [],
-            ready=ready,
-            overrides=layout_plan.get("overrides") or {},
-        )
-
-        c.showPage()
-        c.save()
-        return buf.getvalue()
+        try:
+            engine.render_plan(flow_plan, ready)
+            c.showPage()
+        except PageLimitReached:
+            pass  # draft: the first pages are enough
+        return c.getpdfdata()
 
     # ---------------------------
     # Legacy block list engine
     # ---------------------------
-    if isinstance(layout_plan, dict):
-        layout_plan = layout_plan.get("layout", [])
-
-    fixed_plan: List[Dict[str, Any]] = []
-    for it in layout_plan or []:
-        if isinstance(it, dict) and it.get("block_id"):
-            fixed_plan.append(dict(it))
-        elif isinstance(it, str) and it.strip():
-            fixed_plan.append({"block_id": it.strip()})
-        else:
-            print(f"[WARN] Skipping invalid layout item in _render: {it!r}")
-
-    for it in fixed_plan:
-        it["block_id"] = canonicalize(it["block_id"])
+    if isinstance(layout_plan, CompiledLayout):
+        plan = layout_plan
+    else:
+        if isinstance(layout_plan, dict):
+            layout_plan = layout_plan.get("layout", [])
+        plan = compile_layout({"layout": layout_plan or []})
 
     pagesize = _resolve_page_size(page)
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=pagesize)
+    c = new_canvas(pagesize, quality)
 
     ctx: RenderContext = {
         "ui_lang": ui_lang,
         "rtl_mode": rtl_mode,
         "page_top_y": pagesize[1] - _get_margin(page, "top", default_px=TOP_MARGIN),
         "page_h": pagesize[1],
-        "theme": theme or {},
+        "theme": dict(style.raw) if style else {},
+        "style": style or default_theme(),
         "columns": columns,
         "page_conf": page or {},
     }
 
-    for block_conf in fixed_plan:
+    for pb in plan.blocks:
         try:
-            raw_id = block_conf.get("block_id")
-            if isinstance(raw_id, str) and ":" in raw_id:
-                base_id, suffix = (raw_id.split(":", 1) + [None])[:2]
-            else:
-                base_id, suffix = raw_id, None
-
-            block = get_block(base_id)
-            frame_dict = block_conf.get("frame") or {}
+            block = pb.block if pb.block is not None else get_block(pb.base_id)
+            frame_dict = pb.frame
             frame = Frame(
                 x=float(frame_dict.get("x", _get_margin(page, "left", default_px=LEFT_MARGIN))),
                 y=float(frame_dict.get("y", pagesize[1] - _get_margin(page, "top", default_px=TOP_MARGIN))),
@@ -250,130 +257,39 @@ def _render_pdf(
                 ),
             )
 
-            block_data = ready.get(base_id)
+            block_data = ready.get(pb.base_id)
             if block_data is None:
-                block_data = block_conf.get("data")
+                block_data = pb.data
 
-            if suffix and isinstance(block_data, dict) and suffix in block_data:
-                block_data = block_data[suffix]
+            if pb.suffix and isinstance(block_data, dict) and pb.suffix in block_data:
+                block_data = block_data[pb.suffix]
 
             if isinstance(block_data, (list, tuple)):
                 block_data = "\n".join(str(x) for x in block_data)
 
             ctx_local = dict(ctx)
-            if suffix:
-                ctx_local["section"] = suffix
+            if pb.suffix:
+                ctx_local["section"] = pb.suffix
 
             new_y = block.render(c, frame, block_data or {}, ctx_local)
             frame.y = new_y
 
+        except PageLimitReached:
+            return c.getpdfdata()
         except Exception as e:
-            print(f"[WARN] Block '{block_conf.get('block_id') if isinstance(block_conf, dict) else block_conf}' failed: {e}")
+            print(f"[WARN] Block '{pb.raw_id}' failed: {e}")
             continue
 
-    c.showPage()
-    c.save()
-    return buf.getvalue()
+    try:
+        c.showPage()
+    except PageLimitReached:
+        pass
+    return c.getpdfdata()
 
 
 # ============================================================
-#              Layout/Columns/Page resolution helpers
+#                 Page resolution helpers
 # ============================================================
-def _resolve_layout_columns_page_from_inline(data: Dict[str, Any]):
-    """
-    Extracts layout_plan, columns, and page_conf from data["layout_inline"],
-    or returns fallbacks if not present.
-
-    Args:
-        data (Dict[str, Any]): Input data dictionary containing layout_inline.
-
-    Returns:
-        Tuple[List[Dict[str, Any]], Dict[str, Tuple[float, float]], Dict[str, Any]]:
-            A tuple containing the layout plan, column definitions, and page config.
-    """
-    li = data.get("layout_inline") or {}
-
-
-    # 1) Drawing plan: flow > layout
-    plan: List[Dict[str, Any]] = []
-    flow = li.get("flow") or []
-    if flow:
-        flat: List[Dict[str, Any]] = []
-        for grp in flow:
-            for b in grp.get("blocks") or []:
-                if isinstance(b, str):
-                    flat.append({"block_id": b})
-                elif isinstance(b, dict) and b.get("block_id"):
-                    flat.append(dict(b))
-        plan = flat
-    else:
-        layout_old = li.get("layout") or []
-        for it in layout_old:
-            if isinstance(it, str):
-                plan.append({"block_id": it})
-            elif isinstance(it, dict) and it.get("block_id"):
-                plan.append(dict(it))
-
-    # 2) Columns
-    cols_def = li.get("columns") or []
-    columns = _columns_from_percentages(cols_def) if cols_def else _fallback_columns()
-
-    # 3) Page configuration
-    page_conf = li.get("page") or {}
-    return plan, columns, page_conf
-
-
-def _columns_from_percentages(cols_def: List[Dict[str, Any]]) -> Dict[str, Tuple[float, float]]:
-    """
-    Converts definitions like:
-        [{"id": "left", "width": "33%"}, {"id": "right", "width": "67%"}]
-    into a dictionary: {id: (x, w)} with point units based on page margins.
-
-    Args:
-        cols_def (List[Dict[str, Any]]): List of column definitions with width in percent.
-
-    Returns:
-        Dict[str, Tuple[float, float]]: Mapping of column IDs to (x, width) in points.
-    """
-    total_w = PAGE_W - LEFT_MARGIN - RIGHT_MARGIN
-    x_cursor = LEFT_MARGIN
-    out: Dict[str, Tuple[float, float]] = {}
-
-    for c in cols_def:
-        cid = str(c.get("id") or "").strip() or f"col_{len(out)+1}"
-        w_str = str(c.get("width") or "100%").strip()
-        if w_str.endswith("%"):
-            try:
-                pct = float(w_str[:-1]) / 100.0
-            except Exception:
-                pct = 1.0
-        else:
-            pct = 1.0
-
-        w = total_w * pct
-        out[cid] = (x_cursor, w)
-
-        gutter_mm = float(c.get("gutter_mm") or 0) * mm
-        x_cursor += w + gutter_mm
-
-    return out if out else _fallback_columns()
-
-
-def _apply_page_defaults(page_conf: Dict[str, Any]) -> None:
-    """
-    Apply default values to the page configuration if not already set.
-
-    Args:
-        page_conf (Dict[str, Any]): Page configuration dictionary to modify.
-    """
-    if page_conf is None:
-        page_conf = {}
-    page_conf.setdefault("size", "A4")
-    page_conf.setdefault("orientation", "portrait")
-    page_conf.setdefault("margin_mm", {"top": 22, "right": 18, "bottom": 18, "left": 18})
-    page_conf.setdefault("gutter_mm", 6)
-
-
 def _resolve_page_size(page_conf: Optional[Dict[str, Any]]):
     """
     Resolve the page size tuple based on the given configuration.
@@ -446,18 +362,3 @@ def _fallback_layout() -> List[Dict[str, Any]]:
         },
     ]
 
-def _fallback_columns() -> Dict[str, Tuple[float, float]]:
-    """
-    Provides default left/right column widths for blocks relying on columns.
-
-    Returns:
-        Dict[str, Tuple[float, float]]: A dictionary mapping column IDs to (x, width).
-    """
-    total_w = PAGE_W - LEFT_MARGIN - RIGHT_MARGIN
-    left_w = total_w * 0.4
-    right_w = total_w * 0.55
-    return {
-        "left": (LEFT_MARGIN, left_w),
-        "right": (LEFT_MARGIN + left_w + 5 * mm, right_w),
-    }
-
@@ -4,47 +4,131 @@ This module performs automatic shaping for Arabic text if both
 ``arabic_reshaper`` and ``python-bidi`` are available. Otherwise,
 it gracefully falls back to returning the input text unchanged.
 All code and documentation adhere to PEP 8 standards.
+
+Shaping is memoized: Arabic resumes repeat the same labels and phrases on
+every page and every render, so both whole strings and individual Arabic
+tokens are kept in bounded LRU caches. Strings without Arabic letters are
+returned as-is without touching the shaper.
 """
 
 import re
+from typing import Dict, Iterable, List
+
+from .lru import LRUCache
 
 ARABIC_RE = re.compile(r"[\u0600-\u06FF]")
+_WS_SPLIT_RE = re.compile(r"(\s+)")
+
+# text -> shaped text, for rtl() and rtl_line() respectively
+_RTL_CACHE = LRUCache(4096)
+_LINE_CACHE = LRUCache(4096)
+# single Arabic token -> shaped token (shared by all strings)
+_TOKEN_CACHE = LRUCache(8192)
 
 try:
     import arabic_reshaper  # type: ignore
     from bidi.algorithm import get_display  # type: ignore
 
-    def rtl(text: str) -> str:
-        """Reshape and reorder Arabic text while leaving Latin words intact.
-
-        Args:
-            text: Input string possibly containing Arabic and Latin words.
-
-        Returns:
-            The reshaped string suitable for proper RTL rendering. Returns an
-            empty string for falsy input.
-        """
-        if not text:
-            return ""
-        parts = re.split(r"(\s+)", str(text))
-        out = []
-        for part in parts:
-            if ARABIC_RE.search(part):
-                out.append(get_display(arabic_reshaper.reshape(part)))
-            else:
-                out.append(part)
-        return "".join(out)
+    def _shape(text: str) -> str:
+        return get_display(arabic_reshaper.reshape(text))
 
 except Exception:
 
-    def rtl(text: str) -> str:
-        """Fallback implementation if Arabic shaping libraries are missing.
+    def _shape(text: str) -> str:
+        """Fallback if Arabic shaping libraries are missing: text unchanged."""
+        return text
+
+
+def _shape_token(token: str) -> str:
+    shaped = _TOKEN_CACHE.get(token)
+    if shaped is None:
+        shaped = _shape(token)
+        _TOKEN_CACHE.put(token, shaped)
+    return shaped
+
+
+def rtl(text: str) -> str:
+    """Reshape and reorder Arabic text while leaving Latin words intact.
+
+    Each whitespace-separated Arabic token is shaped on its own (so word
+    order is kept); results are cached per string and per token.
+
+    Args:
+        text: Input string possibly containing Arabic and Latin words.
+
+    Returns:
+        The reshaped string suitable for proper RTL rendering. Returns an
+        empty string for falsy input.
+    """
+    if not text:
+        return ""
+    text = str(text)
+    if not ARABIC_RE.search(text):
+        return text
+    shaped = _RTL_CACHE.get(text)
+    if shaped is None:
+        shaped = "".join(
+            _shape_token(part) if ARABIC_RE.search(part) else part
+            for part in _WS_SPLIT_RE.split(text)
+        )
+        _RTL_CACHE.put(text, shaped)
+    return shaped
+
+
+def rtl_line(text: str) -> str:
+    """Reshape and bidi-reorder a whole line (word order follows RTL rules).
+
+    Args:
+        text: One line of text.
+
+    Returns:
+        The visual-order line, or the input unchanged if it has no Arabic.
+    """
+    if not text:
+        return ""
+    text = str(text)
+    if not ARABIC_RE.search(text):
+        return text
+    shaped = _LINE_CACHE.get(text)
+    if shaped is None:
+        shaped = _shape(text)
+        _LINE_CACHE.put(text, shaped)
+    return shaped
+
+
+def rtl_many(texts: Iterable[str], *, whole_line: bool = False) -> List[str]:
+    """Shape many strings at once; duplicates are shaped only once.
+
+    Args:
+        texts: Strings to shape (labels, paragraph lines, list items).
+        whole_line: Use ``rtl_line`` semantics instead of ``rtl``.
+
+    Returns:
+        The shaped strings, in input order.
+    """
+    fn = rtl_line if whole_line else rtl
+    done: Dict[str, str] = {}
+    out: List[str] = []
+    for text in texts:
+        key = str(text or "")
+        if key not in done:
+            done[key] = fn(key)
+        out.append(done[key])
+    return out
+
+
+def rtl_cache_stats() -> Dict[str, Dict[str, int]]:
+    """Hit/miss counters of the shaping caches."""
+    return {
+        "strings": _RTL_CACHE.stats(),
+        "lines": _LINE_CACHE.stats(),
+        "tokens": _TOKEN_CACHE.stats(),
+    }
+
 
-        Args:
-            text: Input string.
+def clear_rtl_cache() -> None:
+    for cache in (_RTL_CACHE, _LINE_CACHE, _TOKEN_CACHE):
+        cache.clear()
 
-        Returns:
-            The text unchanged (or an empty string if falsy).
-        """
-        return text or ""
 
+__all__ = ["ARABIC_RE", "rtl", "rtl_line", "rtl_many", "rtl_cache_stats", "clear_rtl_cache"]
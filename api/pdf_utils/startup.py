@@ -0,0 +1,15 @@
+# api/pdf_utils/startup.py
+"""
+Startup mode switch.
+
+With ``LAZY_STARTUP=1`` importing the app does the minimum: block modules
+are imported by the block registry on first lookup, fonts are parsed (or
+unpickled) on first use, JSON schemas are compiled on first validation and
+the render pool warms up in the background instead of blocking startup.
+"""
+
+import os
+
+LAZY_STARTUP = (os.getenv("LAZY_STARTUP") or "").strip().lower() in ("1", "true", "yes", "on")
+
+__all__ = ["LAZY_STARTUP"]
@@ -2,37 +2,133 @@
 """
 Shim layer to keep old blocks working.
 Provides wrap_text / draw_paragraph / draw_par aliases + helpers.
-Handles RTL via api.pdf_utils.rtl.rtl when requested.
+Handles RTL via api.pdf_utils.rtl.rtl when requested: a paragraph is shaped
+once, before line breaking, and the shaped lines are cached with it (the
+per-line ``rtl_many`` batching is only needed by the builder, which shapes
+after wrapping).
+
+Line breaking is linear: each word is measured once from a cached
+per-character width table (ReportLab widths are plain per-glyph sums, no
+kerning), and lines are built by adding word and space widths instead of
+re-measuring the growing line.
+
+Wrapped paragraphs are cached process-wide (bounded LRU keyed by text, font,
+size, width and RTL flag), so previews, theme switches and language variants
+re-use the lines of paragraphs they have already laid out.
 """
 
-from typing import List, Any
+from typing import Callable, Dict, List, Any, Optional, Tuple
 from reportlab.pdfgen import canvas
+from reportlab.pdfbase import pdfmetrics
 from reportlab.lib.colors import HexColor
+from api.pdf_utils.lru import LRUCache
 from api.pdf_utils.rtl import rtl as _rtl_unified  # unified RTL
 
+# ---------- width tables ----------
+# font name -> {char: width at 1pt}
+_CHAR_WIDTHS: Dict[str, Dict[str, float]] = {}
+
+def string_width(text: str, font: str, size: float) -> float:
+    """
+    Width of ``text`` in points, summed from the font's cached char widths.
+
+    Equals ``pdfmetrics.stringWidth(text, font, size)`` up to float rounding.
+    """
+    table = _CHAR_WIDTHS.get(font)
+    if table is None:
+        table = _CHAR_WIDTHS.setdefault(font, {})
+    total = 0.0
+    for ch in text:
+        w = table.get(ch)
+        if w is None:
+            w = table[ch] = pdfmetrics.stringWidth(ch, font, 1.0)
+        total += w
+    return total * size
+
+def clear_width_cache() -> None:
+    """Forget cached char widths and wrapped paragraphs (after re-registering a font)."""
+    _CHAR_WIDTHS.clear()
+    _PARAGRAPHS.clear()
+
 # ---------- core word-wrap ----------
-def wrap_text(
-    c: canvas.Canvas,
+def break_lines(
     text: str,
     max_w: float,
     font: str = "Helvetica",
-    size: int = 10,
+    size: float = 10,
+    measure: Optional[Callable[[str], float]] = None,
 ) -> List[str]:
-    c.setFont(font, size)
+    """
+    Greedy word wrap in O(len(text)) width lookups.
+
+    A word wider than ``max_w`` gets a line of its own (it is not split).
+
+    Args:
+        measure: Optional ``text -> width`` replacing the single-font width
+            (e.g. for mixed-script text drawn in several fonts).
+
+    Returns:
+        List[str]: Wrapped lines (``[""]`` for empty text).
+    """
     words = str(text or "").split()
+    if not words:
+        return [""]
+    if measure is None:
+        measure = lambda s: string_width(s, font, size)  # noqa: E731
+    space_w = measure(" ")
     lines: List[str] = []
-    cur = ""
+    cur: List[str] = []
+    cur_w = 0.0
     for w in words:
-        test = (cur + " " + w).strip()
-        if c.stringWidth(test, font, size) <= max_w:
-            cur = test
+        w_w = measure(w)
+        if cur and cur_w + space_w + w_w <= max_w:
+            cur.append(w)
+            cur_w += space_w + w_w
         else:
             if cur:
-                lines.append(cur)
-            cur = w
-    if cur:
-        lines.append(cur)
-    return lines or [""]
+                lines.append(" ".join(cur))
+            cur, cur_w = [w], w_w
+    lines.append(" ".join(cur))
+    return lines
+
+# ---------- paragraph cache ----------
+# (text, font, size, max_w, rtl) -> tuple of lines
+_PARAGRAPHS = LRUCache(4096)
+
+def wrapped_lines(
+    text: str,
+    max_w: float,
+    font: str = "Helvetica",
+    size: float = 10,
+    rtl: bool = False,
+) -> Tuple[str, ...]:
+    """
+    Cached ``break_lines``; with ``rtl`` the text is shaped first (also cached).
+
+    Returns:
+        Tuple[str, ...]: Shared, immutable lines.
+    """
+    text = str(text or "")
+    key = (text, font, float(size), round(float(max_w), 3), bool(rtl))
+    lines = _PARAGRAPHS.get(key)
+    if lines is None:
+        lines = tuple(break_lines(_rtl_unified(text) if rtl else text, max_w, font, size))
+        _PARAGRAPHS.put(key, lines)
+    return lines
+
+def paragraph_cache_stats() -> Dict[str, int]:
+    """Hit/miss counters and occupancy of the paragraph cache."""
+    return _PARAGRAPHS.stats()
+
+def wrap_text(
+    c: canvas.Canvas,
+    text: str,
+    max_w: float,
+    font: str = "Helvetica",
+    size: int = 10,
+) -> List[str]:
+    c.setFont(font, size)
+    return list(wrapped_lines(text, max_w, font, size))
 
 # ---------- paragraph drawing ----------
 def draw_paragraph(
@@ -48,11 +144,8 @@ def draw_paragraph(
 ) -> float:
     if not text:
         return y
-    raw = str(text)
-    if is_rtl:
-        raw = _rtl_unified(raw)
-    lines = wrap_text(c, raw, w, font, size)
-    for ln in lines:
+    c.setFont(font, size)
+    for ln in wrapped_lines(str(text), w, font, size, is_rtl):
         if is_rtl:
             c.drawRightString(x + w, y, ln)
         else:
@@ -106,6 +199,11 @@ def hex_color(s: str):
     return HexColor(s)
 
 __all__ = [
+    "string_width",
+    "break_lines",
+    "clear_width_cache",
+    "wrapped_lines",
+    "paragraph_cache_stats",
     "wrap_text",
     "draw_paragraph",
     "draw_par",       # alias
@@ -1,12 +1,16 @@
 ﻿from __future__ import annotations
 
 import json
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from types import MappingProxyType
+from typing import Any, Dict, Mapping, Optional, Union
 
 from reportlab.lib import colors
 from reportlab.lib.units import mm
 
+from .fonts import font_generation, has_font
+from .lru import LRUCache
 from .themes import DEFAULT_THEME
 from . import config as cfg
 
@@ -119,75 +123,86 @@ BOOL_KEYS = {"LEFT_TEXT_IS_BOLD", "USE_LINKEDIN_REDIRECT", "USE_MOBILE_LINKEDIN"
 
 FONT_KEYS = {"AR_FONT", "LATIN_FONT", "LATIN_BOLD_FONT"}
 
-def _apply_style_map(style: Dict[str, Any]) -> None:
+def _apply_style_map(style: Dict[str, Any], out: Dict[str, Any]) -> None:
     for key, val in (style or {}).items():
         try:
             if key in COLOR_KEYS:
-                setattr(cfg, key, _to_hex_color(val))
+                out[key] = _to_hex_color(val)
             elif key in MM_KEYS:
-                setattr(cfg, key, _parse_number_with_mm(val))
+                out[key] = _parse_number_with_mm(val)
             elif key in PT_KEYS:
-                setattr(cfg, key, float(val))
+                out[key] = float(val)
             elif key in STRING_KEYS:
-                setattr(cfg, key, str(val))
+                out[key] = str(val)
             elif key in BOOL_KEYS:
-                setattr(cfg, key, bool(val))
+                out[key] = bool(val)
             elif key in FONT_KEYS:
-                setattr(cfg, key, str(val))
+                out[key] = str(val)
         except Exception as e:
             print(f"[WARN] Failed to apply style key {key}={val!r}: {e}")
 
-def _apply_legacy_sections(theme: dict) -> None:
+def _apply_legacy_sections(theme: dict, out: Dict[str, Any]) -> None:
     for k, v in (theme.get("colors") or {}).items():
         if k.lower() in {"heading", "heading_color"}:
-            cfg.HEADING_COLOR = _to_hex_color(v)
+            out["HEADING_COLOR"] = _to_hex_color(v)
         elif k.lower() in {"subhead", "subhead_color"}:
-            cfg.SUBHEAD_COLOR = _to_hex_color(v)
+            out["SUBHEAD_COLOR"] = _to_hex_color(v)
         elif k.lower() in {"text", "muted", "body"}:
-            cfg.MUTED = _to_hex_color(v)
+            out["MUTED"] = _to_hex_color(v)
         elif k.lower() in {"rule", "rule_color"}:
-            cfg.RULE_COLOR = _to_hex_color(v)
+            out["RULE_COLOR"] = _to_hex_color(v)
         elif k.lower() in {"left_bg", "panel_bg"}:
-            cfg.LEFT_BG = _to_hex_color(v)
+            out["LEFT_BG"] = _to_hex_color(v)
         elif k.lower() in {"left_border", "panel_border"}:
-            cfg.LEFT_BORDER = _to_hex_color(v)
+            out["LEFT_BORDER"] = _to_hex_color(v)
 
     for k, v in (theme.get("sizes") or {}).items():
         name = k.upper()
         try:
-            setattr(cfg, name, float(v))
+            out[name] = float(v)
         except Exception:
             pass
 
     for k, v in (theme.get("spacing") or {}).items():
         name = k.upper()
         try:
-            setattr(cfg, name, float(v))
+            out[name] = float(v)
         except Exception:
             pass
 
     for k, v in (theme.get("fonts") or {}).items():
         name = k.upper()
         try:
-            setattr(cfg, name, str(v))
+            out[name] = str(v)
         except Exception:
             pass
 
+def _compile_values(theme: dict) -> Dict[str, Any]:
+    """Translate a theme dict into config-style ``UPPER_CASE`` overrides."""
+    out: Dict[str, Any] = {}
+    _apply_legacy_sections(theme, out)
+    _apply_style_map(theme.get("style") or {}, out)
+    return out
+
 def apply_theme_to_config(theme: dict) -> None:
     """
     Apply theme settings to the global configuration module.
 
+    Deprecated: mutates shared state and races between concurrent renders.
+    Use ``compile_theme`` and pass the result through the render context.
+
     Args:
         theme (dict): Theme dictionary to apply.
     """
-    _apply_legacy_sections(theme)
-    style = theme.get("style") or {}
-    _apply_style_map(style)
+    for key, val in _compile_values(theme).items():
+        setattr(cfg, key, val)
 
 def load_and_apply(theme_name: Optional[str]) -> dict:
     """
     Load a theme by name and apply it to the global config.
 
+    Deprecated: see ``apply_theme_to_config``; use ``compile_theme`` instead.
+
     Args:
         theme_name (Optional[str]): Theme name to load.
 
@@ -198,3 +213,100 @@ def load_and_apply(theme_name: Optional[str]) -> dict:
     apply_theme_to_config(theme)
     return theme
 
+# ---------------------------------------------------------------------
+# Compiled themes
+# ---------------------------------------------------------------------
+# Pristine config values, captured before anything can mutate the module.
+_CONFIG_DEFAULTS: Dict[str, Any] = {k: v for k, v in vars(cfg).items() if k.isupper()}
+
+_FONT_FALLBACKS = {
+    "LEFT_TEXT_FONT": "Helvetica",
+    "LEFT_TEXT_FONT_BOLD": "Helvetica-Bold",
+    "LATIN_FONT": "Helvetica",
+    "LATIN_BOLD_FONT": "Helvetica-Bold",
+    "AR_FONT": "Helvetica",
+}
+
+@dataclass(frozen=True)
+class Theme:
+    """
+    Immutable, precompiled theme.
+
+    Values use the ``config`` names (``theme.HEADING_COLOR``): colors are
+    ReportLab ``Color`` objects, sizes are points and font names are resolved
+    against the registered fonts. Keys the theme does not set fall back to the
+    ``config`` defaults, so a ``Theme`` can replace ``from ..config import *``.
+
+    Attributes:
+        name (str): Theme name ("" for the built-in defaults).
+        values (Mapping[str, Any]): Resolved ``UPPER_CASE`` settings.
+        raw (Mapping[str, Any]): The merged theme JSON (read-only view).
+    """
+    name: str
+    values: Mapping[str, Any] = field(repr=False)
+    raw: Mapping[str, Any] = field(repr=False, default_factory=lambda: MappingProxyType({}))
+
+    def __getattr__(self, key: str) -> Any:
+        # Only reached for names that are not dataclass fields.
+        values = self.__dict__.get("values") or {}
+        if key in values:
+            return values[key]
+        raise AttributeError(f"Theme has no setting {key!r}")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.values.get(key, default)
+
+def _resolve_fonts(values: Dict[str, Any]) -> None:
+    for key, fallback in _FONT_FALLBACKS.items():
+        if not has_font(values.get(key)):
+            values[key] = fallback
+
+def _build_theme(name: str, theme: dict) -> Theme:
+    values = dict(_CONFIG_DEFAULTS)
+    values.update(_compile_values(theme))
+    _resolve_fonts(values)
+    return Theme(name=name, values=MappingProxyType(values), raw=MappingProxyType(theme))
+
+_DEFAULT_THEME_OBJ: Optional[Theme] = None
+# name -> ((theme file mtime, font generation), Theme); missing themes are not cached
+_THEME_CACHE = LRUCache(64)
+
+def default_theme() -> Theme:
+    """Return the ``config`` defaults as a ``Theme`` (no theme file applied)."""
+    global _DEFAULT_THEME_OBJ
+    if _DEFAULT_THEME_OBJ is None:
+        _DEFAULT_THEME_OBJ = _build_theme("", {})
+    return _DEFAULT_THEME_OBJ
+
+def compile_theme(theme_name: Optional[str]) -> Theme:
+    """
+    Return the compiled ``Theme`` for ``theme_name``.
+
+    Built once per theme file and cached until the file's mtime changes (or
+    the set of available fonts does, since font names are resolved at compile
+    time). Names without a theme file are compiled on every call, so
+    arbitrary request values do not fill the cache.
+
+    Args:
+        theme_name (Optional[str]): Theme name (without ``.theme.json``).
+
+    Returns:
+        Theme: Shared, immutable theme object.
+    """
+    name = theme_name or ""
+    try:
+        mtime = (THEMES_DIR / f"{name}.theme.json").stat().st_mtime_ns if name else 0
+    except OSError:
+        return _build_theme(name, load_theme(theme_name))
+    version = (mtime, font_generation())
+    hit = _THEME_CACHE.get(name)
+    if hit is not None and hit[0] == version:
+        return hit[1]
+    compiled = _build_theme(name, load_theme(theme_name))
+    _THEME_CACHE.put(name, (version, compiled))
+    return compiled
+
+def theme_of(ctx: Optional[Mapping[str, Any]]) -> Theme:
+    """Return the compiled theme carried by a render context (``ctx["style"]``)."""
+    style = (ctx or {}).get("style")
+    return style if isinstance(style, Theme) else default_theme()
@@ -0,0 +1,65 @@
+# api/pdf_utils/timing.py
+"""
+Per-stage wall-clock timings for one request.
+
+``Timings`` is a small ordered ``{stage: seconds}`` recorder. It is plain
+data, so the builder can time its stages inside a render worker and send
+the dict back with the PDF. ``server_timing()`` formats the stages for an
+HTTP ``Server-Timing`` header.
+"""
+
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Mapping, Optional
+
+
+class Timings:
+    """Ordered stage durations in seconds (a repeated stage accumulates)."""
+
+    def __init__(self) -> None:
+        self.stages: Dict[str, float] = {}
+        self.pages: int = 0  # set by the builder
+
+    def add(self, stage: str, seconds: float) -> None:
+        self.stages[stage] = self.stages.get(stage, 0.0) + max(0.0, seconds)
+
+    def update(self, stages: Mapping[str, float]) -> None:
+        for stage, seconds in stages.items():
+            self.add(stage, seconds)
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, time.perf_counter() - start)
+
+    def total(self) -> float:
+        return sum(self.stages.values())
+
+    def server_timing(self, extra: Optional[Mapping[str, str]] = None) -> str:
+        """
+        Format as a ``Server-Timing`` header value (durations in milliseconds).
+
+        Args:
+            extra: Metrics without duration, as ``{name: description}``.
+        """
+        parts = [f"{name};dur={seconds * 1000:.1f}" for name, seconds in self.stages.items()]
+        parts.extend(f'{name};desc="{desc}"' for name, desc in (extra or {}).items())
+        return ", ".join(parts)
+
+
+@contextmanager
+def stage(timings: Optional[Timings], name: str) -> Iterator[None]:
+    """``timings.stage(name)``, or a no-op when ``timings`` is None."""
+    if timings is None:
+        yield
+        return
+    with timings.stage(name):
+        yield
+
+
+__all__ = ["Timings", "stage"]
@@ -0,0 +1,342 @@
+"""Process pool that renders resume PDFs outside the web worker.
+
+ReportLab's canvas code is pure Python and holds the GIL, so rendering on
+Starlette's thread pool caps PDF throughput at about one core per uvicorn
+worker. ``RenderPool`` hands each job to a pre-warmed worker process instead:
+fonts are registered and the block registry is imported once per process,
+before the first job arrives.
+
+Backpressure is explicit:
+- more than ``workers + queue_max`` jobs in flight -> ``RenderRejected`` (HTTP 429)
+- a job exceeding ``job_timeout`` or a broken pool -> ``RenderUnavailable`` (HTTP 503)
+
+Every job records how long it waited for a free worker; ``stats()`` exposes
+those queue-wait figures next to the current load.
+
+Configuration (environment):
+- RENDER_MODE        : ``process`` (default) or ``thread`` (one bounded thread
+                       pool; no pickling, but renders share the GIL)
+- RENDER_WORKERS     : workers (default: CPU count; 0 renders in-process)
+- RENDER_QUEUE_MAX   : jobs allowed to wait for a free worker (default: 2 x workers)
+- RENDER_JOB_TIMEOUT : seconds a job may take, queue wait included (default: 30)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from starlette.concurrency import run_in_threadpool
+
+log = logging.getLogger("resume.render")
+
+
+# ---------------------------------------------------------------------
+# Errors
+# ---------------------------------------------------------------------
+class RenderRejected(Exception):
+    """The render queue is full; the caller should retry later (HTTP 429)."""
+
+    def __init__(self, retry_after: int = 1):
+        super().__init__("Render queue is full")
+        self.retry_after = retry_after
+
+
+class RenderUnavailable(Exception):
+    """The job timed out or the worker pool is broken (HTTP 503)."""
+
+
+# ---------------------------------------------------------------------
+# Worker side
+# ---------------------------------------------------------------------
+def _warm_worker() -> None:
+    """Process initializer: register fonts and import every block module."""
+    from api.pdf_utils import blocks
+    from api.pdf_utils import fonts
+
+    blocks.load_all()  # also under LAZY_STARTUP: workers warm up off the request path
+    fonts.install_lazy_loader()
+    fonts.register_all_fonts()
+
+
+def _ping() -> bool:
+    """No-op job used to force worker processes to start."""
+    return True
+
+
+def _timed(fn: Callable[..., Any], args: Tuple[Any, ...], kwargs: Dict[str, Any]) -> Tuple[float, Any]:
+    """Run ``fn`` on the worker and report when it actually started."""
+    return time.time(), fn(*args, **kwargs)
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int(os.getenv(name, "").strip() or default)
+    except ValueError:
+        log.warning("Invalid %s=%r, using %s", name, os.getenv(name), default)
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.getenv(name, "").strip() or default)
+    except ValueError:
+        log.warning("Invalid %s=%r, using %s", name, os.getenv(name), default)
+        return default
+
+
+# ---------------------------------------------------------------------
+# Pool
+# ---------------------------------------------------------------------
+class RenderPool:
+    """Bounded, pre-warmed process pool for PDF rendering jobs."""
+
+    def __init__(self, workers: int, queue_max: int, job_timeout: float, mode: str = "process"):
+        self.workers = max(0, int(workers))
+        self.queue_max = max(0, int(queue_max))
+        self.job_timeout = float(job_timeout)
+        self.mode = "thread" if mode == "thread" else "process"
+        self._executor: Optional[Executor] = None
+        self._executor_lock = threading.Lock()
+        self._slots_lock = threading.Lock()
+        self._in_flight = 0
+        # queue-wait metrics (guarded by _slots_lock)
+        self._jobs = 0
+        self._rejected = 0
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._wait_last = 0.0
+
+    @classmethod
+    def from_env(cls) -> "RenderPool":
+        workers = _env_int("RENDER_WORKERS", os.cpu_count() or 1)
+        mode = (os.getenv("RENDER_MODE") or "process").strip().lower()
+        if mode not in ("process", "thread"):
+            log.warning("Invalid RENDER_MODE=%r, using process", mode)
+            mode = "process"
+        return cls(
+            workers=workers,
+            queue_max=_env_int("RENDER_QUEUE_MAX", 2 * max(1, workers)),
+            job_timeout=_env_float("RENDER_JOB_TIMEOUT", 30.0),
+            mode=mode,
+        )
+
+    @property
+    def enabled(self) -> bool:
+        return self.workers > 0
+
+    @property
+    def capacity(self) -> int:
+        """Maximum number of jobs running or waiting at the same time."""
+        return max(1, self.workers) + self.queue_max
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    # ---- lifecycle ----
+    def _get_executor(self) -> Executor:
+        with self._executor_lock:
+            if self._executor is None:
+                if self.mode == "thread":
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.workers,
+                        thread_name_prefix="resume-render",
+                        initializer=_warm_worker,
+                    )
+                else:
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        initializer=_warm_worker,
+                    )
+            return self._executor
+
+    def _discard_executor(self, executor: Executor) -> None:
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def start(self) -> None:
+        """Spawn and warm all worker processes ahead of the first request."""
+        if not self.enabled:
+            return
+        executor = self._get_executor()
+        for fut in [executor.submit(_ping) for _ in range(self.workers)]:
+            fut.result(timeout=max(self.job_timeout, 60.0))
+        log.info("Render pool ready: %s %s workers, queue=%s", self.workers, self.mode, self.queue_max)
+
+    def shutdown(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    # ---- admission ----
+    def _acquire(self) -> None:
+        with self._slots_lock:
+            if self._in_flight >= self.capacity:
+                self._rejected += 1
+                raise RenderRejected(retry_after=max(1, int(self.job_timeout // 4)))
+            self._in_flight += 1
+
+    def _release(self, *_: Any) -> None:
+        with self._slots_lock:
+            self._in_flight -= 1
+
+    # ---- metrics ----
+    def _record_wait(self, wait: float) -> None:
+        wait = max(0.0, wait)
+        with self._slots_lock:
+            self._jobs += 1
+            self._wait_total += wait
+            self._wait_last = wait
+            self._wait_max = max(self._wait_max, wait)
+
+    def stats(self) -> Dict[str, Any]:
+        """Current load and queue-wait figures (seconds) since start."""
+        with self._slots_lock:
+            return {
+                "mode": self.mode if self.enabled else "inline",
+                "workers": self.workers,
+                "capacity": self.capacity,
+                "in_flight": self._in_flight,
+                "jobs": self._jobs,
+                "rejected": self._rejected,
+                "queue_wait_avg": self._wait_total / self._jobs if self._jobs else 0.0,
+                "queue_wait_max": self._wait_max,
+                "queue_wait_last": self._wait_last,
+            }
+
+    # ---- jobs ----
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Future:
+        """
+        Queue ``fn(*args, **kwargs)`` on a worker process.
+
+        The slot is held until the job really finishes, so a timed-out job that
+        is still running keeps counting against the queue bound.
+
+        Raises:
+            RenderRejected: If the queue is full.
+            RenderUnavailable: If the pool is broken.
+        """
+        self._acquire()
+        executor = self._get_executor()
+        try:
+            fut = executor.submit(fn, *args, **kwargs)
+        except BrokenProcessPool as exc:
+            self._release()
+            self._discard_executor(executor)
+            raise RenderUnavailable("Render workers are restarting") from exc
+        except BaseException:
+            self._release()
+            raise
+        fut.add_done_callback(self._release)
+        return fut
+
+    def call(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """
+        Blocking counterpart of ``run`` for worker threads (e.g. ``api.jobs``).
+
+        Raises:
+            RenderRejected: If the queue is full.
+            RenderUnavailable: On timeout or when the pool is broken.
+        """
+        if not self.enabled:
+            self._acquire()
+            try:
+                self._record_wait(0.0)
+                return fn(*args, **kwargs)
+            finally:
+                self._release()
+
+        submitted = time.time()
+        fut = self.submit(_timed, fn, args, kwargs)
+        try:
+            started, result = fut.result(timeout=self.job_timeout)
+            self._record_wait(started - submitted)
+            return result
+        except FutureTimeoutError as exc:
+            fut.cancel()
+            raise RenderUnavailable(f"Render timed out after {self.job_timeout:g}s") from exc
+        except BrokenProcessPool as exc:
+            executor = self._executor
+            if executor is not None:
+                self._discard_executor(executor)
+            raise RenderUnavailable("Render worker crashed") from exc
+
+    async def run(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        """
+        Run a render job and await its result.
+
+        The event loop is never blocked: with ``workers == 0`` the job runs on
+        Starlette's thread pool (still bounded by ``capacity``, but without a
+        timeout).
+
+        Raises:
+            RenderRejected: If the queue is full.
+            RenderUnavailable: On timeout or when the pool is broken.
+        """
+        submitted = time.time()
+        if not self.enabled:
+            self._acquire()
+            try:
+                started, result = await run_in_threadpool(_timed, fn, args, kwargs)
+                self._record_wait(started - submitted)
+                return result
+            finally:
+                self._release()
+
+        fut = self.submit(_timed, fn, args, kwargs)
+        try:
+            started, result = await asyncio.wait_for(asyncio.wrap_future(fut), timeout=self.job_timeout)
+            self._record_wait(started - submitted)
+            return result
+        except asyncio.TimeoutError as exc:
+            fut.cancel()
+            raise RenderUnavailable(f"Render timed out after {self.job_timeout:g}s") from exc
+        except BrokenProcessPool as exc:
+            executor = self._executor
+            if executor is not None:
+                self._discard_executor(executor)
+            raise RenderUnavailable("Render worker crashed") from exc
+
+
+# ---------------------------------------------------------------------
+# Process-wide instance
+# ---------------------------------------------------------------------
+_POOL: Optional[RenderPool] = None
+_POOL_LOCK = threading.Lock()
+
+
+def get_render_pool() -> RenderPool:
+    """Return the process-wide pool, configured from the environment."""
+    global _POOL
+    with _POOL_LOCK:
+        if _POOL is None:
+            _POOL = RenderPool.from_env()
+        return _POOL
+
+
+def shutdown_render_pool() -> None:
+    global _POOL
+    with _POOL_LOCK:
+        pool, _POOL = _POOL, None
+    if pool is not None:
+        pool.shutdown()
+
+
+__all__ = [
+    "RenderPool",
+    "RenderRejected",
+    "RenderUnavailable",
+    "get_render_pool",
+    "shutdown_render_pool",
+]
@@ -1,15 +1,15 @@
 ﻿from __future__ import annotations
 
-import json
 import traceback
-from io import BytesIO
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import StreamingResponse
+from fastapi import APIRouter, HTTPException, Request, Response
 
+from api.pdf_cache import cache_key, etag_for, etag_matches, get_pdf_cache
+from api.render_pool import RenderRejected, RenderUnavailable, get_render_pool
 from api.schemas import GenerateFormRequest
+from ..pdf_utils.layout_plan import read_json_file
 from ..pdf_utils.resume import build_resume_pdf
 
 # Try importing block registry
@@ -42,8 +42,9 @@ def _prefer_fixed(path: Path) -> Path:
     return fixed if fixed.exists() else path
 
 def _safe_json_read(path: Path) -> Dict[str, Any]:
+    """Read JSON (cached by path + mtime; the result is shared, do not mutate)."""
     try:
-        return json.loads(path.read_text(encoding="utf-8"))
+        return read_json_file(path)
     except Exception as e:
         print(f"[Warn] Failed to read JSON: {path} -> {e}")
         return {}
@@ -197,15 +198,20 @@ def _apply_overrides_to_layout(merged_inline: Dict[str, Any]) -> Dict[str, Any]:
 # ------------------------------- route -------------------------------
 
 @router.post("/generate-form-simple")
-async def generate_form_simple(req: GenerateFormRequest):
+async def generate_form_simple(req: GenerateFormRequest, request: Request):
     """
     Generate a PDF resume from provided profile, theme, and layout configuration.
 
+    Repeated requests with identical inputs are served from the PDF cache, and
+    a matching ``If-None-Match`` short-circuits to ``304 Not Modified``.
+    Cache misses render on the bounded render pool, never on the event loop.
+
     Args:
         req (GenerateFormRequest): The request containing profile, layout, and theme info.
+        request (Request): Raw request (used for conditional headers).
 
     Returns:
-        StreamingResponse: The generated PDF resume.
+        Response: The generated PDF resume.
     """
     try:
         print(f"[REQ] theme='{req.theme_name}', layout='{req.layout_name}'")
@@ -232,16 +238,36 @@ async def generate_form_simple(req: GenerateFormRequest):
             "layout_inline": merged_inline,
         }
 
-        pdf_bytes = build_resume_pdf(data=data)
+        key = cache_key(data)
+        headers = {
+            "Content-Disposition": f'inline; filename="resume-{req.theme_name or "default"}.pdf"',
+            "Cache-Control": "private, no-cache",
+            "ETag": etag_for(key),
+        }
+        if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
 
-        return StreamingResponse(
-            BytesIO(pdf_bytes),
-            media_type="application/pdf",
-            headers={"Content-Disposition": f'inline; filename="resume-{req.theme_name or "default"}.pdf"'},
-        )
+        cache = get_pdf_cache()
+        pdf_bytes = cache.get(key)
+        headers["X-Cache"] = "HIT" if pdf_bytes is not None else "MISS"
+        if pdf_bytes is None:
+            pdf_bytes = await get_render_pool().run(build_resume_pdf, data=data)
+            cache.put(key, pdf_bytes)
+
+        # bytes go out as-is (Content-Length set); no BytesIO re-wrap
+        return Response(content=pdf_bytes, media_type="application/pdf", headers=headers)
 
     except HTTPException:
         raise
+    except RenderRejected as exc:
+        raise HTTPException(
+            status_code=429,
+            detail="Render queue is full, retry shortly.",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    except RenderUnavailable as exc:
+        print(f"[Warn] /generate-form-simple: {exc}")
+        raise HTTPException(status_code=503, detail=str(exc), headers={"Retry-After": "5"})
     except Exception as e:
         print("[Error] /generate-form-simple:")
         print(traceback.format_exc())
@@ -255,5 +281,6 @@ def healthz():
         "ok": True,
         "themes_dir": str(THEMES_DIR),
         "layouts_dir": str(LAYOUTS_DIR),
+        "render": get_render_pool().stats(),
     }
 
@@ -4,16 +4,18 @@ from typing import Any, List, Optional, Tuple, Annotated
 from pydantic import BaseModel, EmailStr, Field, HttpUrl, field_validator
 
 # -------------------------------------------------
-# General Limits
+# General Limits (shared with the admission checks)
 # -------------------------------------------------
-MAX_SUMMARY = 12
-MAX_SKILLS = 40
-MAX_LANGUAGES = 12
-MAX_PROJECTS = 40
-MAX_EDUCATION = 20
-MAX_STR_LEN = 2000
-MAX_TITLE_LEN = 120
-MAX_DESC_LEN = 600
+from api.schemas.limits import (
+    MAX_DESC_LEN,
+    MAX_EDUCATION,
+    MAX_LANGUAGES,
+    MAX_PROJECTS,
+    MAX_SKILLS,
+    MAX_STR_LEN,
+    MAX_SUMMARY,
+    MAX_TITLE_LEN,
+)
 
 # -------------------------------------------------
 # Registry-based dynamic lists and defaults
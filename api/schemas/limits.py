@@ -0,0 +1,62 @@
+# api/schemas/limits.py
+"""
+Size and complexity limits enforced by the admission checks in
+``api.admission``.
+
+Byte limits can be raised per deployment (environment, in MB):
+- REQUEST_MAX_MB       : single-render request bodies (default: 16)
+- BATCH_REQUEST_MAX_MB : /generate-batch and /jobs bodies (default: 64)
+- PHOTO_MAX_MB         : one headshot, decoded (default: 10)
+"""
+
+from __future__ import annotations
+
+import os
+
+# -------------------------------------------------
+# Profile sections (items per list)
+# -------------------------------------------------
+MAX_SUMMARY = 12
+MAX_SKILLS = 40
+MAX_LANGUAGES = 12
+MAX_PROJECTS = 40
+MAX_EDUCATION = 20
+
+# -------------------------------------------------
+# Text
+# -------------------------------------------------
+MAX_STR_LEN = 2000       # any string inside ``profile``
+MAX_TITLE_LEN = 120
+MAX_DESC_LEN = 600
+
+# -------------------------------------------------
+# Payload shape
+# -------------------------------------------------
+MAX_BLOCKS = 64          # blocks across a layout's flow
+MAX_LIST_ITEMS = 200     # any other JSON array
+MAX_NODES = 20000        # JSON values in one payload
+MAX_DEPTH = 32
+MAX_PHOTO_PIXELS = 40_000_000
+
+SECTION_LIMITS = {
+    "summary": MAX_SUMMARY,
+    "skills": MAX_SKILLS,
+    "languages": MAX_LANGUAGES,
+    "projects": MAX_PROJECTS,
+    "education": MAX_EDUCATION,
+}
+
+# Fields carrying base64 images: bounded by PHOTO_MAX_MB instead of MAX_STR_LEN
+IMAGE_FIELDS = frozenset({"photo_b64", "avatar_b64"})
+
+
+def _mb(name: str, default: int) -> int:
+    try:
+        return int(float(os.getenv(name, "").strip() or default) * 1024 * 1024)
+    except ValueError:
+        return default * 1024 * 1024
+
+
+MAX_REQUEST_BYTES = _mb("REQUEST_MAX_MB", 16)
+MAX_BATCH_REQUEST_BYTES = _mb("BATCH_REQUEST_MAX_MB", 64)
+MAX_PHOTO_BYTES = _mb("PHOTO_MAX_MB", 10)
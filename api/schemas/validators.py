@@ -1,19 +1,19 @@
 ﻿from __future__ import annotations
 import json
+from functools import lru_cache
 from pathlib import Path
-from jsonschema import validate, Draft202012Validator
 
 # Define paths to schema files
 BASE = Path(__file__).resolve().parents[2]  # Project root directory
 SCHEMAS = BASE / "schemas"
 
-# Load JSON schemas
-_layout_schema = json.loads((SCHEMAS / "layout.schema.json").read_text(encoding="utf-8"))
-_theme_schema = json.loads((SCHEMAS / "theme.schema.json").read_text(encoding="utf-8"))
+@lru_cache(maxsize=None)
+def _validator(name: str):
+    """Load and compile ``schemas/<name>.schema.json`` on first use."""
+    from jsonschema import Draft202012Validator
 
-# Create JSON schema validators
-_layout_validator = Draft202012Validator(schema=_layout_schema)
-_theme_validator = Draft202012Validator(schema=_theme_schema)
+    schema = json.loads((SCHEMAS / f"{name}.schema.json").read_text(encoding="utf-8"))
+    return Draft202012Validator(schema=schema)
 
 def assert_valid_layout(obj: dict) -> None:
     """
@@ -25,7 +25,7 @@ def assert_valid_layout(obj: dict) -> None:
     Raises:
         ValueError: If validation fails, includes detailed error messages.
     """
-    errors = sorted(_layout_validator.iter_errors(obj), key=lambda e: e.path)
+    errors = sorted(_validator("layout").iter_errors(obj), key=lambda e: e.path)
     if errors:
         msgs = [f"{'/'.join(map(str, e.path))}: {e.message}" for e in errors]
         raise ValueError("Layout JSON invalid:\n  - " + "\n  - ".join(msgs))
@@ -40,7 +40,7 @@ def assert_valid_theme(obj: dict) -> None:
     Raises:
         ValueError: If validation fails, includes detailed error messages.
     """
-    errors = sorted(_theme_validator.iter_errors(obj), key=lambda e: e.path)
+    errors = sorted(_validator("theme").iter_errors(obj), key=lambda e: e.path)
     if errors:
         msgs = [f"{'/'.join(map(str, e.path))}: {e.message}" for e in errors]
         raise ValueError("Theme JSON invalid:\n  - " + "\n  - ".join(msgs))
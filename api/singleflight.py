@@ -0,0 +1,111 @@
+"""Coalescing of identical in-flight calls ("singleflight").
+
+A double-clicked Generate button or the client's retry adapter sends the
+same render several times before the first one has finished, so the PDF
+cache cannot help yet. ``SingleFlight`` lets the first caller of a key run
+the work; callers arriving with the same key while it runs wait for that
+result instead of starting their own. Once the call finishes the key is
+released, so later callers start fresh (and usually hit the PDF cache).
+
+Results and exceptions are shared alike: if the leader's render is rejected
+(429) or fails, every waiter sees the same error.
+
+The in-flight entry is a ``concurrent.futures.Future``, so coroutines
+(``run``) and worker threads (``call``, e.g. ``api.jobs``) can join each
+other's flights.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Set, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Run at most one call per key at a time; concurrent callers share it."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        self._tasks: Set["asyncio.Task[None]"] = set()
+        self._leaders = 0
+        self._shared = 0
+
+    def _join(self, key: str) -> Tuple[Future, bool]:
+        """Return the flight for ``key`` and whether the caller must run it."""
+        with self._lock:
+            fut = self._calls.get(key)
+            if fut is not None:
+                self._shared += 1
+                return fut, False
+            fut = self._calls[key] = Future()
+            self._leaders += 1
+            return fut, True
+
+    def _land(self, key: str, fut: Future, result: Any = None, exc: BaseException = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is fut:
+                del self._calls[key]
+        if exc is not None:
+            fut.set_exception(exc)
+        else:
+            fut.set_result(result)
+
+    async def _lead(self, key: str, fut: Future, fn: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            result = await fn()
+        except BaseException as exc:
+            self._land(key, fut, exc=exc)
+            if not isinstance(exc, Exception):
+                raise
+        else:
+            self._land(key, fut, result)
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> Tuple[T, bool]:
+        """
+        Await ``fn()``, or the identical call already in flight for ``key``.
+
+        The leader's work runs in its own task, so a waiter that goes away
+        (client disconnect) does not cancel the render for the others.
+
+        Returns:
+            Tuple[T, bool]: The result and ``True`` if it came from another caller's flight.
+
+        Raises:
+            Exception: Whatever ``fn`` raised, for the leader and every waiter.
+        """
+        fut, leader = self._join(key)
+        if leader:
+            task = asyncio.ensure_future(self._lead(key, fut, fn))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+        return await asyncio.shield(asyncio.wrap_future(fut)), not leader
+
+    def call(self, key: str, fn: Callable[[], T]) -> Tuple[T, bool]:
+        """
+        Blocking counterpart of ``run`` for worker threads.
+
+        Returns:
+            Tuple[T, bool]: The result and ``True`` if it came from another caller's flight.
+        """
+        fut, leader = self._join(key)
+        if leader:
+            try:
+                result = fn()
+            except BaseException as exc:
+                self._land(key, fut, exc=exc)
+                raise
+            self._land(key, fut, result)
+        return fut.result(), not leader
+
+    def stats(self) -> Dict[str, int]:
+        """Calls in flight, calls that ran, and calls served by another caller's flight."""
+        with self._lock:
+            return {"in_flight": len(self._calls), "leaders": self._leaders, "shared": self._shared}
+
+
+__all__ = ["SingleFlight"]
@@ -30,10 +30,10 @@ st.title("Resume Builder Streamlit")
 try:
     from st_app.core.api_client import (
         api_generate_pdf,
+        api_generate_pdf_multipart,
         build_payload,
         normalize_theme_name,
         choose_layout_inline,
-        inject_headshot_into_layout,  
     )
     from st_app.core.schema import ensure_profile_schema
     from st_app.ui.sidebar import render_sidebar
@@ -96,17 +96,14 @@ col_gen, col_dbg = st.columns([2, 1])
 
 with col_gen:
     st.subheader("Generate PDF")
+    draft = st.checkbox(
+        "Quick draft (placeholder images, first pages only)",
+        key="chk_draft",
+    )
     if st.button("Generate", type="primary", key="btn_generate"):
         try:
             layout_inline = choose_layout_inline(settings.get("layout_file"))
 
-            try:
-                layout_inline = inject_headshot_into_layout(
-                    layout_inline, st.session_state.get("photo_bytes")
-                )
-            except Exception:
-                pass
-
             payload = build_payload(
                 theme_name=normalize_theme_name(
                     settings.get("theme_name") or "default.theme.json"
@@ -115,6 +112,7 @@ with col_gen:
                 rtl_mode=bool(settings.get("rtl_mode")),
                 profile=ensure_profile_schema(st.session_state.profile),
                 layout_inline=layout_inline,
+                quality="draft" if draft else "print",
             )
 
             st.write(
@@ -124,9 +122,19 @@ with col_gen:
                 settings.get("layout_file"),
             )
 
-            pdf_bytes = api_generate_pdf(
-                settings.get("base_url") or "http://127.0.0.1:8000", payload
-            )
+            base_url = settings.get("base_url") or "http://127.0.0.1:8000"
+            photo_bytes = st.session_state.get("photo_bytes")
+            if photo_bytes:
+                # Binary upload: no base64 inflation of the headshot
+                pdf_bytes = api_generate_pdf_multipart(
+                    base_url,
+                    payload,
+                    photo_bytes,
+                    photo_mime=st.session_state.get("photo_mime"),
+                    photo_name=st.session_state.get("photo_name"),
+                )
+            else:
+                pdf_bytes = api_generate_pdf(base_url, payload)
 
             b64 = base64.b64encode(pdf_bytes).decode("ascii")
             st.download_button(
@@ -152,6 +152,7 @@ def build_payload(
     rtl_mode: bool,
     profile: Dict[str, Any],
     layout_inline: Optional[Dict[str, Any]] = None,
+    quality: str = "print",
 ) -> Dict[str, Any]:
     data: Dict[str, Any] = {
         "theme_name": theme_name,
@@ -161,6 +162,8 @@ def build_payload(
     }
     if layout_inline:
         data["layout_inline"] = layout_inline
+    if quality and quality != "print":
+        data["quality"] = quality
     return data
 
 
@@ -198,6 +201,42 @@ def api_generate_pdf(base_url: str, payload: Dict[str, Any], *, stream: bool = F
         return b"".join(chunks)
 
 
+def api_generate_pdf_multipart(
+    base_url: str,
+    payload: Dict[str, Any],
+    photo_bytes: Optional[bytes],
+    *,
+    photo_mime: Optional[str] = None,
+    photo_name: Optional[str] = None,
+) -> bytes:
+    """
+    Call POST /generate-form-multipart and return PDF bytes.
+    The payload's profile/layout go as JSON parts; the photo is sent as-is
+    (binary part), so it is neither base64-inflated nor JSON-parsed server-side.
+    """
+    url = _join_url(base_url, "generate-form-multipart")
+    fields: Dict[str, str] = {
+        "profile": json.dumps(payload.get("profile") or {}, ensure_ascii=False),
+        "ui_lang": payload.get("ui_lang") or "en",
+        "rtl_mode": "true" if payload.get("rtl_mode") else "false",
+        "quality": payload.get("quality") or "print",
+    }
+    if payload.get("theme_name"):
+        fields["theme_name"] = payload["theme_name"]
+    if payload.get("layout_inline"):
+        fields["layout_inline"] = json.dumps(payload["layout_inline"], ensure_ascii=False)
+    elif payload.get("layout_name"):
+        fields["layout_name"] = payload["layout_name"]
+
+    files = None
+    if photo_bytes:
+        files = {"photo": (photo_name or "photo", photo_bytes, photo_mime or "application/octet-stream")}
+
+    r = _SESSION.post(url, data=fields, files=files, timeout=max(_HTTP_CFG.timeout, 60))
+    r.raise_for_status()
+    return r.content
+
+
 # ─────────────────────────────────────────────────────────────
 # Headshot injection
 # ─────────────────────────────────────────────────────────────
@@ -208,6 +247,7 @@ def inject_headshot_into_layout(
     """
     If a headshot is present, inject base64 into every 'avatar_circle' block.
     We leave 'photo_bytes' as None so the server can accept either b64 or bytes.
+    Prefer api_generate_pdf_multipart, which uploads the photo as binary.
     """
     if not layout_inline or not photo_bytes:
         return layout_inline
@@ -78,3 +78,258 @@ def test_generate_pdf_with_minimal_blocks_returns_pdf(tmp_path):
     out = tmp_path / "api_print.pdf"
     out.write_bytes(res.content)
     assert out.exists() and out.stat().st_size > 1500
+
+
+@pytest.mark.print
+def test_generate_batch_streams_zip_of_pdfs():
+    import io
+    import zipfile
+
+    payload = {
+        "theme_name": "aqua-card",
+        "layout_inline": {"flow": [{"column": "main", "blocks": ["header_name", "projects"]}]},
+        "items": [
+            {"profile": {"header": {"name": "Batch One", "title": "Dev"}}},
+            {"profile": {"header": {"name": "Batch Two"}}, "layout_name": "one-column.layout.json"},
+            {"profile": {"header": {"name": "Batch Three"}}, "filename": "third.pdf"},
+        ],
+    }
+
+    res = client.post("/generate-batch", json=payload)
+    assert res.status_code == 200, res.text
+    assert res.headers["content-type"] == "application/zip"
+
+    with zipfile.ZipFile(io.BytesIO(res.content)) as zf:
+        names = zf.namelist()
+        assert names == ["001-Batch-One.pdf", "002-Batch-Two.pdf", "003-third.pdf"]
+        for name in names:
+            assert zf.read(name).startswith(b"%PDF")
+
+
+def test_generate_batch_rejects_unknown_layout():
+    payload = {"items": [{"profile": {}, "layout_name": "missing.layout.json"}]}
+    assert client.post("/generate-batch", json=payload).status_code == 404
+
+
+def test_jobs_render_in_background_and_return_result():
+    import time
+
+    payload = {
+        "theme_name": "aqua-card",
+        "profile": {"header": {"name": "Job Person", "title": "Dev"}},
+        "layout_inline": {"flow": [{"column": "main", "blocks": ["header_name"]}]},
+    }
+    res = client.post("/jobs", json=payload)
+    assert res.status_code == 202, res.text
+    job = res.json()
+    assert job["status"] in ("queued", "running", "done")
+
+    for _ in range(300):
+        status = client.get(job["status_url"]).json()["status"]
+        if status in ("done", "failed"):
+            break
+        time.sleep(0.1)
+    assert status == "done"
+
+    result = client.get(job["result_url"])
+    assert result.status_code == 200
+    assert result.content.startswith(b"%PDF")
+    assert client.get("/jobs/does-not-exist").status_code == 404
+
+
+def test_generate_form_multipart_takes_binary_headshot():
+    import io
+    import json
+
+    from PIL import Image
+
+    from api.main import _attach_headshot
+
+    buf = io.BytesIO()
+    Image.new("RGB", (1200, 1200), (90, 140, 200)).save(buf, format="JPEG")
+    photo = buf.getvalue()
+
+    fields = {
+        "theme_name": "aqua-card",
+        "profile": json.dumps({"header": {"name": "Multipart Person", "title": "Dev"}}),
+        "layout_inline": json.dumps({"flow": [{"column": "main", "blocks": ["header_name", "avatar_circle"]}]}),
+    }
+    plain = client.post("/generate-form-multipart", data=fields)
+    res = client.post("/generate-form-multipart", data=fields, files={"photo": ("me.jpg", photo, "image/jpeg")})
+    assert plain.status_code == 200, plain.text
+    assert res.status_code == 200, res.text
+    assert res.content.startswith(b"%PDF")
+    assert res.headers["etag"] != plain.headers["etag"]  # the photo is part of the cache key
+
+    layout = {"flow": [{"blocks": [{"block_id": "avatar_circle", "data": {"photo_b64": "eA==", "max_d_mm": 30}}]}]}
+    _attach_headshot(layout, photo)
+    block_data = layout["flow"][0]["blocks"][0]["data"]
+    assert "photo_b64" not in block_data
+    assert block_data["photo_bytes"].startswith(b"\xff\xd8")
+    assert len(block_data["photo_bytes"]) < len(photo)
+    assert layout["overrides"]["avatar_circle"]["data"]["photo_bytes"].startswith(b"\xff\xd8")
+
+    bad = client.post("/generate-form-multipart", data={"profile": "{not json"})
+    assert bad.status_code == 422
+
+
+def test_oversized_requests_are_rejected_before_parsing():
+    from api.schemas.limits import MAX_BLOCKS, MAX_PROJECTS, MAX_REQUEST_BYTES, MAX_STR_LEN
+
+    def post(payload):
+        return client.post("/generate-form-simple", json=payload)
+
+    assert post({"profile": {"projects": [["p", "d", None]] * (MAX_PROJECTS + 1)}}).status_code == 413
+    assert post({"profile": {"summary": ["x" * (MAX_STR_LEN + 1)]}}).status_code == 413
+    # the string limit covers profile text only, not layout/override strings
+    from api.admission import check_payload
+
+    check_payload({"layout_inline": {"overrides": {"text_section": {"data": {"value": "x" * (MAX_STR_LEN + 1)}}}}})
+    with pytest.raises(Exception) as exc:
+        check_payload({"profile": {"header": {"name": "x" * (MAX_STR_LEN + 1)}}})
+    assert exc.value.status_code == 413
+    assert post({"layout_inline": {"flow": [{"blocks": ["header_name"] * (MAX_BLOCKS + 1)}]}}).status_code == 413
+
+    declared = client.post(
+        "/generate-form-simple",
+        content=b"{}",
+        headers={"content-type": "application/json", "content-length": str(MAX_REQUEST_BYTES + 1)},
+    )
+    assert declared.status_code == 413
+
+    def chunks():  # no Content-Length: counted while streaming
+        yield b'{"profile": {"x": "'
+        for _ in range(MAX_REQUEST_BYTES // (1024 * 1024) + 1):
+            yield b"a" * (1024 * 1024)
+        yield b'"}}'
+
+    streamed = client.post("/generate-form-simple", content=chunks(), headers={"content-type": "application/json"})
+    assert streamed.status_code == 413
+    assert "too large" in streamed.json()["detail"]
+
+
+def test_generate_reports_server_timing_and_metrics():
+    payload = {
+        "theme_name": "aqua-card",
+        "profile": {"header": {"name": "Timing Person", "title": "Dev"}},
+        "layout_inline": {"flow": [{"column": "main", "blocks": ["header_name"]}]},
+    }
+    miss = client.post("/generate-form-simple", json=payload)
+    assert miss.status_code == 200, miss.text
+    timing = miss.headers["server-timing"]
+    for stage in ("validate", "schema", "overrides", "headshots", "layout", "theme", "render", "serialize"):
+        assert f"{stage};dur=" in timing
+    assert 'cache;desc="miss"' in timing
+
+    hit = client.post("/generate-form-simple", json=payload)
+    assert 'cache;desc="hit"' in hit.headers["server-timing"]
+    assert "render;dur=" not in hit.headers["server-timing"]
+
+    text = client.get("/metrics").text
+    assert 'resume_stage_seconds_bucket{stage="render",le="+Inf"}' in text
+    assert 'resume_requests_total{cache="hit"}' in text
+    assert "resume_pdf_pages_count" in text
+    assert "resume_render_capacity" in text
+
+
+def test_generate_draft_quality_returns_separately_cached_preview():
+    payload = {
+        "theme_name": "aqua-card",
+        "profile": {"header": {"name": "Draft Person", "title": "Dev"}},
+        "layout_inline": {"flow": [{"column": "main", "blocks": ["header_name"]}]},
+    }
+    printed = client.post("/generate-form-simple", json=payload)
+    draft = client.post("/generate-form-simple", json={**payload, "quality": "draft"})
+    assert printed.status_code == 200, printed.text
+    assert draft.status_code == 200, draft.text
+    assert draft.content.startswith(b"%PDF")
+    assert draft.headers["etag"] != printed.headers["etag"]
+
+    assert client.post("/generate-form-simple", json={**payload, "quality": "poster"}).status_code == 422
+
+
+def test_render_data_is_built_off_the_event_loop(monkeypatch):
+    import asyncio
+
+    import api.main as main
+
+    loops = []
+    real = main._build_render_data
+
+    def spy(*args, **kwargs):
+        try:
+            asyncio.get_running_loop()
+            loops.append(True)
+        except RuntimeError:
+            loops.append(False)
+        return real(*args, **kwargs)
+
+    monkeypatch.setattr(main, "_build_render_data", spy)
+    item = {"profile": {"header": {"name": "Thread Person"}}, "layout_inline": {"flow": [{"blocks": ["header_name"]}]}}
+    assert client.post("/generate-form-simple", json=item).status_code == 200
+    assert client.post("/generate-batch", json={"items": [item]}).status_code == 200
+    assert loops == [False, False]  # neither ran on the event loop thread
+
+
+def test_named_layouts_are_shared_and_never_modified_by_requests():
+    import io
+    import json
+
+    from PIL import Image
+
+    import api.main as main
+
+    buf = io.BytesIO()
+    Image.new("RGB", (64, 64), (90, 140, 200)).save(buf, format="PNG")
+
+    shared = main._safe_read_layout_by_name("two-column.layout.json")
+    before = json.dumps(shared, sort_keys=True)
+    args = main.GeneratePayload.model_validate({
+        "profile": {"header": {"name": "Shared Layout"}, "summary": "Hello"},
+        "layout_name": "two-column.layout.json",
+    })
+    data = main._build_render_data(args, shared)
+    main._attach_headshot(data["layout_inline"], buf.getvalue())
+
+    assert main._safe_read_layout_by_name("two-column.layout.json") is shared
+    assert json.dumps(shared, sort_keys=True) == before
+    assert data["layout_inline"]["overrides"]["avatar_circle"]["data"]["photo_bytes"]
+    assert data["layout_inline"]["flow"] is shared["flow"]  # untouched parts stay shared
+
+
+def test_image_pixel_limits_apply_to_uploads_and_base64():
+    import base64
+    import struct
+    import zlib
+
+    from fastapi import HTTPException
+
+    from api.admission import check_payload, check_photo
+
+    def chunk(kind, body):
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", zlib.crc32(kind + body))
+
+    def png_header(w, h):  # no pixel data: the size is all the checks read
+        ihdr = struct.pack(">IIBBBBB", w, h, 8, 2, 0, 0, 0)
+        return b"\x89PNG\r\n\x1a\n" + chunk(b"IHDR", ihdr) + chunk(b"IEND", b"")
+
+    def status(fn, *args):
+        with pytest.raises(HTTPException) as exc:
+            fn(*args)
+        return exc.value.status_code
+
+    big = png_header(8000, 6000)  # 48 MP, over the 40 MP limit
+    bomb = png_header(20000, 20000)  # PIL's own decompression-bomb error
+    assert status(check_photo, big) == 413
+    assert status(check_photo, bomb) == 413
+    assert status(check_photo, b"not an image") == 422
+    check_photo(png_header(600, 600))
+
+    def avatar(data):
+        b64 = base64.b64encode(data).decode("ascii")
+        return {"layout_inline": {"flow": [{"blocks": [{"block_id": "avatar_circle", "data": {"photo_b64": b64}}]}]}}
+
+    assert status(check_payload, avatar(big)) == 413
+    assert status(check_payload, avatar(bomb)) == 413
+    check_payload(avatar(png_header(600, 600)))
+    check_payload(avatar(b"not an image"))  # left to the avatar block, which skips it
@@ -1,5 +1,4 @@
 import os
-from pathlib import Path
 import pytest
 
 # بلوكات قد تعتمد على أصول/صور أو زخارف — نتخطّاها في اختبار الـsmoke
@@ -11,7 +10,7 @@ SKIP_BLOCKS = {
 }
 
 @pytest.mark.view
-def test_block_smoke():
+def test_block_smoke(tmp_path):
     """
     يبني PDF بسيط يحتوي بلوك واحد فقط.
     ملاحظة مهمة: عناصر blocks يجب أن تكون سلاسل نصية (أسماء البلوكات)،
@@ -48,7 +47,6 @@ def test_block_smoke():
     }
 
     pdf = build_resume_pdf(data=payload)
-    out = Path("out"); out.mkdir(exist_ok=True)
-    p = out / f"smoke_{block_id}.pdf"
+    p = tmp_path / f"smoke_{block_id}.pdf"
     p.write_bytes(pdf)
     assert p.exists() and p.stat().st_size > 1000, "PDF too small or not written"
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import io
+
+import pytest
+from PIL import Image
+from reportlab.lib.pagesizes import A4
+
+from api.pdf_utils.draft import DraftCanvas, PageLimitReached, is_draft, new_canvas
+
+
+def _jpeg() -> bytes:
+    buf = io.BytesIO()
+    Image.new("RGB", (600, 600), (90, 140, 200)).save(buf, format="JPEG")
+    return buf.getvalue()
+
+
+def test_draft_canvas_skips_images_links_and_compression():
+    from reportlab.lib.utils import ImageReader
+
+    c = new_canvas(A4, "draft")
+    assert is_draft(c) and not is_draft(new_canvas(A4, "print"))
+    c.drawImage(ImageReader(io.BytesIO(_jpeg())), 40, 700, 80, 80)
+    c.linkURL("https://example.com", (40, 600, 200, 620))
+    c.drawString(40, 500, "Draft preview")
+    c.showPage()
+    pdf = c.getpdfdata()
+
+    assert b"/Subtype /Image" not in pdf
+    assert b"/Annot" not in pdf
+    assert b"(Draft preview) Tj" in pdf  # page stream left uncompressed
+
+
+def test_draft_canvas_stops_after_max_pages():
+    c = DraftCanvas(None, pagesize=A4, max_pages=2)
+    with pytest.raises(PageLimitReached):
+        for i in range(5):
+            c.drawString(40, 800, f"page {i + 1}")
+            c.showPage()
+    c.drawString(40, 800, "never shown")
+    pdf = c.getpdfdata()
+
+    assert b"/Count 2" in pdf
+    assert b"never shown" not in pdf and b"page 3" not in pdf
+
+
+def test_blocks_engine_draws_headshot_placeholder_in_draft():
+    from api.pdf_utils.resume import build_resume_pdf
+
+    data = {
+        "profile": {"header": {"name": "Draft Person", "title": "Dev"}},
+        "layout_inline": {
+            "flow": [{"column": "main", "blocks": [
+                "header_name",
+                {"block_id": "avatar_circle", "data": {"photo_bytes": _jpeg()}},
+            ]}],
+        },
+    }
+    printed = build_resume_pdf(data=dict(data))
+    draft = build_resume_pdf(data=dict(data), quality="draft")
+
+    assert b"/Subtype /Image" in printed
+    assert b"/Subtype /Image" not in draft
+    assert draft.startswith(b"%PDF")
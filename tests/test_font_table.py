@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+from api.pdf_utils.font_table import font_table
+
+
+def test_font_table_is_resolved_once_per_theme():
+    table = font_table("DejaVuSans", "DejaVuSans-Bold", None)
+
+    assert font_table("DejaVuSans", "DejaVuSans-Bold", None) is table
+    assert (table.base, table.bold, table.heading) == ("DejaVuSans", "DejaVuSans-Bold", "DejaVuSans-Bold")
+    assert table.arabic == "NotoNaskhArabic"
+    assert table.for_line(False) == table.latin == "DejaVuSans"
+    assert table.cjk == "STSong-Light"
+
+
+def test_unknown_fonts_fall_back_without_raising():
+    table = font_table("NoSuchFont", "NoSuchFont-Bold")
+    assert table.base == "NotoNaskhArabic"        # historical builder fallback
+    assert table.resolve("AlsoMissing") == "NotoNaskhArabic"
+    assert table.resolve("Helvetica") == "Helvetica"
+
+
+def test_mixed_script_text_is_split_into_covered_runs():
+    from api.pdf_utils.fonts import covers
+
+    table = font_table("Helvetica", "Helvetica-Bold")
+    runs = table.runs("Café 你好 done", "Helvetica")
+
+    assert "".join(run for _, run in runs) == "Café 你好 done"
+    assert [font for font, _ in runs] == ["Helvetica", table.cjk, "Helvetica"]
+    assert not covers("Helvetica", "你") and covers("DejaVuSans", "é")
+    assert table.runs("", "Helvetica") == []
@@ -0,0 +1,58 @@
+from __future__ import annotations
+
+from api.pdf_utils import fonts
+
+
+def test_font_cache_round_trip_matches_parsed_font(tmp_path, monkeypatch):
+    monkeypatch.setenv("FONT_CACHE_DIR", str(tmp_path))
+    path = fonts._font_families()["DejaVuSans"]["regular"]
+
+    parsed = fonts._load_ttfont("DejaVuSans", path)      # parses + writes the cache
+    assert len(list(tmp_path.glob("DejaVuSans-*.pickle"))) == 1
+    cached = fonts._load_ttfont("DejaVuSans", path)      # unpickled
+
+    text = "Résumé 123"
+    assert cached.stringWidth(text, 11) == parsed.stringWidth(text, 11)
+    assert cached.face.ascent == parsed.face.ascent
+
+
+def test_font_cache_ignores_tampered_or_shared_files(tmp_path, monkeypatch, caplog):
+    import os
+
+    monkeypatch.setenv("FONT_CACHE_DIR", str(tmp_path / "fonts"))
+    path = fonts._font_families()["DejaVuSans"]["regular"]
+    fonts._load_ttfont("DejaVuSans", path)
+    cache_dir = tmp_path / "fonts"
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+    cache_file, = cache_dir.glob("DejaVuSans-*.pickle")
+
+    blob = bytearray(cache_file.read_bytes())
+    blob[-1] ^= 0xFF
+    cache_file.write_bytes(bytes(blob))
+    assert fonts._read_cache(cache_file) is None
+    assert "checksum mismatch" in caplog.text
+
+    fonts._load_ttfont("DejaVuSans", path)  # re-parsed and rewritten
+    assert fonts._read_cache(cache_file) is not None
+    os.chmod(cache_file, 0o666)
+    assert fonts._read_cache(cache_file) is None
+
+    os.chmod(cache_dir, 0o777)  # ours: tightened again before use
+    assert fonts._private_cache_dir(cache_dir) == cache_dir
+    assert cache_dir.stat().st_mode & 0o777 == 0o700
+
+
+def test_fonts_load_lazily_and_idempotently():
+    from reportlab.pdfgen.canvas import Canvas
+
+    fonts.install_lazy_loader()
+    fonts.install_lazy_loader()  # idempotent
+    c = Canvas(None)
+    c.setFont("DejaVuSans-Bold", 10)   # resolved through the lazy loader
+    assert "DejaVuSans-Bold" in fonts.REGISTERED
+    assert fonts.has_font("DejaVuSans") and not fonts.has_font("NoSuchFont")
+
+    fonts.register_all_fonts()
+    before = set(fonts.REGISTERED)
+    fonts.register_all_fonts()
+    assert fonts.REGISTERED == before
@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+from io import BytesIO
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+
+from api.pdf_utils.forms import clear_form_cache, draw_cached_form
+
+
+def _document(draws: list, pages: int = 3) -> bytes:
+    buf = BytesIO()
+    c = Canvas(buf, pagesize=A4)
+    c.setPageCompression(0)
+
+    def _draw(c):
+        draws.append(1)
+        c.setFillColorRGB(0.9, 0.9, 0.9)
+        c.rect(0, 0, A4[0], A4[1], stroke=0, fill=1)
+
+    for _ in range(pages):
+        draw_cached_form(c, "test_bg", (A4, "grey"), _draw)
+        c.drawString(72, 72, "body")
+        c.showPage()
+    c.save()
+    return buf.getvalue()
+
+
+def test_form_embedded_once_and_reused_across_documents():
+    clear_form_cache()
+    draws: list = []
+
+    first = _document(draws)
+    second = _document(draws)
+
+    assert len(draws) == 1  # recorded once per process
+    for pdf in (first, second):
+        assert pdf.count(b"/Subtype /Form") == 1  # embedded once per document
+        assert pdf.count(b" Do") == 3  # referenced on every page
+
+
+def test_builder_pdf_uses_page_background_form():
+    from api.pdf_utils.builder import build_resume_pdf
+
+    pdf = build_resume_pdf(data={"profile": {"header": {"name": "Form Test"}}})
+    assert pdf.count(b"/Subtype /Form") == 1
+
+
+def test_moving_blocks_share_one_form_wherever_they_are_drawn():
+    from api.pdf_utils.blocks.base import Frame
+    from api.pdf_utils.blocks.decor_curve import DecorCurveBlock
+    from api.pdf_utils.blocks.header_bar import HeaderBarBlock
+    from api.pdf_utils.forms import form_cache_stats
+
+    clear_form_cache()
+    buf = BytesIO()
+    c = Canvas(buf, pagesize=A4)
+    c.setPageCompression(0)
+    for i, y in enumerate((800, 600, 400)):
+        HeaderBarBlock().render(c, Frame(x=50, y=y, w=400), {"title": f"Person {i}"}, {})
+        DecorCurveBlock().render(c, Frame(x=50, y=y - 60, w=400), {}, {})
+    c.save()
+    pdf = buf.getvalue()
+
+    assert form_cache_stats()["entries"] == 2  # one per block kind, not per title or position
+    assert pdf.count(b"/Subtype /Form") == 2
+    assert pdf.count(b" Do") == 6
+    for i in range(3):
+        assert f"(Person {i}) Tj".encode() in pdf
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import base64
+from io import BytesIO
+
+from PIL import Image
+
+from api.pdf_utils import headshot
+from api.pdf_utils.headshot import headshot_from_b64, normalize_headshot, target_pixels
+
+
+def _image(size=(2400, 1800), mode="RGB", fmt="JPEG", color=(200, 120, 40)) -> bytes:
+    buf = BytesIO()
+    Image.new(mode, size, color).save(buf, format=fmt)
+    return buf.getvalue()
+
+
+def test_large_photo_is_downscaled_to_print_size_jpeg():
+    px = target_pixels(42, dpi=300)
+    out = normalize_headshot(_image(fmt="PNG"), 42, dpi=300)
+
+    with Image.open(BytesIO(out)) as img:
+        assert img.format == "JPEG"
+        assert max(img.size) == px
+        assert img.size == (px, round(px * 1800 / 2400))
+
+
+def test_normalized_output_is_stable_and_cached():
+    headshot.clear_headshot_cache()
+    photo = _image()
+    once = normalize_headshot(photo, 42, dpi=150)
+    assert normalize_headshot(photo, 42, dpi=150) is once
+    assert normalize_headshot(once, 42, dpi=150) is once
+    assert headshot.headshot_cache_stats()["hits"] >= 2
+
+
+def test_transparent_photo_stays_png():
+    out = normalize_headshot(_image(mode="RGBA", fmt="PNG", color=(0, 0, 0, 0)), 42, dpi=150)
+    assert Image.open(BytesIO(out)).format == "PNG"
+
+
+def test_b64_headshots():
+    b64 = base64.b64encode(_image()).decode("ascii")
+    out = headshot_from_b64(b64, 42, dpi=150)
+    assert Image.open(BytesIO(out)).size[0] == target_pixels(42, dpi=150)
+    assert headshot_from_b64("not base64!", 42) is None
+    assert normalize_headshot(b"not an image") == b"not an image"
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen.canvas import Canvas
+
+from api.pdf_utils.icons import ICON_PATHS, draw_heading_with_icon, draw_icon_line, icon_image
+
+
+def test_icons_are_decoded_once_per_process():
+    icon = ICON_PATHS["email"]
+    assert icon_image(icon) is icon_image(icon)
+    assert icon_image(Path("/nonexistent/icon.png")) is None
+    assert icon_image(None) is None
+
+
+def test_each_icon_is_embedded_once_per_document():
+    c = Canvas(None, pagesize=A4)
+    y = 800
+    for _ in range(10):
+        y = draw_heading_with_icon(c, 40, y, "Skills", ICON_PATHS["key_skills"])
+        y = draw_icon_line(c, 40, y, "me@example.com", icon=ICON_PATHS["email"])
+    c.showPage()
+    pdf = c.getpdfdata()
+
+    # two icons, each an RGB image plus its alpha soft mask
+    assert pdf.count(b"/Subtype /Image") == 4
+
+
+def test_replaced_icon_file_is_decoded_again(tmp_path):
+    import os
+
+    from PIL import Image
+
+    icon = tmp_path / "custom.png"
+    Image.new("RGB", (8, 8), (255, 0, 0)).save(icon)
+    red = icon_image(icon)
+    assert icon_image(icon) is red
+
+    Image.new("RGB", (8, 8), (0, 0, 255)).save(icon)
+    st = os.stat(icon)
+    os.utime(icon, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    blue = icon_image(icon)
+    assert blue is not red
+    assert blue.getRGBData()[:3] == b"\x00\x00\xff"
+
+    icon.unlink()
+    assert icon_image(icon) is None
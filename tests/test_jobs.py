@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+import time
+
+from api.jobs import DONE, JobQueue, spool_file
+
+
+def _wait(queue: JobQueue, job_id: str):
+    for _ in range(200):
+        job = queue.get(job_id)
+        if job.finished:
+            return job
+        time.sleep(0.01)
+    raise AssertionError("job did not finish")
+
+
+def test_large_results_are_spooled_to_disk_and_closed_on_expiry():
+    queue = JobQueue(workers=1, queue_max=10, result_ttl=0.2, spool_bytes=1024)
+    payload = bytes(range(256)) * 64  # 16 KB
+
+    def zip_like():
+        fh = spool_file(queue.spool_bytes)
+        fh.write(payload)
+        return fh
+
+    small = _wait(queue, queue.submit(lambda: b"%PDF-small", kind="pdf", media_type="application/pdf", filename="a.pdf").id)
+    large = _wait(queue, queue.submit(zip_like, kind="batch", media_type="application/zip", filename="b.zip").id)
+    try:
+        assert small.status == large.status == DONE
+        assert not small.result._rolled  # under spool_bytes: kept in memory
+        assert large.result._rolled  # over spool_bytes: on disk
+        assert large.to_dict()["result_bytes"] == len(payload)
+        # concurrent readers each get the whole result
+        first, second = large.iter_result(chunk_size=4096), large.iter_result(chunk_size=4096)
+        assert b"".join(a + b for a, b in zip(first, second)) == b"".join(p + p for p in
+            (payload[i:i + 4096] for i in range(0, len(payload), 4096)))
+
+        time.sleep(0.3)
+        assert queue.get(large.id) is None
+        assert large.result.closed
+    finally:
+        queue.shutdown()
@@ -0,0 +1,176 @@
+from __future__ import annotations
+
+import json
+from io import BytesIO
+
+import pytest
+from reportlab.lib.pagesizes import A4
+from reportlab.lib.units import mm
+from reportlab.pdfgen.canvas import Canvas
+
+from api.pdf_utils.blocks.base import Frame
+from api.pdf_utils.blocks.registry import register
+from api.pdf_utils.engine import LayoutEngine, PageSpec
+
+
+class _CountingCanvas(Canvas):
+    """Canvas that counts the rectangles actually emitted."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.rects = 0
+
+    def rect(self, *args, **kwargs):
+        self.rects += 1
+        return super().rect(*args, **kwargs)
+
+
+class _CountingBlock:
+    """Draws a fixed-height box."""
+
+    BLOCK_ID = "test_counting_box"
+
+    def render(self, c, frame: Frame, data: dict, ctx) -> float:
+        h = float(data.get("h", 100))
+        c.rect(frame.x, frame.y - h, frame.w, h, stroke=1, fill=0)
+        return frame.y - h
+
+
+class _MeasuredBlock(_CountingBlock):
+    BLOCK_ID = "test_measured_box"
+
+    def measure(self, frame: Frame, data: dict, ctx) -> float:
+        return float(data.get("h", 100))
+
+
+def _engine():
+    c = _CountingCanvas(BytesIO(), pagesize=A4)
+    margins = {"top": 20 * mm, "right": 20 * mm, "bottom": 20 * mm, "left": 20 * mm}
+    page = PageSpec(width=A4[0], height=A4[1], margins=margins)
+    return c, LayoutEngine(c, page, {"main": (20 * mm, 170 * mm)}, {}, "en", False)
+
+
+@pytest.mark.parametrize("block_cls", [_CountingBlock, _MeasuredBlock])
+def test_overflowing_block_is_drawn_once_on_next_page(block_cls):
+    block = register(block_cls())
+    c, engine = _engine()
+    flow = [{"column": "main", "blocks": [block.BLOCK_ID] * 3}]
+
+    engine.render_flow(flow, ready={block.BLOCK_ID: {"h": 300}})
+
+    # 3 x 300pt on a ~728pt content area: two fit, the third moves to page 2.
+    assert c.rects == 3
+    assert c.getPageNumber() == 2
+
+
+def test_compiled_layout_is_cached_and_resolves_blocks():
+    from api.pdf_utils.layout_plan import compile_layout
+
+    layout = {
+        "columns": [{"id": "left", "width": "40%"}, {"id": "right", "width": "60%"}],
+        "flow": [{"column": "left", "blocks": ["pprojects", {"block_id": "text_section:summary"}]}],
+        "overrides": {"projects": {"data": {"title": "Work"}}},
+    }
+    plan = compile_layout(layout)
+
+    assert [(b.base_id, b.suffix) for b in plan.blocks] == [("projects", None), ("text_section", "summary")]
+    assert plan.blocks[0].block is not None
+    assert plan.blocks[0].conf_data == {"title": "Work"}
+    assert set(plan.columns) == {"left", "right"}
+    assert plan.page["size"] == "A4"
+    assert compile_layout({k: v for k, v in layout.items() if k != "overrides"}) is compile_layout(
+        json.loads(json.dumps({k: v for k, v in layout.items() if k != "overrides"}))
+    )
+
+
+def test_compiled_layout_binds_request_data_to_the_cached_structure():
+    from api.pdf_utils import layout_plan
+
+    layout_plan.clear_layout_caches()
+
+    def layout(title, photo):
+        return {
+            "flow": [{"column": "main", "blocks": [{"block_id": "avatar_circle", "data": {"photo_bytes": photo}}]}],
+            "overrides": {"avatar_circle": {"frame": {"x": 10}, "data": {"title": title}}},
+        }
+
+    first = layout_plan.compile_layout(layout("A", b"\x89PNG" * 1000))
+    second = layout_plan.compile_layout(layout("B", b"GIF89a"))
+
+    assert layout_plan._INLINE_CACHE.stats()["entries"] == 1
+    assert first.blocks[0].block is second.blocks[0].block
+    assert first.blocks[0].conf_frame == second.blocks[0].conf_frame == {"x": 10}
+    assert first.blocks[0].conf_data == {"photo_bytes": b"\x89PNG" * 1000, "title": "A"}
+    assert second.blocks[0].conf_data == {"photo_bytes": b"GIF89a", "title": "B"}
+    # Only the structure is cached: no request data in the stored plan.
+    (cached, size), = layout_plan._INLINE_CACHE._data.values()
+    assert cached.blocks[0].conf_data is None and size < 200
+
+
+def test_modern_build_maps_profile_with_layout_map_rules(monkeypatch):
+    from api.pdf_utils import resume
+
+    calls = []
+    real_mapper = resume.map_profile_to_ready
+
+    def spy(profile, **kwargs):
+        calls.append(kwargs)
+        return real_mapper(profile, **kwargs)
+
+    monkeypatch.setattr(resume, "map_profile_to_ready", spy)
+    rules = {"text_section": {"from": "summary", "fn": "text"}}
+    pdf = resume.build_resume_pdf(data={
+        "profile": {"header": {"name": "Mapper Person"}, "summary": ["Hello"]},
+        "layout_inline": {"flow": [{"column": "main", "blocks": ["header_name"]}], "map_rules": rules},
+    })
+
+    assert pdf.startswith(b"%PDF")
+    assert calls and calls[0]["map_rules_override"] == rules
+
+    # Without the mapper the legacy profile normalizer is used instead.
+    monkeypatch.setattr(resume, "_HAS_MAPPER", False)
+    fallback = []
+    monkeypatch.setattr(resume, "build_ready_from_profile", lambda p: fallback.append(p) or {})
+    resume.build_resume_pdf(data={"profile": {"header": {"name": "Fallback"}}})
+    assert fallback == [{"header": {"name": "Fallback"}}]
+
+
+def test_form_bearing_blocks_render_in_any_document_order():
+    from api.pdf_utils.resume import build_resume_pdf
+
+    def render(blocks):
+        return build_resume_pdf(data={
+            "profile": {"header": {"name": "Form Person", "title": "Dev"}},
+            "layout_inline": {"layout": [{"block_id": b, "frame": {"x": 50, "y": 800, "w": 400}} for b in blocks]},
+        })
+
+    # header_bar draws through a document-level form XObject
+    assert render(["header_bar:b"]).startswith(b"%PDF")
+    pdf = render(["header_bar:c", "header_bar:b"])
+    assert pdf.startswith(b"%PDF")
+    assert pdf.count(b"/Subtype /Form") == 1
+    assert render(["header_bar:b"]).count(b"/Subtype /Form") == 1
+
+
+def test_modern_build_renders_flow_layouts_with_the_engine(monkeypatch):
+    from api.pdf_utils import resume
+
+    plans = []
+    real_render_plan = LayoutEngine.render_plan
+
+    def spy(self, plan, ready):
+        plans.append(plan)
+        return real_render_plan(self, plan, ready)
+
+    monkeypatch.setattr(LayoutEngine, "render_plan", spy)
+    pdf = resume.build_resume_pdf(data={
+        "profile": {"header": {"name": "Flow Person", "title": "Dev"}},
+        "layout_inline": {
+            "columns": [{"id": "main", "width": "100%"}],
+            "flow": [{"column": "main", "blocks": ["header_name"]}],
+        },
+    })
+
+    assert pdf.startswith(b"%PDF")
+    assert len(plans) == 1 and plans[0].has_flow
+    assert [pb.raw_id for pb in plans[0].blocks] == ["header_name"]
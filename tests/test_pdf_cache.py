@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import pytest
+
+from api.pdf_cache import PdfCache, cache_key, etag_matches
+
+
+def _payload(name: str = "Cache Test"):
+    return {
+        "theme_name": "aqua-card",
+        "ui_lang": "en",
+        "profile": {"header": {"name": name, "title": "Developer"}},
+        "layout_inline": {"flow": [{"column": "main", "blocks": ["header_name"]}]},
+    }
+
+
+def test_cache_key_is_canonical():
+    a = {"profile": {"x": 1, "y": [1, 2]}, "theme_name": "aqua-card"}
+    b = {"theme_name": "aqua-card", "profile": {"y": [1, 2], "x": 1}}
+    assert cache_key(a) == cache_key(b)
+    assert cache_key(a) != cache_key({**a, "rtl_mode": True})
+
+
+def test_etag_matching():
+    assert etag_matches('"abc"', '"abc"')
+    assert etag_matches('W/"abc", "def"', '"abc"')
+    assert etag_matches("*", '"abc"')
+    assert not etag_matches('"def"', '"abc"')
+    assert not etag_matches(None, '"abc"')
+
+
+def test_disk_tier_evicts_by_size(tmp_path):
+    cache = PdfCache(entries=1, memory_bytes=1024, disk_dir=tmp_path, disk_bytes=250)
+    for i in range(3):
+        cache.put(f"k{i}", bytes([i]) * 100)
+    assert cache.get("k2") == bytes([2]) * 100
+    assert len(list(tmp_path.glob("*.pdf"))) == 2
+    assert cache.disk.get("k0") is None
+
+
+@pytest.mark.view
+def test_generate_serves_repeats_from_cache(client):
+    payload = _payload("ETag Person")
+    first = client.post("/generate-form-simple", json=payload)
+    assert first.status_code == 200, first.text
+    etag = first.headers["etag"]
+
+    second = client.post("/generate-form-simple", json=payload)
+    assert second.headers["x-cache"] == "HIT"
+    assert second.content == first.content
+
+    third = client.post("/generate-form-simple", json=payload, headers={"If-None-Match": etag})
+    assert third.status_code == 304
@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import asyncio
+import time
+
+import pytest
+
+from api.pdf_utils.builder import build_resume_pdf
+from api.render_pool import RenderPool, RenderRejected, RenderUnavailable
+
+
+@pytest.fixture()
+def pool():
+    p = RenderPool(workers=1, queue_max=0, job_timeout=5)
+    yield p
+    p.shutdown()
+
+
+@pytest.mark.print
+def test_pool_renders_pdf(pool):
+    data = {
+        "theme_name": "aqua-card",
+        "profile": {"header": {"name": "Tamer", "title": "Developer"}},
+        "layout_inline": {"flow": [{"column": "main", "blocks": ["header_name"]}]},
+    }
+    pdf = asyncio.run(pool.run(build_resume_pdf, data=data))
+    assert pdf.startswith(b"%PDF")
+    assert pool.in_flight == 0
+
+
+def test_pool_rejects_when_queue_is_full(pool):
+    busy = pool.submit(time.sleep, 1.0)
+    with pytest.raises(RenderRejected):
+        pool.submit(time.sleep, 0)
+    busy.result(timeout=10)
+
+
+def test_pool_times_out_slow_jobs():
+    pool = RenderPool(workers=1, queue_max=1, job_timeout=0.2)
+    try:
+        with pytest.raises(RenderUnavailable):
+            asyncio.run(pool.run(time.sleep, 2.0))
+    finally:
+        pool.shutdown()
+
+
+def test_thread_mode_records_queue_wait():
+    pool = RenderPool(workers=1, queue_max=2, job_timeout=5, mode="thread")
+
+    async def _two_jobs():
+        return await asyncio.gather(pool.run(time.sleep, 0.2), pool.run(time.sleep, 0))
+
+    try:
+        asyncio.run(_two_jobs())
+        stats = pool.stats()
+        assert stats["mode"] == "thread"
+        assert stats["jobs"] == 2 and stats["in_flight"] == 0
+        # the second job waited for the single worker
+        assert stats["queue_wait_max"] >= 0.1
+    finally:
+        pool.shutdown()
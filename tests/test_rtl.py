@@ -0,0 +1,21 @@
+from __future__ import annotations
+
+from api.pdf_utils.rtl import rtl, rtl_cache_stats, rtl_line, rtl_many
+
+
+def test_shaping_is_memoized_and_batched():
+    label = "المهارات الأساسية"
+    before = rtl_cache_stats()["strings"]
+    first = rtl(label)
+    assert rtl(label) == first
+    after = rtl_cache_stats()["strings"]
+    assert after["hits"] >= before["hits"] + 1
+
+    assert rtl_many([label, "Python", label]) == [first, "Python", first]
+    assert rtl_many(["FastAPI", label], whole_line=True) == ["FastAPI", rtl_line(label)]
+
+
+def test_latin_text_is_returned_unchanged():
+    assert rtl("Software Developer") == "Software Developer"
+    assert rtl_line("Software Developer") == "Software Developer"
+    assert rtl("") == "" and rtl_line(None) == ""
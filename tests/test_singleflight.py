@@ -0,0 +1,71 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from api.singleflight import SingleFlight
+
+
+def test_concurrent_identical_calls_share_one_run():
+    flights = SingleFlight()
+    calls = []
+
+    async def render():
+        calls.append(1)
+        await asyncio.sleep(0.05)
+        return b"%PDF"
+
+    async def main():
+        return await asyncio.gather(*(flights.run("key", render) for _ in range(5)))
+
+    results = asyncio.run(main())
+
+    assert len(calls) == 1
+    assert [pdf for pdf, _ in results] == [b"%PDF"] * 5
+    assert sorted(shared for _, shared in results) == [False] + [True] * 4
+    assert flights.stats() == {"in_flight": 0, "leaders": 1, "shared": 4}
+
+
+def test_errors_are_shared_and_the_key_is_released():
+    flights = SingleFlight()
+
+    async def fail():
+        await asyncio.sleep(0.02)
+        raise RuntimeError("queue full")
+
+    async def ok():
+        return b"%PDF"
+
+    async def main():
+        results = await asyncio.gather(*(flights.run("key", fail) for _ in range(3)), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in results)
+        return await flights.run("key", ok)
+
+    assert asyncio.run(main()) == (b"%PDF", False)
+
+
+def test_worker_threads_join_the_same_flight():
+    flights = SingleFlight()
+    calls = []
+    started = threading.Event()
+
+    def render():
+        calls.append(1)
+        started.set()
+        time.sleep(0.05)
+        return b"%PDF"
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flights.call("key", render)))
+    leader.start()
+    started.wait()
+    results.append(flights.call("key", render))
+    leader.join()
+
+    assert len(calls) == 1
+    assert sorted(results, key=lambda r: r[1]) == [(b"%PDF", False), (b"%PDF", True)]
+    with pytest.raises(ZeroDivisionError):
+        flights.call("other", lambda: 1 / 0)
@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+_PROBE = """
+import sys
+import api.pdf_utils
+from api.pdf_utils.blocks import BLOCK_MODULES
+from api.pdf_utils.blocks.registry import get, list_registered
+
+loaded = [m for m in BLOCK_MODULES if f"api.pdf_utils.blocks.{m}" in sys.modules]
+assert loaded == [], loaded
+assert get("header_name").BLOCK_ID == "header_name"
+assert "api.pdf_utils.blocks.header_name" in sys.modules
+assert "api.pdf_utils.blocks.projects" not in sys.modules
+assert set(BLOCK_MODULES) <= set(list_registered())
+"""
+
+
+def test_lazy_startup_imports_blocks_on_first_lookup():
+    env = dict(os.environ, LAZY_STARTUP="1")
+    proc = subprocess.run([sys.executable, "-c", _PROBE], cwd=ROOT, env=env, capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
+
+
+def test_import_budget_reports_modules():
+    proc = subprocess.run(
+        [sys.executable, "tools/import_budget.py", "--module", "api.pdf_utils.text", "--top", "3"],
+        cwd=ROOT, capture_output=True, text=True,
+    )
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.startswith("import api.pdf_utils.text (eager):")
+    assert "api.pdf_utils.text" in proc.stdout
@@ -0,0 +1,37 @@
+from __future__ import annotations
+
+from reportlab.pdfbase.pdfmetrics import stringWidth
+
+from api.pdf_utils.text import break_lines, string_width
+
+
+def test_break_lines_fits_width_and_keeps_words():
+    text = "Built a FastAPI service rendering resumes with ReportLab " * 8
+    lines = break_lines(text, 200, "Helvetica", 10)
+
+    assert " ".join(lines) == " ".join(text.split())
+    assert all(stringWidth(ln, "Helvetica", 10) <= 200 for ln in lines)
+    # greedy: the next word would not have fitted on the previous line
+    for prev, nxt in zip(lines, lines[1:]):
+        assert stringWidth(prev + " " + nxt.split()[0], "Helvetica", 10) > 200
+
+
+def test_string_width_matches_reportlab_and_long_words_stand_alone():
+    assert abs(string_width("Résumé", "Helvetica", 11) - stringWidth("Résumé", "Helvetica", 11)) < 1e-9
+    assert break_lines("a supercalifragilistic b", 20, "Helvetica", 10) == ["a", "supercalifragilistic", "b"]
+    assert break_lines("", 100) == [""]
+
+
+def test_wrapped_paragraphs_are_cached():
+    from api.pdf_utils.text import paragraph_cache_stats, wrapped_lines
+
+    text = "A paragraph that is laid out once and then served from the cache " * 3
+    before = paragraph_cache_stats()
+    first = wrapped_lines(text, 150, "Helvetica", 10)
+    second = wrapped_lines(text, 150.0, "Helvetica", 10)
+    after = paragraph_cache_stats()
+
+    assert first is second
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 1
+    assert wrapped_lines(text, 300, "Helvetica", 10) != first
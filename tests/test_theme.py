@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import json
+import os
+
+import pytest
+from reportlab.lib import colors
+
+from api.pdf_utils import config, theme_loader
+from api.pdf_utils.theme_loader import compile_theme, default_theme, theme_of
+
+
+@pytest.fixture()
+def themes_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(theme_loader, "THEMES_DIR", tmp_path)
+    return tmp_path
+
+
+def _write(path, heading: str, mtime: int) -> None:
+    path.write_text(json.dumps({"colors": {"heading": heading}, "sizes": {"text_size": 9}}), encoding="utf-8")
+    os.utime(path, ns=(mtime, mtime))
+
+
+def test_compile_theme_is_cached_by_mtime_and_leaves_config_alone(themes_dir):
+    before = config.HEADING_COLOR
+    path = themes_dir / "red.theme.json"
+    _write(path, "#FF0000", 1_000_000_000)
+
+    red = compile_theme("red")
+    assert red.HEADING_COLOR == colors.HexColor("#FF0000")
+    assert red.TEXT_SIZE == 9.0
+    assert red.RULE_COLOR == config.RULE_COLOR  # unset keys fall back to config
+    assert compile_theme("red") is red
+    assert config.HEADING_COLOR is before
+
+    _write(path, "#00FF00", 2_000_000_000)
+    assert compile_theme("red").HEADING_COLOR == colors.HexColor("#00FF00")
+
+
+def test_theme_is_frozen_and_read_from_context():
+    th = default_theme()
+    with pytest.raises(Exception):
+        th.name = "other"
+    with pytest.raises(TypeError):
+        th.values["HEADING_COLOR"] = colors.red
+    assert theme_of({}) is th
+    assert theme_of({"style": compile_theme("aqua-card")}).name == "aqua-card"
+
+
+def test_theme_cache_skips_missing_themes_and_follows_font_changes(themes_dir):
+    from api.pdf_utils.fonts import refresh_fonts
+
+    theme_loader._THEME_CACHE.clear()
+    for i in range(3):
+        assert compile_theme(f"missing-{i}").name == f"missing-{i}"
+    assert theme_loader._THEME_CACHE.stats()["entries"] == 0
+
+    _write(themes_dir / "red.theme.json", "#FF0000", 1_000_000_000)
+    red = compile_theme("red")
+    assert compile_theme("red") is red
+    refresh_fonts()  # the available fonts may have changed: re-resolve
+    assert compile_theme("red") is not red
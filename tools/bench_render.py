@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+bench_render.py
+Compare render latency of quality=print and quality=draft, in-process (no HTTP, no pool).
+
+Run from the project root:
+   python tools/bench_render.py
+   python tools/bench_render.py --runs 20 --projects 30 --layout two-column.layout.json
+
+Output:
+  median / p95 milliseconds, PDF size and page count per engine and quality.
+"""
+
+from __future__ import annotations
+import argparse, copy, io, json, pathlib, re, statistics, sys, time
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from PIL import Image  # noqa: E402
+
+from api.pdf_utils import builder, resume  # noqa: E402
+from api.pdf_utils.fonts import register_all_fonts  # noqa: E402
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--runs", type=int, default=10, help="Timed renders per case (default: 10)")
+    p.add_argument("--projects", type=int, default=20, help="Projects in the sample profile (default: 20)")
+    p.add_argument("--layout", default="two-column.layout.json", help="Layout from layouts/ (default: two-column.layout.json)")
+    p.add_argument("--theme", default="aqua-card", help="Theme name (default: aqua-card)")
+    return p.parse_args()
+
+def sample_photo() -> bytes:
+    buf = io.BytesIO()
+    Image.effect_noise((3000, 4000), 50).convert("RGB").save(buf, format="JPEG", quality=90)
+    return buf.getvalue()
+
+def sample_data(args) -> dict:
+    words = "design build ship measure improve document review deploy".split()
+    profile = {
+        "header": {"name": "Bench Person", "title": "Software Engineer"},
+        "contact": {"email": "bench@example.com", "phone": "+1 555 0100", "website": "https://example.com"},
+        "summary": [" ".join(words * 6)] * 3,
+        "skills": [f"Skill {i}" for i in range(20)],
+        "languages": ["English - C2", "German - B2", "Arabic - native"],
+        "projects": [[f"Project {i}", " ".join(words * 4), f"https://github.com/bench/p{i}"] for i in range(args.projects)],
+        "education": [f"Degree {i} - University - 20{10 + i}" for i in range(4)],
+    }
+    layout = json.loads((ROOT / "layouts" / args.layout).read_text(encoding="utf-8"))
+    layout.setdefault("overrides", {})["avatar_circle"] = {"data": {"photo_bytes": sample_photo(), "max_d_mm": 42}}
+    return {"theme_name": args.theme, "ui_lang": "en", "rtl_mode": False, "profile": profile, "layout_inline": layout}
+
+def bench(name, fn, data, runs):
+    fn(data=copy.deepcopy(data))  # warm caches (fonts, headshot, layout plan)
+    times = []
+    for _ in range(runs):
+        d = copy.deepcopy(data)
+        t = time.perf_counter()
+        pdf = fn(data=d)
+        times.append((time.perf_counter() - t) * 1000)
+    times.sort()
+    p95 = times[min(len(times) - 1, int(round(0.95 * (len(times) - 1))))]
+    pages = len(re.findall(rb"/Type /Page\b(?!s)", pdf))
+    print(f"  {name:<18} median {statistics.median(times):8.1f} ms  p95 {p95:8.1f} ms  "
+          f"{len(pdf) / 1024:8.1f} KB  {pages} page(s)")
+    return statistics.median(times)
+
+def main():
+    args = parse_args()
+    register_all_fonts()
+    data = sample_data(args)
+    for engine, fn in (("builder", builder.build_resume_pdf), ("blocks", resume.build_resume_pdf)):
+        print(f"{engine}:")
+        t_print = bench("quality=print", fn, data, args.runs)
+        t_draft = bench("quality=draft", fn, {**data, "quality": "draft"}, args.runs)
+        print(f"  draft speed-up     x{t_print / max(t_draft, 1e-6):.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+import_budget.py
+Report what importing the API costs, module by module, using ``python -X importtime``.
+
+Run from the project root:
+   python tools/import_budget.py                 # eager startup
+   python tools/import_budget.py --lazy          # with LAZY_STARTUP=1
+   python tools/import_budget.py --budget-ms 800 # exit 1 if over budget
+
+Output:
+  total import time, then the slowest modules by self and cumulative time.
+"""
+
+from __future__ import annotations
+import argparse, os, pathlib, subprocess, sys
+
+ROOT = pathlib.Path(__file__).resolve().parents[1]
+
+def parse_args():
+    p = argparse.ArgumentParser()
+    p.add_argument("--module", default="api.main", help="Module to import (default: api.main)")
+    p.add_argument("--lazy", action="store_true", help="Set LAZY_STARTUP=1 for the measured import")
+    p.add_argument("--top", type=int, default=15, help="Rows per table (default: 15)")
+    p.add_argument("--budget-ms", type=float, default=None,
+                   help="Fail (exit 1) when the total import time exceeds this many milliseconds")
+    return p.parse_args()
+
+def measure(module: str, lazy: bool):
+    """Return [(module, self_us, cumulative_us)] for one fresh interpreter."""
+    env = dict(os.environ)
+    if lazy:
+        env["LAZY_STARTUP"] = "1"
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT, env=env, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        sys.stderr.write(proc.stderr)
+        raise SystemExit(f"Importing {module} failed")
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:   self [us] | cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        try:
+            self_us, cum_us, name = line[len("import time:"):].split("|", 2)
+            rows.append((name.strip(), int(self_us), int(cum_us)))
+        except ValueError:
+            continue
+    return rows
+
+def print_table(title, rows, key, top):
+    print(f"\n{title}")
+    for name, self_us, cum_us in sorted(rows, key=key, reverse=True)[:top]:
+        print(f"  {self_us / 1000:8.1f} ms self  {cum_us / 1000:8.1f} ms cum  {name}")
+
+def main():
+    args = parse_args()
+    rows = measure(args.module, args.lazy)
+    total_ms = sum(r[1] for r in rows) / 1000
+    mode = "lazy" if args.lazy else "eager"
+    print(f"import {args.module} ({mode}): {total_ms:.1f} ms across {len(rows)} modules")
+    print_table("Slowest modules (self):", rows, key=lambda r: r[1], top=args.top)
+    print_table("Slowest packages (cumulative):", rows, key=lambda r: r[2], top=args.top)
+
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nOver budget: {total_ms:.1f} ms > {args.budget_ms:g} ms")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())